@@ -0,0 +1,91 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import HASH_SESSION_KEY, get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import make_password, verify_password
+from django.contrib.sessions.backends.base import UpdateError
+
+from main.tasks import run_after_response, run_in_background
+
+
+def upgrade_password_hash(user_id, old_encoded, raw_password, session_key=None):
+    """
+    Hash ulang password dengan kebijakan saat ini (lihat authenticate/hashers.py).
+
+    UPDATE bersyarat ``password = old_encoded`` memastikan password yang
+    diganti user di antara login dan pekerjaan ini tidak tertimpa. Karena hash
+    session ikut berubah, session login yang memicu upgrade diperbarui supaya
+    user tidak ter-logout.
+    """
+    UserModel = get_user_model()
+    new_encoded = make_password(raw_password)
+    updated = UserModel._default_manager.filter(pk=user_id, password=old_encoded).update(password=new_encoded)
+    if not updated or not session_key:
+        return bool(updated)
+
+    user = UserModel(pk=user_id, password=new_encoded)
+    store = import_module(settings.SESSION_ENGINE).SessionStore(session_key=session_key)
+    if store.exists(session_key):
+        store[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        try:
+            store.save(must_create=False)
+        except UpdateError:
+            # Session sudah dihapus (mis. logout) sebelum sempat diperbarui.
+            pass
+    return True
+
+
+def _schedule_upgrade(request, user, raw_password):
+    def start():
+        session = getattr(request, 'session', None)
+        session_key = session.session_key if session is not None else None
+        run_in_background(upgrade_password_hash, user.pk, user.password, raw_password, session_key)
+
+    if request is None:
+        start()
+    else:
+        # Setelah response: session login sudah tersimpan sehingga hash
+        # session yang baru tidak tertimpa oleh SessionMiddleware.
+        run_after_response(start)
+
+
+class ProfileModelBackend(ModelBackend):
+    """
+    ModelBackend yang memuat ``User`` sekaligus ``userprofile`` dan
+    ``booking_stats`` dalam satu query (LEFT JOIN). ``AuthenticationMiddleware`` sudah menyimpan hasilnya
+    per request, sehingga navbar/profil tidak memicu query tambahan.
+
+    Berbeda dengan ``ModelBackend``, hash password yang perlu di-upgrade
+    (algoritma/biaya lama) tidak di-hash ulang di dalam request login,
+    melainkan dijadwalkan di latar belakang.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Tetap jalankan hasher supaya waktu respons tidak membocorkan
+            # apakah username terdaftar.
+            UserModel().set_password(password)
+            return None
+
+        is_correct, must_update = verify_password(password, user.password)
+        if not (is_correct and self.user_can_authenticate(user)):
+            return None
+        if must_update:
+            _schedule_upgrade(request, user, password)
+        return user
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.select_related('userprofile', 'booking_stats').get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
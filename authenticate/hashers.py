@@ -0,0 +1,112 @@
+"""
+Kebijakan hashing password per lingkungan.
+
+``PASSWORD_HASH_PROFILE`` (lihat settings) memilih daftar hasher dan biayanya:
+
+- ``test``: MD5, cepat, hanya untuk test suite (venyuk/test_settings.py);
+- ``development``: PBKDF2 dengan iterasi lebih rendah agar login lokal cepat;
+- ``production``: Argon2 (jika ``argon2-cffi`` terpasang), lalu bcrypt, lalu
+  PBKDF2 sebagai cadangan.
+
+Hasher pertama dipakai untuk hash baru; sisanya tetap bisa memverifikasi hash
+lama. MD5 hanya diterima di profil test. Hash yang algoritmanya berbeda atau
+biayanya lebih rendah dari kebijakan saat ini di-upgrade di latar belakang
+setelah login berhasil (lihat ``authenticate.backends``); hash yang biayanya
+lebih tinggi (mis. hash production di database development) tidak pernah
+diturunkan. Biaya bisa ditimpa lewat ``PASSWORD_HASH_COST``.
+
+settings.py menyusun ``PASSWORD_HASHERS`` sendiri (tanpa mengimpor modul
+ini); ``password_hashers`` adalah sumber yang sama untuk test dan command
+benchmark.
+"""
+import importlib.util
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    BCryptSHA256PasswordHasher,
+    PBKDF2PasswordHasher,
+    must_update_salt,
+)
+
+PROFILE_COSTS = {
+    'test': {},
+    'development': {'pbkdf2_iterations': 100_000},
+    'production': {
+        'pbkdf2_iterations': 1_000_000,
+        'argon2_time_cost': 2,
+        'argon2_memory_cost': 64 * 1024,  # KiB
+        'argon2_parallelism': 1,
+        'bcrypt_rounds': 12,
+    },
+}
+
+def password_hashers(profile):
+    """Isi ``PASSWORD_HASHERS`` untuk ``profile``."""
+    if profile == 'test':
+        return [
+            'django.contrib.auth.hashers.MD5PasswordHasher',
+            'authenticate.hashers.PolicyPBKDF2PasswordHasher',
+        ]
+
+    hashers = []
+    if profile == 'production':
+        if importlib.util.find_spec('argon2'):
+            hashers.append('authenticate.hashers.PolicyArgon2PasswordHasher')
+        if importlib.util.find_spec('bcrypt'):
+            hashers.append('authenticate.hashers.PolicyBCryptSHA256PasswordHasher')
+    hashers.append('authenticate.hashers.PolicyPBKDF2PasswordHasher')
+    return hashers
+
+
+def hash_cost(name, default):
+    profile = getattr(settings, 'PASSWORD_HASH_PROFILE', 'production')
+    overrides = getattr(settings, 'PASSWORD_HASH_COST', {})
+    return overrides.get(name, PROFILE_COSTS.get(profile, {}).get(name, default))
+
+
+class PolicyPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return hash_cost('pbkdf2_iterations', PBKDF2PasswordHasher.iterations)
+
+    def must_update(self, encoded):
+        # Hanya naikkan iterasi; hash yang lebih kuat dari kebijakan dibiarkan.
+        return self.decode(encoded)['iterations'] < self.iterations
+
+
+class PolicyArgon2PasswordHasher(Argon2PasswordHasher):
+    @property
+    def time_cost(self):
+        return hash_cost('argon2_time_cost', Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return hash_cost('argon2_memory_cost', Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return hash_cost('argon2_parallelism', Argon2PasswordHasher.parallelism)
+
+    def must_update(self, encoded):
+        # Bawaan Django me-rehash jika parameter berbeda ke arah mana pun;
+        # di sini biaya hanya dinaikkan, varian / versi / salt tetap diikuti.
+        decoded = self.decode(encoded)
+        current, policy = decoded['params'], self.params()
+        if (current.type, current.version, current.hash_len) != (policy.type, policy.version, policy.hash_len):
+            return True
+        if must_update_salt(decoded['salt'], self.salt_entropy):
+            return True
+        return any(
+            getattr(current, name) < getattr(policy, name)
+            for name in ('time_cost', 'memory_cost', 'parallelism')
+        )
+
+
+class PolicyBCryptSHA256PasswordHasher(BCryptSHA256PasswordHasher):
+    @property
+    def rounds(self):
+        return hash_cost('bcrypt_rounds', BCryptSHA256PasswordHasher.rounds)
+
+    def must_update(self, encoded):
+        return self.decode(encoded)['work_factor'] < self.rounds
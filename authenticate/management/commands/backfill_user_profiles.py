@@ -0,0 +1,32 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from authenticate.models import UserProfile
+
+
+class Command(BaseCommand):
+    help = "Buat UserProfile untuk semua user yang belum punya, memakai bulk_create per batch."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        missing = User.objects.filter(userprofile__isnull=True).order_by('pk').values_list('pk', flat=True)
+
+        created = 0
+        last_pk = 0
+        while True:
+            # Keyset per pk: batch berikutnya tidak bergantung pada OFFSET dan
+            # tetap benar walau user baru terdaftar selama backfill berjalan.
+            user_ids = list(missing.filter(pk__gt=last_pk)[:batch_size])
+            if not user_ids:
+                break
+            UserProfile.objects.bulk_create(
+                [UserProfile(user_id=user_id) for user_id in user_ids],
+                ignore_conflicts=True,
+            )
+            created += len(user_ids)
+            last_pk = user_ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"{created} profil dibuat."))
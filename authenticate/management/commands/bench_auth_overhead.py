@@ -0,0 +1,68 @@
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+BASELINE = {
+    'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+    'AUTHENTICATION_BACKENDS': ['django.contrib.auth.backends.ModelBackend'],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Ukur overhead auth per request (session + user + profil) untuk konfigurasi lama "
+        "(session DB, ModelBackend) dan konfigurasi sekarang. Data benchmark di-rollback."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Jumlah request per skenario")
+
+    def handle(self, *args, **options):
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            with transaction.atomic():
+                user = User.objects.create_user(username='__bench_auth__', password='bench-pass-123')
+                rows = [
+                    ('sebelum', self._measure(user, options['requests'], BASELINE, response_cache=False)),
+                    ('sesudah', self._measure(user, options['requests'], {}, response_cache=False)),
+                    ('+cache', self._measure(user, options['requests'], {}, response_cache=True)),
+                ]
+                transaction.set_rollback(True)
+
+        self.stdout.write(f"{'skenario':<10}{'mean ms':>10}{'p95 ms':>10}{'query/req':>12}")
+        for name, (mean, p95, queries) in rows:
+            self.stdout.write(f"{name:<10}{mean:>10.2f}{p95:>10.2f}{queries:>12.1f}")
+
+    def _measure(self, user, count, overrides, response_cache):
+        """Mean / p95 (ms) dan rata-rata query per request ke ``get_user_data``."""
+        url = reverse('authenticate:get_user_data')
+        with override_settings(**overrides):
+            # Setiap skenario memakai session baru, jadi cache tidak perlu
+            # dikosongkan; hanya key milik benchmark yang dihapus di akhir.
+            client = Client()
+            client.force_login(user)
+            client.get(url)
+            response_key = f'auth:user-data:{client.cookies["sessionid"].value}'
+
+            timings = []
+            with CaptureQueriesContext(connection) as queries:
+                for _ in range(count):
+                    if not response_cache:
+                        # Yang diukur biaya session + user, bukan cache respons.
+                        cache.delete(response_key)
+                    started = time.perf_counter()
+                    client.get(url)
+                    timings.append((time.perf_counter() - started) * 1000)
+
+            cache.delete(response_key)
+            client.logout()
+
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        return statistics.mean(timings), p95, len(queries) / count
@@ -0,0 +1,61 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from authenticate import throttle
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulasikan serangan brute force ke login_user dari satu IP dan bandingkan CPU "
+        "worker dengan throttle mati vs hidup. Data benchmark di-rollback."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--attempts', type=int, default=100, help="Jumlah percobaan login per skenario")
+
+    def handle(self, *args, **options):
+        attempts = max(1, options['attempts'])
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            with transaction.atomic():
+                User.objects.create_user(username='__bench_login__', password='bench-pass-123')
+                rows = [
+                    ('tanpa throttle', self._attack(attempts, enabled=False)),
+                    ('dengan throttle', self._attack(attempts, enabled=True)),
+                ]
+                transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{'skenario':<18}{'percobaan':>10}{'ditolak':>9}{'CPU s':>9}{'CPU ms/req':>12}{'wall s':>9}"
+        )
+        for name, (rejected, cpu, wall) in rows:
+            self.stdout.write(
+                f"{name:<18}{attempts:>10}{rejected:>9}{cpu:>9.2f}{cpu / attempts * 1000:>12.2f}{wall:>9.2f}"
+            )
+
+    def _attack(self, attempts, enabled):
+        """Jalankan ``attempts`` login gagal; kembalikan (ditolak, CPU detik, wall detik)."""
+        url = reverse('authenticate:login')
+        with override_settings(LOGIN_THROTTLE_ENABLED=enabled):
+            throttle.get_cache().clear()
+            throttle.metrics.reset()
+            client = Client(REMOTE_ADDR='203.0.113.7')
+
+            rejected = 0
+            cpu_started = time.process_time()
+            wall_started = time.perf_counter()
+            for attempt in range(attempts):
+                response = client.post(
+                    url,
+                    {'username': '__bench_login__', 'password': f'salah-{attempt}'},
+                    HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+                )
+                rejected += response.status_code == 429
+            cpu = time.process_time() - cpu_started
+            wall = time.perf_counter() - wall_started
+        return rejected, cpu, wall
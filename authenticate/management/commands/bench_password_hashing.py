@@ -0,0 +1,51 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.utils.module_loading import import_string
+
+from authenticate.hashers import PROFILE_COSTS, password_hashers
+
+
+class Command(BaseCommand):
+    help = (
+        "Ukur throughput hash password (hash/detik per core) untuk setiap hasher di "
+        "sebuah profil, sebagai dasar perkiraan kapasitas login."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', default=None, help="Profil hashing (default: PASSWORD_HASH_PROFILE)")
+        parser.add_argument('--seconds', type=float, default=2.0, help="Durasi pengukuran per hasher")
+
+    def handle(self, *args, **options):
+        profile = options['profile'] or settings.PASSWORD_HASH_PROFILE
+        if profile not in PROFILE_COSTS:
+            raise CommandError(f"Profil tidak dikenal: {profile}")
+        cores = os.cpu_count() or 1
+
+        self.stdout.write(f"profil {profile}, {cores} core")
+        self.stdout.write(f"{'hasher':<40}{'ms/hash':>10}{'hash/s/core':>13}{'login/s':>10}")
+        with override_settings(PASSWORD_HASH_PROFILE=profile):
+            for path in password_hashers(profile):
+                hasher = import_string(path)()
+                try:
+                    if getattr(hasher, 'library', None):
+                        hasher._load_library()
+                except ValueError as exc:
+                    self.stdout.write(f"{path:<40}  dilewati: {exc}")
+                    continue
+                rate = self._measure(hasher, options['seconds'])
+                name = path.rsplit('.', 1)[-1]
+                self.stdout.write(f"{name:<40}{1000 / rate:>10.2f}{rate:>13.1f}{rate * cores:>10.1f}")
+
+    def _measure(self, hasher, seconds):
+        """Hash per detik CPU di satu core (loop single-thread)."""
+        count = 0
+        started = time.process_time()
+        deadline = time.perf_counter() + seconds
+        while count == 0 or time.perf_counter() < deadline:
+            hasher.encode('bench-password-123', hasher.salt())
+            count += 1
+        return count / max(time.process_time() - started, 1e-9)
@@ -16,4 +16,18 @@ class UserProfile(models.Model):
     )
 
     def __str__(self):
-        return self.user.username
\ No newline at end of file
+        return self.user.username
+
+def get_profile(user):
+    """
+    Profil milik ``user``; dibuat saat pertama kali diakses jika belum ada
+    (mis. user lama atau user yang dibuat lewat ``bulk_create``). Hasilnya
+    disimpan di cache relasi ``user.userprofile`` sehingga akses berikutnya
+    dalam request yang sama tidak menyentuh database lagi.
+    """
+    try:
+        return user.userprofile
+    except UserProfile.DoesNotExist:
+        profile, _ = UserProfile.objects.get_or_create(user=user)
+        user.userprofile = profile
+        return profile
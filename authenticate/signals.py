@@ -1,17 +1,16 @@
 from django.db.models.signals import post_save
 from django.contrib.auth.models import User
 from django.dispatch import receiver
+from main.thumbnails import track_image_field
 from .models import UserProfile
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
+    # Hanya saat registrasi; update User lain (mis. last_login saat login)
+    # tidak menyentuh profil. User yang belum punya profil dilayani oleh
+    # get_profile() / command backfill_user_profiles.
     if created:
-        UserProfile.objects.create(user=instance)
+        UserProfile.objects.get_or_create(user=instance)
 
 
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    try:
-        instance.userprofile.save()
-    except UserProfile.DoesNotExist:
-        UserProfile.objects.create(user=instance)
\ No newline at end of file
+track_image_field(UserProfile, 'profile_pic')
@@ -0,0 +1,289 @@
+import importlib.util
+from importlib import import_module
+from io import StringIO
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, Client, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from authenticate import throttle
+from authenticate.backends import ProfileModelBackend, upgrade_password_hash
+from authenticate.hashers import PolicyArgon2PasswordHasher, PolicyPBKDF2PasswordHasher, password_hashers
+from authenticate.models import UserProfile, get_profile
+
+
+class UserDataCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='navbar', password='testpass123')
+        self.client = Client()
+        self.url = reverse('authenticate:get_user_data')
+
+    def test_anonymous(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.json(), {'is_authenticated': False})
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_repeat_requests_are_served_from_cache(self):
+        self.client.login(username='navbar', password='testpass123')
+        self.client.cookies['last_login'] = '2026-01-01 10:00:00'
+
+        first = self.client.get(self.url)
+        self.assertEqual(first.json()['username'], 'navbar')
+        self.assertIn('Cookie', first['Vary'])
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second.json(), {
+            'username': 'navbar',
+            'is_authenticated': True,
+            'last_login': '2026-01-01 10:00:00',
+        })
+
+    def test_logout_drops_cached_identity(self):
+        self.client.login(username='navbar', password='testpass123')
+        self.client.get(self.url)
+        self.client.get(reverse('authenticate:logout'))
+        self.assertFalse(self.client.get(self.url).json()['is_authenticated'])
+
+    def test_sessions_use_shared_cache_alias(self):
+        self.assertNotEqual(settings.SESSION_CACHE_ALIAS, 'default')
+        self.client.login(username='navbar', password='testpass123')
+        session_key = self.client.session.session_key
+        session_cache = caches[settings.SESSION_CACHE_ALIAS]
+        cache_key = import_module(settings.SESSION_ENGINE).SessionStore(session_key).cache_key
+        self.assertIsNotNone(session_cache.get(cache_key))
+
+        self.client.get(reverse('authenticate:logout'))
+        self.assertIsNone(session_cache.get(cache_key))
+
+
+class ProfileModelBackendTest(TestCase):
+    def test_get_user_loads_profile_in_one_query(self):
+        user = User.objects.create_user(username='profil', password='testpass123')
+        with self.assertNumQueries(1):
+            loaded = ProfileModelBackend().get_user(user.pk)
+            self.assertEqual(loaded.userprofile.user_id, user.pk)
+
+    def test_inactive_user_is_rejected(self):
+        user = User.objects.create_user(username='nonaktif', password='testpass123', is_active=False)
+        self.assertIsNone(ProfileModelBackend().get_user(user.pk))
+
+
+class BenchAuthOverheadCommandTest(TestCase):
+    def test_reports_all_scenarios_and_rolls_back(self):
+        cache.set('bukan-milik-benchmark', 1)
+        out = StringIO()
+        call_command('bench_auth_overhead', requests=3, stdout=out)
+        output = out.getvalue()
+        for name in ('sebelum', 'sesudah', '+cache'):
+            self.assertIn(name, output)
+        self.assertFalse(User.objects.filter(username='__bench_auth__').exists())
+        # Cache live (session, snapshot promo, feed) tidak ikut dikosongkan.
+        self.assertEqual(cache.get('bukan-milik-benchmark'), 1)
+
+
+class ProfileProvisioningTest(TestCase):
+    def test_registration_creates_profile_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            user = User.objects.create_user(username='baru', password='testpass123')
+        inserts = [q for q in queries if q['sql'].startswith('INSERT INTO "authenticate_userprofile"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertTrue(UserProfile.objects.filter(user=user).exists())
+
+    def test_login_does_not_touch_profile(self):
+        User.objects.create_user(username='masuk', password='testpass123')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(reverse('authenticate:login'), {'username': 'masuk', 'password': 'testpass123'})
+        writes = [q['sql'] for q in queries if q['sql'].startswith(('INSERT', 'UPDATE'))]
+        self.assertFalse([sql for sql in writes if 'authenticate_userprofile' in sql])
+        self.assertEqual(len([sql for sql in writes if 'auth_user' in sql]), 1)
+
+    def test_get_profile_creates_missing_profile_lazily(self):
+        user = User.objects.create_user(username='lama', password='testpass123')
+        UserProfile.objects.filter(user=user).delete()
+        user = User.objects.get(pk=user.pk)
+
+        profile = get_profile(user)
+        self.assertEqual(profile.user_id, user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_profile(user).pk, profile.pk)
+
+    def test_profile_page_for_user_without_profile(self):
+        user = User.objects.create_user(username='tanpa', password='testpass123')
+        UserProfile.objects.filter(user=user).delete()
+        self.client.login(username='tanpa', password='testpass123')
+        self.assertEqual(self.client.get(reverse('authenticate:profile')).status_code, 200)
+        self.assertTrue(UserProfile.objects.filter(user=user).exists())
+
+    def test_backfill_command(self):
+        users = User.objects.bulk_create([User(username=f'impor{i}') for i in range(5)])
+        out = StringIO()
+        call_command('backfill_user_profiles', batch_size=2, stdout=out)
+        self.assertIn('5 profil', out.getvalue())
+        self.assertEqual(UserProfile.objects.filter(user__in=users).count(), 5)
+
+
+class LoginThrottleTest(TestCase):
+    def setUp(self):
+        throttle.get_cache().clear()
+        throttle.metrics.reset()
+        User.objects.create_user(username='target', password='testpass123')
+        self.url = reverse('authenticate:login')
+
+    def attempt(self, password, username='target', ip='198.51.100.1', **extra):
+        return self.client.post(
+            self.url, {'username': username, 'password': password},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest', REMOTE_ADDR=ip, **extra,
+        )
+
+    def test_username_bucket_rejects_before_authenticate(self):
+        capacity = throttle.USERNAME_BUCKET[0]
+        statuses = [self.attempt(f'salah{i}').status_code for i in range(capacity + 2)]
+        self.assertEqual(statuses[:capacity], [401] * capacity)
+        self.assertEqual(statuses[capacity:], [429, 429])
+
+        # Password benar pun ditolak selama bucket / lockout aktif.
+        response = self.attempt('testpass123')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+
+        counts = throttle.metrics.snapshot()
+        self.assertEqual(counts['allowed'], capacity)
+        self.assertEqual(counts[throttle.REASON_LOCKED], 3)
+
+    def test_ip_bucket_spans_usernames(self):
+        capacity = throttle.IP_BUCKET[0]
+        for i in range(capacity):
+            self.assertEqual(self.attempt('x', username=f'akun{i}').status_code, 401)
+        self.assertEqual(self.attempt('testpass123').status_code, 429)
+        self.assertEqual(throttle.metrics.snapshot()[throttle.REASON_IP_RATE], 1)
+        # IP lain tidak terpengaruh.
+        self.assertEqual(self.attempt('testpass123', ip='198.51.100.2').status_code, 200)
+
+    def test_successful_logins_do_not_charge_username_bucket(self):
+        for _ in range(throttle.USERNAME_BUCKET[0] + 2):
+            self.assertEqual(self.attempt('testpass123', ip='198.51.100.9').status_code, 200)
+
+    @override_settings(LOGIN_THROTTLE_TRUSTED_PROXY_COUNT=1)
+    def test_client_ip_from_trusted_proxy_header(self):
+        factory = RequestFactory()
+        request = factory.post(self.url, REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='6.6.6.6, 203.0.113.9')
+        self.assertEqual(throttle.client_ip(request), '203.0.113.9')
+        self.assertEqual(throttle.client_ip(factory.post(self.url, REMOTE_ADDR='10.0.0.1')), '10.0.0.1')
+
+        # Dua klien di belakang proxy yang sama punya bucket IP sendiri-sendiri.
+        for i in range(throttle.IP_BUCKET[0]):
+            self.attempt('x', username=f'akun{i}', ip='10.0.0.1', HTTP_X_FORWARDED_FOR='203.0.113.9')
+        self.assertEqual(
+            self.attempt('x', username='akun0', ip='10.0.0.1', HTTP_X_FORWARDED_FOR='203.0.113.9').status_code, 429,
+        )
+        self.assertEqual(
+            self.attempt('testpass123', ip='10.0.0.1', HTTP_X_FORWARDED_FOR='203.0.113.10').status_code, 200,
+        )
+
+    def test_lockout_doubles_with_each_failure(self):
+        request = RequestFactory().post(self.url, REMOTE_ADDR='198.51.100.3')
+        threshold = throttle.LOCKOUT_THRESHOLDS['user']
+        for _ in range(threshold):
+            throttle.register_failure(request, 'target')
+        first = throttle.check_login(request, 'target')
+        throttle.register_failure(request, 'target')
+        second = throttle.check_login(request, 'target')
+
+        self.assertEqual(first.reason, throttle.REASON_LOCKED)
+        self.assertAlmostEqual(first.retry_after, throttle.LOCKOUT_BASE_SECONDS, delta=1)
+        self.assertAlmostEqual(second.retry_after, throttle.LOCKOUT_BASE_SECONDS * 2, delta=1)
+
+    def test_success_clears_username_failures(self):
+        for i in range(throttle.LOCKOUT_THRESHOLDS['user'] - 1):
+            self.attempt(f'salah{i}')
+        self.assertEqual(self.attempt('testpass123').status_code, 200)
+        request = RequestFactory().post(self.url, REMOTE_ADDR='198.51.100.1')
+        # Tanpa reset, kegagalan ini akan menjadi yang kelima dan memicu lockout.
+        throttle.register_failure(request, 'target')
+        self.assertNotEqual(throttle.check_login(request, 'target').reason, throttle.REASON_LOCKED)
+
+    @override_settings(LOGIN_THROTTLE_ENABLED=False)
+    def test_disabled(self):
+        for i in range(throttle.USERNAME_BUCKET[0] + 2):
+            self.assertEqual(self.attempt(f'salah{i}').status_code, 401)
+
+    def test_bench_login_flood_command(self):
+        out = StringIO()
+        call_command('bench_login_flood', attempts=8, stdout=out)
+        self.assertIn('dengan throttle', out.getvalue())
+        self.assertFalse(User.objects.filter(username='__bench_login__').exists())
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class PasswordHashPolicyTest(TestCase):
+    def test_profiles(self):
+        self.assertEqual(password_hashers('test')[0], 'django.contrib.auth.hashers.MD5PasswordHasher')
+        self.assertEqual(password_hashers('development')[0], 'authenticate.hashers.PolicyPBKDF2PasswordHasher')
+        self.assertIn('authenticate.hashers.PolicyPBKDF2PasswordHasher', password_hashers('production'))
+        for profile in ('development', 'production'):
+            self.assertFalse([path for path in password_hashers(profile) if 'MD5' in path or 'SHA1' in path])
+        self.assertEqual(settings.PASSWORD_HASHERS, password_hashers(settings.PASSWORD_HASH_PROFILE))
+
+    def test_stronger_pbkdf2_hash_is_not_downgraded(self):
+        hasher = PolicyPBKDF2PasswordHasher()
+        with override_settings(PASSWORD_HASH_COST={'pbkdf2_iterations': 2000}):
+            strong = hasher.encode('testpass123', hasher.salt())
+        with override_settings(PASSWORD_HASH_COST={'pbkdf2_iterations': 1000}):
+            self.assertFalse(hasher.must_update(strong))
+        with override_settings(PASSWORD_HASH_COST={'pbkdf2_iterations': 3000}):
+            self.assertTrue(hasher.must_update(strong))
+
+    @skipUnless(importlib.util.find_spec('argon2'), "argon2-cffi tidak terpasang")
+    def test_stronger_argon2_hash_is_not_downgraded(self):
+        hasher = PolicyArgon2PasswordHasher()
+        strong_cost = {'argon2_time_cost': 3, 'argon2_memory_cost': 2048, 'argon2_parallelism': 2}
+        with override_settings(PASSWORD_HASH_COST=strong_cost):
+            strong = hasher.encode('testpass123', hasher.salt())
+        weak_cost = {'argon2_time_cost': 2, 'argon2_memory_cost': 1024, 'argon2_parallelism': 1}
+        with override_settings(PASSWORD_HASH_COST=weak_cost):
+            self.assertFalse(hasher.must_update(strong))
+        with override_settings(PASSWORD_HASH_COST={**strong_cost, 'argon2_memory_cost': 4096}):
+            self.assertTrue(hasher.must_update(strong))
+
+    @override_settings(PASSWORD_HASH_COST={'pbkdf2_iterations': 1000})
+    def test_cost_override(self):
+        self.assertEqual(PolicyPBKDF2PasswordHasher().iterations, 1000)
+
+    def test_outdated_hash_is_upgraded_after_login_without_logging_out(self):
+        user = User.objects.create_user(username='lama', password='x')
+        with override_settings(PASSWORD_HASHERS=['authenticate.hashers.PolicyPBKDF2PasswordHasher'],
+                               PASSWORD_HASH_COST={'pbkdf2_iterations': 1000}):
+            user.set_password('testpass123')
+            user.save(update_fields=['password'])
+
+        response = self.client.post(reverse('authenticate:login'), {'username': 'lama', 'password': 'testpass123'})
+        self.assertEqual(response.status_code, 302)
+
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('md5$'))
+        self.assertTrue(user.check_password('testpass123'))
+        # Hash session ikut diperbarui sehingga user tetap login.
+        self.assertEqual(self.client.get(reverse('authenticate:profile')).status_code, 200)
+
+    def test_upgrade_skips_password_changed_meanwhile(self):
+        user = User.objects.create_user(username='ganti', password='lama123')
+        stale = user.password
+        user.set_password('baru123')
+        user.save(update_fields=['password'])
+
+        self.assertFalse(upgrade_password_hash(user.pk, stale, 'lama123'))
+        user.refresh_from_db()
+        self.assertTrue(user.check_password('baru123'))
+
+    def test_bench_password_hashing_command(self):
+        out = StringIO()
+        call_command('bench_password_hashing', profile='test', seconds=0.01, stdout=out)
+        self.assertIn('MD5PasswordHasher', out.getvalue())
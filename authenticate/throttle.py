@@ -0,0 +1,209 @@
+"""
+Throttling percobaan login.
+
+Setiap percobaan login dicek terhadap dua token bucket (per IP dan per
+username) *sebelum* ``authenticate()``, sehingga banjir request ditolak tanpa
+pernah menjalankan hasher password yang mahal. Bucket IP dipotong setiap
+percobaan; bucket username hanya dipotong saat login gagal, sehingga login
+yang berhasil tidak menghabiskan jatah pemilik akun. Selain rate limit,
+kegagalan beruntun memicu lockout yang durasinya berlipat dua setiap kali
+(``LOCKOUT_BASE_SECONDS * 2**n``, maksimal ``LOCKOUT_MAX_SECONDS``).
+
+IP klien diambil dari ``REMOTE_ADDR``, atau dari header
+``LOGIN_THROTTLE_CLIENT_IP_HEADER`` (``X-Forwarded-For``) jika aplikasi
+berada di belakang ``LOGIN_THROTTLE_TRUSTED_PROXY_COUNT`` reverse proxy:
+entri ke-N dari kanan adalah alamat yang ditulis proxy tepercaya terluar,
+sehingga nilai palsu yang dikirim klien di sebelah kirinya diabaikan.
+
+State bucket disimpan di cache alias ``LOGIN_THROTTLE_CACHE``. Alias itu
+harus cache bersama (production: database cache, lihat settings.py) supaya
+batas berlaku untuk seluruh worker, bukan dikalikan jumlah worker.
+Read-modify-write bucket diserialkan dengan lock per proses; antar proses
+hasilnya perkiraan, cukup untuk membatasi laju.
+
+Jumlah percobaan yang ditolak dicatat di ``metrics`` per alasan.
+"""
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+# (kapasitas burst, token per detik)
+IP_BUCKET = (20, 20 / 300)
+USERNAME_BUCKET = (5, 5 / 300)
+
+# Jumlah kegagalan beruntun sebelum lockout dimulai, per scope.
+LOCKOUT_THRESHOLDS = {'ip': 50, 'user': 5}
+LOCKOUT_BASE_SECONDS = 30
+LOCKOUT_MAX_SECONDS = 60 * 60
+FAILURE_WINDOW_SECONDS = 60 * 60
+
+REASON_IP_RATE = 'ip_rate'
+REASON_USER_RATE = 'user_rate'
+REASON_LOCKED = 'locked'
+
+_bucket_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ThrottleDecision:
+    allowed: bool
+    retry_after: int = 0
+    reason: str = ''
+
+
+class LoginMetrics:
+    """Penghitung percobaan login per hasil (diterima / ditolak per alasan)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = Counter()
+
+    def record(self, outcome):
+        with self._lock:
+            self._counts[outcome] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+metrics = LoginMetrics()
+
+
+def is_enabled():
+    return getattr(settings, 'LOGIN_THROTTLE_ENABLED', True)
+
+
+def get_cache():
+    return caches[getattr(settings, 'LOGIN_THROTTLE_CACHE', 'default')]
+
+
+def client_ip(request):
+    """IP klien; di belakang proxy tepercaya diambil dari header forwarded."""
+    proxies = getattr(settings, 'LOGIN_THROTTLE_TRUSTED_PROXY_COUNT', 0)
+    if proxies:
+        header = getattr(settings, 'LOGIN_THROTTLE_CLIENT_IP_HEADER', 'HTTP_X_FORWARDED_FOR')
+        hops = [hop.strip() for hop in request.META.get(header, '').split(',') if hop.strip()]
+        if hops:
+            return hops[-min(proxies, len(hops))]
+    return request.META.get('REMOTE_ADDR') or 'unknown'
+
+
+def _identities(request, username):
+    """Pasangan ``(scope, id)``; username di-hash supaya aman dipakai sebagai key cache."""
+    normalized = (username or '').strip().lower()
+    return [
+        ('ip', client_ip(request)),
+        ('user', hashlib.sha1(normalized.encode()).hexdigest()),
+    ]
+
+
+def _take_token(scope, ident, capacity, rate, now, consume=True):
+    """
+    Ambil satu token (atau hanya cek jika ``consume`` False); kembalikan 0
+    jika token tersedia, atau detik sampai token berikutnya.
+    """
+    key = f'login-throttle:bucket:{scope}:{ident}'
+    cache = get_cache()
+    with _bucket_lock:
+        tokens, updated_at = cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * rate)
+        if tokens < 1:
+            cache.set(key, (tokens, now), math.ceil(capacity / rate))
+            return math.ceil((1 - tokens) / rate)
+        if consume:
+            cache.set(key, (tokens - 1, now), math.ceil(capacity / rate))
+        return 0
+
+
+def _locked_for(scope, ident, now):
+    expires_at = get_cache().get(f'login-throttle:lock:{scope}:{ident}')
+    if expires_at and expires_at > now:
+        return math.ceil(expires_at - now)
+    return 0
+
+
+def check_login(request, username):
+    """
+    Putuskan apakah percobaan login boleh diteruskan ke ``authenticate()``.
+    Dipanggil sekali per percobaan; setiap percobaan yang lolos memakai satu
+    token bucket IP, sedangkan bucket username hanya dicek (token dipotong
+    oleh ``register_failure``).
+    """
+    if not is_enabled():
+        return ThrottleDecision(True)
+
+    now = time.time()
+    identities = _identities(request, username)
+
+    for scope, ident in identities:
+        wait = _locked_for(scope, ident, now)
+        if wait:
+            metrics.record(REASON_LOCKED)
+            return ThrottleDecision(False, wait, REASON_LOCKED)
+
+    for (scope, ident), (capacity, rate), reason, consume in zip(
+        identities, (IP_BUCKET, USERNAME_BUCKET), (REASON_IP_RATE, REASON_USER_RATE), (True, False),
+    ):
+        wait = _take_token(scope, ident, capacity, rate, now, consume=consume)
+        if wait:
+            metrics.record(reason)
+            return ThrottleDecision(False, wait, reason)
+
+    metrics.record('allowed')
+    return ThrottleDecision(True)
+
+
+def register_failure(request, username):
+    """
+    Catat login gagal: potong satu token bucket username, lalu mulai /
+    perpanjang lockout jika kegagalan melewati ambang.
+    """
+    if not is_enabled():
+        return
+
+    now = time.time()
+    cache = get_cache()
+    identities = _identities(request, username)
+    _, user_ident = identities[1]
+    _take_token('user', user_ident, *USERNAME_BUCKET, now)
+    for scope, ident in identities:
+        key = f'login-throttle:failures:{scope}:{ident}'
+        cache.add(key, 0, FAILURE_WINDOW_SECONDS)
+        try:
+            failures = cache.incr(key)
+        except ValueError:
+            # Key kedaluwarsa di antara add() dan incr().
+            cache.set(key, 1, FAILURE_WINDOW_SECONDS)
+            failures = 1
+
+        over = failures - LOCKOUT_THRESHOLDS[scope]
+        if over < 0:
+            continue
+        duration = min(LOCKOUT_BASE_SECONDS * 2 ** over, LOCKOUT_MAX_SECONDS)
+        cache.set(f'login-throttle:lock:{scope}:{ident}', now + duration, duration)
+        logger.warning("Login %s terkunci %ss setelah %s kegagalan", scope, duration, failures)
+
+
+def register_success(request, username):
+    """Login berhasil: hapus hitungan gagal dan lockout untuk username tersebut."""
+    if not is_enabled():
+        return
+    _, ident = _identities(request, username)[1]
+    get_cache().delete_many([
+        f'login-throttle:failures:user:{ident}',
+        f'login-throttle:lock:user:{ident}',
+    ])
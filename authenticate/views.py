@@ -8,7 +8,13 @@ from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 import datetime
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.cache import cache_control
+from django.views.decorators.vary import vary_on_cookie
+from django.core.cache import cache
 from .forms import UserEditForm, UserProfileEditForm
+from .models import get_profile
+from . import throttle
+from venue.stats import get_booking_stats
 from django.contrib import messages
 
 
@@ -32,8 +38,7 @@ def register(request):
                     "message": "Username already taken."
                 }, status=400)
             else:
-                user = User.objects.create_user(username=username, password=password)
-                user.save()
+                User.objects.create_user(username=username, password=password)
                 messages.success(request, 'Account created successfully! Please login.')
                 
                 if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
@@ -63,6 +68,17 @@ def register(request):
 # LOGIN
 # ==============================================================
 
+def _throttled_response(request, decision):
+    message = f"Terlalu banyak percobaan login. Coba lagi dalam {decision.retry_after} detik."
+    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        response = JsonResponse({"status": False, "message": message}, status=429)
+    else:
+        messages.error(request, message)
+        response = render(request, 'authenticate/login.html', status=429)
+    response['Retry-After'] = str(decision.retry_after)
+    return response
+
+
 @csrf_exempt
 def login_user(request):
     """Handle user login"""
@@ -70,9 +86,6 @@ def login_user(request):
         username = request.POST.get('username')
         password = request.POST.get('password')
 
-        print("Received username:", username)
-        print("Received password:", password)
-
         if not username or not password:
             messages.error(request, "Please fill in both username and password.")
             if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
@@ -82,10 +95,16 @@ def login_user(request):
                 }, status=400)
             return render(request, 'authenticate/login.html')
 
+        # Ditolak sebelum authenticate() supaya banjir percobaan tidak
+        # pernah sampai ke hasher password.
+        decision = throttle.check_login(request, username)
+        if not decision.allowed:
+            return _throttled_response(request, decision)
+
         user = authenticate(request, username=username, password=password)
-        print("Authenticate result:", user)
 
         if user is not None:
+            throttle.register_success(request, username)
             login(request, user)
             response = HttpResponseRedirect(reverse("venue:home_section"))
             response.set_cookie('last_login', str(datetime.datetime.now()))
@@ -97,6 +116,7 @@ def login_user(request):
                 })
             return response
         else:
+            throttle.register_failure(request, username)
             messages.error(request, 'Invalid username or password.')
             if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
                 return JsonResponse({
@@ -130,30 +150,47 @@ def logout_user(request):
 # USER DATA (API)
 # ==============================================================
 
+USER_DATA_CACHE_SECONDS = 30
+
+
 @csrf_exempt
+@cache_control(private=True, max_age=USER_DATA_CACHE_SECONDS)
+@vary_on_cookie
 def get_user_data(request):
     """Return current user data"""
-    if request.user.is_authenticated:
-        return JsonResponse({
-            "username": request.user.username,
-            "last_login": request.COOKIES.get('last_login', 'Never'),
-            "is_authenticated": True
-        })
-    return JsonResponse({
-        "is_authenticated": False
-    })
+    # Dipanggil berulang oleh navbar: data user di-cache per session supaya
+    # request berikutnya tidak perlu memuat User dari database.
+    session_key = request.session.session_key
+    cache_key = f'auth:user-data:{session_key}' if session_key else None
+    data = cache.get(cache_key) if cache_key else None
+
+    if data is None:
+        if request.user.is_authenticated:
+            data = {"username": request.user.username, "is_authenticated": True}
+        else:
+            data = {"is_authenticated": False}
+        if cache_key:
+            cache.set(cache_key, data, USER_DATA_CACHE_SECONDS)
+
+    if data["is_authenticated"]:
+        data = {**data, "last_login": request.COOKIES.get('last_login', 'Never')}
+    return JsonResponse(data)
     
 @login_required 
 def profile(request):
-    return render(request, 'authenticate/profile.html')
+    return render(request, 'authenticate/profile.html', {
+        'profile': get_profile(request.user),
+        'booking_stats': get_booking_stats(request.user),
+    })
 
 @login_required
 def profile_edit(request):
+    user_profile = get_profile(request.user)
     if request.method == 'POST':
         u_form = UserEditForm(request.POST, instance=request.user)
         p_form = UserProfileEditForm(request.POST, 
                                      request.FILES, 
-                                     instance=request.user.userprofile)
+                                     instance=user_profile)
         
         if u_form.is_valid() and p_form.is_valid():
             u_form.save()
@@ -163,7 +200,7 @@ def profile_edit(request):
 
     else:
         u_form = UserEditForm(instance=request.user)
-        p_form = UserProfileEditForm(instance=request.user.userprofile)
+        p_form = UserProfileEditForm(instance=user_profile)
 
     context = {
         'u_form': u_form,
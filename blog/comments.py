@@ -0,0 +1,62 @@
+"""
+Komentar blog: halaman komentar utama (keyset, terbaru dulu) beserta seluruh
+balasannya.
+
+Komentar utama diambil dengan keyset pagination pada index
+``(blog, parent, -created_at)``; semua balasan untuk komentar di halaman itu
+diambil dengan SATU query ``path__startswith`` (materialized path, lihat
+``Comment``) dan diurutkan berdasarkan ``path`` sehingga langsung berurutan
+sesuai thread. Author selalu di-``select_related`` (tanpa N+1).
+"""
+from django.db.models import Q
+
+from main.pagination import keyset_paginate
+
+from .models import Comment
+
+PAGE_SIZE = 20
+ORDERING = ('-created_at', '-pk')
+
+
+def get_comment_page(blog, cursor=None, page_size=PAGE_SIZE):
+    """
+    ``KeysetPage`` berisi komentar utama ``blog``; setiap item punya atribut
+    ``thread`` (list balasan, urut sesuai thread, dengan ``depth``).
+    Raise ``InvalidCursor`` jika cursor rusak.
+    """
+    roots = Comment.objects.filter(blog=blog, parent__isnull=True).select_related('user')
+    page = keyset_paginate(roots, ORDERING, cursor=cursor, page_size=page_size)
+
+    threads = {comment.pk: [] for comment in page.items}
+    if threads:
+        prefixes = Q()
+        for comment in page.items:
+            prefixes |= Q(path__startswith=f"{comment.path}/")
+        replies = Comment.objects.filter(prefixes, blog=blog).select_related('user').order_by('path')
+        for reply in replies:
+            threads[int(reply.path.split('/', 1)[0])].append(reply)
+
+    for comment in page.items:
+        comment.thread = threads[comment.pk]
+    return page
+
+
+def serialize_comment(comment):
+    return {
+        'id': comment.pk,
+        'parent_id': comment.parent_id,
+        'depth': comment.depth,
+        'user': comment.user.username if comment.user else None,
+        'content': comment.content,
+        'created_at': comment.created_at.isoformat(),
+    }
+
+
+def serialize_page(page):
+    return {
+        'comments': [
+            {**serialize_comment(comment), 'replies': [serialize_comment(reply) for reply in comment.thread]}
+            for comment in page.items
+        ],
+        'next_cursor': page.next_cursor,
+    }
@@ -0,0 +1,141 @@
+"""
+Penghitung view blog dengan write-behind.
+
+Membaca artikel tidak lagi meng-UPDATE baris ``Blog`` setiap request.
+Kenaikan view ditampung di memori proses lalu di-flush berkala sebagai
+UPDATE ``blog_views = blog_views + n`` berkelompok (satu query per nilai
+``n``, lihat ``blog.rankings.record_views``), sehingga artikel viral tidak membuat semua pembaca antre di lock
+baris yang sama dan ``date_added`` (auto_now) tidak ikut berubah.
+
+Flush terjadi saat hit berikutnya datang setelah ``BLOG_VIEW_FLUSH_SECONDS``,
+dan juga lewat timer yang dipasang saat buffer pertama kali terisi, sehingga
+view pada artikel sepi tidak tertahan di memori lebih lama dari interval
+tersebut (dan tidak hilang saat worker dimatikan tanpa atexit). Command
+``refresh_blog_rankings`` juga mem-flush buffer proses yang menjalankannya.
+
+Setiap proses punya buffer sendiri; karena flush memakai ``F()`` yang
+bersifat aditif, hasil dari beberapa worker tetap terjumlah dengan benar.
+
+View unik: satu session (atau IP + user agent untuk pengunjung tanpa
+session) hanya dihitung sekali per ``BLOG_VIEW_DEDUP_SECONDS`` lewat
+``cache.add``.
+"""
+import atexit
+import hashlib
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+
+from main.tasks import run_in_background
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_SECONDS = 10
+DEFAULT_DEDUP_SECONDS = 30 * 60
+
+
+def _visitor_key(request):
+    session_key = getattr(getattr(request, 'session', None), 'session_key', None)
+    if session_key:
+        return session_key
+    raw = f"{request.META.get('REMOTE_ADDR', '')}|{request.META.get('HTTP_USER_AGENT', '')}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def is_unique_view(request, blog_id):
+    """True jika pengunjung ini belum dihitung untuk ``blog_id`` dalam jendela dedup."""
+    timeout = getattr(settings, 'BLOG_VIEW_DEDUP_SECONDS', DEFAULT_DEDUP_SECONDS)
+    return cache.add(f'blog:viewed:{blog_id}:{_visitor_key(request)}', 1, timeout)
+
+
+def _flush_interval():
+    return getattr(settings, 'BLOG_VIEW_FLUSH_SECONDS', DEFAULT_FLUSH_SECONDS)
+
+
+class ViewCounter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._last_flush = time.monotonic()
+        self._timer = None
+
+    def hit(self, blog_id):
+        """
+        Tambah satu view; flush otomatis jika interval sudah lewat. Gagal
+        flush hanya dicatat di log (view tetap di buffer), tidak pernah
+        menggagalkan request pembaca.
+        """
+        interval = _flush_interval()
+        with self._lock:
+            self._pending[blog_id] += 1
+            due = time.monotonic() - self._last_flush >= interval
+            if not due:
+                self._arm_timer(interval)
+        if due:
+            self._flush_quietly()
+
+    def _arm_timer(self, interval):
+        """Pasang timer flush jika belum ada (dipanggil dengan ``_lock`` dipegang)."""
+        if self._timer is not None or not getattr(settings, 'BLOG_VIEW_FLUSH_TIMER', True):
+            return
+        self._timer = threading.Timer(interval, run_in_background, args=[self._flush_quietly])
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush_quietly(self):
+        try:
+            self.flush()
+        except DatabaseError:
+            logger.exception("Gagal flush view blog; dicoba lagi")
+            with self._lock:
+                self._arm_timer(_flush_interval())
+
+    def pending(self, blog_id):
+        """View yang belum di-flush untuk ``blog_id`` (untuk ditampilkan)."""
+        with self._lock:
+            return self._pending.get(blog_id, 0)
+
+    def flush(self):
+        """Tulis semua view tertunda ke database. Mengembalikan jumlah view yang ditulis."""
+        from blog.rankings import record_views
+
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = time.monotonic()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not pending:
+            return 0
+
+        try:
+            record_views(pending)
+        except DatabaseError:
+            # Kembalikan ke buffer supaya dicoba lagi pada flush berikutnya.
+            with self._lock:
+                self._pending.update(pending)
+            raise
+        return sum(pending.values())
+
+
+view_counter = ViewCounter()
+
+
+def record_view(request, blog):
+    """Catat view ``blog`` dari ``request`` (jika unik) dan kembalikan total view terkini."""
+    if is_unique_view(request, blog.pk):
+        view_counter.hit(blog.pk)
+    return blog.blog_views + view_counter.pending(blog.pk)
+
+
+@atexit.register
+def _flush_on_exit():
+    try:
+        view_counter.flush()
+    except Exception:
+        logger.exception("Gagal flush view blog saat proses berhenti")
@@ -0,0 +1,78 @@
+"""
+Feed daftar blog untuk ``show_blogmain``.
+
+- Filter didefinisikan di ``FEED_FILTERS`` (bukan rantai if/elif).
+- Halaman diambil dengan keyset pagination (``main.pagination``) yang
+  dilayani index ``(category, created_at)`` / ``(user, created_at)``, sehingga
+  biaya per halaman tetap walaupun jumlah post bertambah.
+- Jumlah komentar dibaca dari kolom ``Blog.comment_count`` yang dipelihara
+  signal ``Comment`` (lihat blog/signals.py), bukan ``Count('comments')``.
+- Setiap halaman di-cache per (filter, urutan, cursor, user). Key memakai
+  nomor versi yang dinaikkan setiap ada post/komentar baru, diubah atau
+  dihapus, sehingga cache lama otomatis tidak terpakai.
+"""
+from django.core.cache import cache
+from django.db.models import Q
+
+from main.pagination import keyset_paginate
+
+from .models import Blog
+
+PAGE_SIZE = 12
+CACHE_TTL_SECONDS = 60
+_VERSION_KEY = 'blog:feed:version'
+
+# filter -> fungsi(user) yang mengembalikan Q, atau None jika hasilnya kosong
+FEED_FILTERS = {
+    'all': lambda user: Q(),
+    'e-sports': lambda user: Q(category='e-sports'),
+    'sports': lambda user: Q(category='sports'),
+    'community posts': lambda user: Q(category='community posts'),
+    'my_blog': lambda user: Q(user=user) if user.is_authenticated else None,
+}
+
+# Urutan feed; selalu diakhiri pk supaya keyset deterministik
+FEED_SORTS = {
+    'latest': ('-created_at', '-pk'),
+    'trending': ('-trending_score', '-created_at', '-pk'),
+    'discussed': ('-discussion_score', '-created_at', '-pk'),
+}
+
+
+def _version():
+    return cache.get_or_set(_VERSION_KEY, 1, None)
+
+
+def invalidate_feed():
+    try:
+        cache.incr(_VERSION_KEY)
+    except ValueError:
+        cache.set(_VERSION_KEY, 1, None)
+
+
+def normalize(filter_type, sort):
+    if filter_type not in FEED_FILTERS:
+        filter_type = 'all'
+    if sort not in FEED_SORTS:
+        sort = 'latest'
+    return filter_type, sort
+
+
+def get_feed_page(user, filter_type='all', sort='latest', cursor=None, page_size=PAGE_SIZE):
+    """
+    Satu halaman feed sebagai ``KeysetPage``. Raise ``InvalidCursor`` jika
+    cursor rusak.
+    """
+    filter_type, sort = normalize(filter_type, sort)
+    condition = FEED_FILTERS[filter_type](user)
+    if condition is None:
+        return keyset_paginate(Blog.objects.none(), FEED_SORTS[sort], page_size=page_size)
+
+    owner = user.pk if filter_type == 'my_blog' else ''
+    key = f'blog:feed:{_version()}:{filter_type}:{sort}:{owner}:{cursor or ""}:{page_size}'
+    page = cache.get(key)
+    if page is None:
+        queryset = Blog.objects.filter(condition).select_related('user')
+        page = keyset_paginate(queryset, FEED_SORTS[sort], cursor=cursor, page_size=page_size)
+        cache.set(key, page, CACHE_TTL_SECONDS)
+    return page
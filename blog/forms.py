@@ -11,4 +11,11 @@ class BlogForm(ModelForm):
 class CommentForm(ModelForm):
     class Meta:
         model = Comment
-        fields = ['content']
+        fields = ['content', 'parent']
+        widgets = {'parent': forms.HiddenInput}
+
+    def __init__(self, *args, blog=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Balasan hanya boleh ke komentar di blog yang sama; nilai "parent"
+        # yang bukan id komentar blog ini menjadi error form, bukan 500.
+        self.fields['parent'].queryset = Comment.objects.filter(blog=blog)
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog.counters import view_counter
+from blog.rankings import WINDOW_DAYS, refresh_rankings
+
+
+class Command(BaseCommand):
+    help = f"Hitung ulang skor trending / diskusi blog dari aktivitas {WINDOW_DAYS} hari terakhir (jalankan tiap jam)."
+
+    def handle(self, *args, **options):
+        view_counter.flush()
+        ranked = refresh_rankings()
+        self.stdout.write(self.style.SUCCESS(f"Skor {ranked} blog diperbarui."))
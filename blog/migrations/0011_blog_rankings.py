@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_alter_blog_thumbnail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='discussion_score',
+            field=models.FloatField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='trending_score',
+            field=models.FloatField(db_index=True, default=0),
+        ),
+        migrations.AlterField(
+            model_name='blog',
+            name='thumbnail',
+            field=models.ImageField(blank=True, null=True, upload_to='thumbnails/'),
+        ),
+        migrations.CreateModel(
+            name='BlogActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('comments', models.PositiveIntegerField(default=0)),
+                ('blog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity', to='blog.blog')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['hour'], name='blog_blogac_hour_f366eb_idx')],
+                'unique_together': {('blog', 'hour')},
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:17
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_comment_count(apps, schema_editor):
+    Blog = apps.get_model('blog', 'Blog')
+    Comment = apps.get_model('blog', 'Comment')
+    counts = (
+        Comment.objects.filter(blog=OuterRef('pk'))
+        .values('blog')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    Blog.objects.update(comment_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_blog_rankings'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_comment_count, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['category', '-created_at'], name='blog_blog_categor_3b22b3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['user', '-created_at'], name='blog_blog_user_id_4e9d65_idx'),
+        ),
+    ]
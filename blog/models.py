@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import F
 from django.contrib.auth.models import User
 
 class Blog(models.Model):
@@ -16,20 +17,76 @@ class Blog(models.Model):
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
     content_comment =models.TextField(blank=True,null=True)
     thumbnail = models.ImageField(upload_to='thumbnails/', blank=True, null=True)
+    # Skor ranking dengan peluruhan waktu, dipelihara oleh blog/rankings.py
+    trending_score = models.FloatField(default=0, db_index=True)
+    discussion_score = models.FloatField(default=0, db_index=True)
+    # Jumlah komentar, dipelihara signal Comment (blog/signals.py)
+    comment_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['category', '-created_at']),
+            models.Index(fields=['user', '-created_at']),
+        ]
 
     def __str__(self):
         return self.title
     
-    def increment_views(self):
-        self.blog_views += 1
-        self.save()
+    def increment_views(self, count=1):
+        # UPDATE atomik tanpa menyimpan ulang seluruh baris (date_added tidak ikut berubah).
+        Blog.objects.filter(pk=self.pk).update(blog_views=F('blog_views') + count)
+        self.blog_views += count
 
 class Comment(models.Model):
+    # Balasan disimpan sebagai materialized path: "<id root>/<id anak>/..." dengan
+    # id zero-padded, sehingga satu thread bisa diambil dengan path__startswith
+    # dan diurutkan berdasarkan path.
+    PATH_SEGMENT_WIDTH = 10
+    MAX_DEPTH = 5
+
     blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name='comments')
     user = models.ForeignKey(User, on_delete=models.CASCADE,null=True)
+    parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='replies')
+    path = models.CharField(max_length=80, blank=True, db_index=True)
+    depth = models.PositiveSmallIntegerField(default=0)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['blog', 'parent', '-created_at']),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.content[:20]}"
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        if adding and self.parent_id:
+            # Balasan yang terlalu dalam ditempelkan ke induknya supaya path tetap pendek.
+            while self.parent.depth >= self.MAX_DEPTH:
+                self.parent = self.parent.parent
+            self.depth = self.parent.depth + 1
+        super().save(*args, **kwargs)
+        if adding:
+            segment = str(self.pk).zfill(self.PATH_SEGMENT_WIDTH)
+            self.path = f"{self.parent.path}/{segment}" if self.parent_id else segment
+            Comment.objects.filter(pk=self.pk).update(path=self.path)
+
+
+class BlogActivity(models.Model):
+    """Jumlah view dan komentar sebuah blog per jam (bahan skor ranking)."""
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name='activity')
+    hour = models.DateTimeField()
+    views = models.PositiveIntegerField(default=0)
+    comments = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('blog', 'hour')
+        indexes = [
+            models.Index(fields=['hour']),
+        ]
+
+    def __str__(self):
+        return f"{self.blog_id} @ {self.hour:%Y-%m-%d %H:00}"
 # Create your models here.
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+Ranking blog "trending minggu ini" dan "paling ramai dibahas".
+
+Setiap view (hasil flush blog/counters.py) dan komentar baru dicatat ke
+bucket per jam ``BlogActivity`` dan langsung menambah kolom ``trending_score``
+/ ``discussion_score`` di ``Blog``. Halaman daftar cukup ``ORDER BY`` kolom
+ber-index tersebut, tanpa agregasi saat request.
+
+Peluruhan waktu diterapkan oleh ``refresh_rankings`` (management command
+``refresh_blog_rankings``, jalankan tiap jam lewat cron): skor dihitung ulang
+dari bucket ``WINDOW_DAYS`` terakhir dengan bobot ``0.5 ** (umur / HALF_LIFE)``,
+bucket yang lebih tua dihapus dan blog tanpa aktivitas kembali ke 0. Di antara
+dua refresh, event baru ditambahkan dengan bobot penuh.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Blog, BlogActivity
+
+WINDOW_DAYS = 7
+TRENDING_HALF_LIFE_HOURS = 24
+DISCUSSION_HALF_LIFE_HOURS = 72
+VIEW_WEIGHT = 1.0
+COMMENT_WEIGHT = 5.0
+
+
+def _bucket(when=None):
+    return (when or timezone.now()).replace(minute=0, second=0, microsecond=0)
+
+
+def _bump_bucket(blog_ids, hour, **increments):
+    """Tambah kolom ``increments`` pada bucket ``hour`` untuk semua ``blog_ids``."""
+    existing = set(
+        BlogActivity.objects.filter(blog_id__in=blog_ids, hour=hour).values_list('blog_id', flat=True)
+    )
+    missing = [blog_id for blog_id in blog_ids if blog_id not in existing]
+    if missing:
+        try:
+            with transaction.atomic():
+                BlogActivity.objects.bulk_create(
+                    [BlogActivity(blog_id=blog_id, hour=hour, **increments) for blog_id in missing]
+                )
+        except IntegrityError:
+            # Worker lain membuat bucket yang sama lebih dulu; tambahkan lewat UPDATE.
+            existing.update(missing)
+    if existing:
+        BlogActivity.objects.filter(blog_id__in=existing, hour=hour).update(
+            **{field: F(field) + amount for field, amount in increments.items()}
+        )
+
+
+def record_views(counts, when=None):
+    """
+    Tulis view tertunda ``{blog_id: jumlah}``: ``blog_views``, skor trending
+    dan bucket jam ini. Satu UPDATE per nilai jumlah yang berbeda.
+    """
+    hour = _bucket(when)
+    # Blog yang terhapus sebelum flush dilewati (bucket-nya akan melanggar FK).
+    live = set(Blog.objects.filter(pk__in=list(counts)).values_list('pk', flat=True))
+    by_increment = defaultdict(list)
+    for blog_id, count in counts.items():
+        if blog_id in live:
+            by_increment[count].append(blog_id)
+
+    with transaction.atomic():
+        for count, blog_ids in sorted(by_increment.items()):
+            blog_ids = sorted(blog_ids)
+            Blog.objects.filter(pk__in=blog_ids).update(
+                blog_views=F('blog_views') + count,
+                trending_score=F('trending_score') + count * VIEW_WEIGHT,
+            )
+            _bump_bucket(blog_ids, hour, views=count)
+
+
+def record_comment(blog_id, when=None):
+    with transaction.atomic():
+        Blog.objects.filter(pk=blog_id).update(
+            trending_score=F('trending_score') + COMMENT_WEIGHT,
+            discussion_score=F('discussion_score') + 1,
+        )
+        _bump_bucket([blog_id], _bucket(when), comments=1)
+
+
+def _decay(age, half_life_hours):
+    return 0.5 ** (age.total_seconds() / 3600 / half_life_hours)
+
+
+def refresh_rankings(now=None):
+    """
+    Hitung ulang skor dari bucket ``WINDOW_DAYS`` terakhir dan buang bucket
+    lama. Mengembalikan jumlah blog yang punya skor.
+    """
+    now = now or timezone.now()
+    since = _bucket(now) - timedelta(days=WINDOW_DAYS)
+
+    trending = defaultdict(float)
+    discussion = defaultdict(float)
+    rows = BlogActivity.objects.filter(hour__gte=since).values_list('blog_id', 'hour', 'views', 'comments')
+    for blog_id, hour, views, comments in rows.iterator():
+        age = max(now - hour, timedelta(0))
+        trending[blog_id] += (views * VIEW_WEIGHT + comments * COMMENT_WEIGHT) * _decay(age, TRENDING_HALF_LIFE_HOURS)
+        discussion[blog_id] += comments * _decay(age, DISCUSSION_HALF_LIFE_HOURS)
+
+    blogs = [
+        Blog(pk=blog_id, trending_score=score, discussion_score=discussion[blog_id])
+        for blog_id, score in trending.items()
+    ]
+    with transaction.atomic():
+        BlogActivity.objects.filter(hour__lt=since).delete()
+        Blog.objects.exclude(pk__in=list(trending)).exclude(
+            trending_score=0, discussion_score=0,
+        ).update(trending_score=0, discussion_score=0)
+        Blog.objects.bulk_update(blogs, ['trending_score', 'discussion_score'], batch_size=500)
+    return len(blogs)
@@ -0,0 +1,32 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from main.thumbnails import track_image_field
+
+from .feed import invalidate_feed
+from .models import Blog, Comment
+from .rankings import record_comment
+
+
+@receiver(post_save, sender=Comment)
+def count_comment_activity(sender, instance, created, **kwargs):
+    if created:
+        Blog.objects.filter(pk=instance.blog_id).update(comment_count=F('comment_count') + 1)
+        record_comment(instance.blog_id, instance.created_at)
+        invalidate_feed()
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_comment(sender, instance, **kwargs):
+    Blog.objects.filter(pk=instance.blog_id, comment_count__gt=0).update(comment_count=F('comment_count') - 1)
+    invalidate_feed()
+
+
+@receiver(post_save, sender=Blog)
+@receiver(post_delete, sender=Blog)
+def refresh_feed(sender, instance, **kwargs):
+    invalidate_feed()
+
+
+track_image_field(Blog, 'thumbnail')
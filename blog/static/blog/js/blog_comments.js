@@ -0,0 +1,83 @@
+document.addEventListener('DOMContentLoaded', () => {
+  const list = document.getElementById('comment-list');
+  const loadMore = document.getElementById('load-more-comments');
+  const parentInput = document.getElementById('comment-parent');
+  const replyLabel = document.getElementById('comment-reply-label');
+  const form = document.getElementById('comment-form');
+
+  // Reply: isi parent lalu fokus ke form komentar
+  function setReply(parentId) {
+    if (!parentInput) return;
+    parentInput.value = parentId || '';
+    replyLabel?.classList.toggle('hidden', !parentId);
+    if (parentId) form?.querySelector('textarea')?.focus();
+  }
+
+  list?.addEventListener('click', (e) => {
+    const button = e.target.closest('.comment-reply');
+    if (button) setReply(button.dataset.parent);
+  });
+  document.getElementById('comment-reply-cancel')?.addEventListener('click', () => setReply(''));
+
+  function formatDate(iso) {
+    return new Date(iso).toLocaleString('id-ID', {
+      day: '2-digit', month: 'short', year: 'numeric', hour: '2-digit', minute: '2-digit',
+    });
+  }
+
+  function commentNode(comment, isReply) {
+    const wrapper = document.createElement('div');
+    if (isReply) {
+      wrapper.className = 'border-l-2 border-red-200 pl-3 mt-3';
+      wrapper.style.marginLeft = `${comment.depth}rem`;
+    } else {
+      wrapper.className = 'bg-gray-50 border border-gray-200 rounded-lg p-4 shadow-sm';
+      wrapper.dataset.commentId = comment.id;
+    }
+
+    const header = document.createElement('div');
+    header.className = 'flex justify-between items-center mb-1';
+    const author = document.createElement('b');
+    author.className = isReply ? 'text-red-700 text-sm' : 'text-red-700';
+    author.textContent = comment.user || '-';
+    const date = document.createElement('span');
+    date.className = 'text-xs text-gray-400';
+    date.textContent = formatDate(comment.created_at);
+    header.append(author, date);
+
+    const content = document.createElement('p');
+    content.className = isReply ? 'text-gray-700 text-sm' : 'text-gray-700';
+    content.textContent = comment.content;
+
+    const reply = document.createElement('button');
+    reply.type = 'button';
+    reply.className = 'comment-reply text-xs text-red-700 hover:underline mt-1';
+    reply.dataset.parent = comment.id;
+    reply.textContent = 'Reply';
+
+    wrapper.append(header, content, reply);
+    (comment.replies || []).forEach((child) => wrapper.appendChild(commentNode(child, true)));
+    return wrapper;
+  }
+
+  loadMore?.addEventListener('click', async () => {
+    loadMore.disabled = true;
+    try {
+      const url = `${loadMore.dataset.url}?cursor=${encodeURIComponent(loadMore.dataset.cursor)}`;
+      const response = await fetch(url, { headers: { 'Accept': 'application/json' } });
+      if (!response.ok) throw new Error(`HTTP ${response.status}`);
+      const data = await response.json();
+
+      data.comments.forEach((comment) => list.appendChild(commentNode(comment, false)));
+      if (data.next_cursor) {
+        loadMore.dataset.cursor = data.next_cursor;
+        loadMore.disabled = false;
+      } else {
+        loadMore.remove();
+      }
+    } catch (err) {
+      console.error('Gagal memuat komentar:', err);
+      loadMore.disabled = false;
+    }
+  });
+});
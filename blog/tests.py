@@ -1,4 +1,6 @@
-from django.test import TestCase, Client
+from unittest import mock
+
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from django.contrib.auth.models import User
 from blog.models import Blog
@@ -298,3 +300,247 @@ class BlogViewsTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'edit_blog.html')
         self.assertIn('form', response.context)
+
+
+class BlogViewCounterTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from blog.counters import view_counter
+        cache.clear()
+        view_counter.flush()
+        self.counter = view_counter
+        self.blog = Blog.objects.create(title='Viral', content='-', category='sports', blog_views=5)
+        self.url = reverse('blog:show_blog', args=[self.blog.id])
+
+    def test_views_buffered_and_deduplicated_per_visitor(self):
+        with self.settings(BLOG_VIEW_FLUSH_SECONDS=3600):
+            first = Client(REMOTE_ADDR='10.0.0.1')
+            response = first.get(self.url)
+            self.assertEqual(response.context['blog'].blog_views, 6)
+            first.get(self.url)
+            Client(REMOTE_ADDR='10.0.0.2').get(self.url)
+
+        self.blog.refresh_from_db()
+        self.assertEqual(self.blog.blog_views, 5)
+        self.assertEqual(self.counter.pending(self.blog.id), 2)
+
+        self.assertEqual(self.counter.flush(), 2)
+        self.blog.refresh_from_db()
+        self.assertEqual(self.blog.blog_views, 7)
+        self.assertEqual(self.counter.pending(self.blog.id), 0)
+
+    def test_flush_batches_by_increment(self):
+        other = Blog.objects.create(title='Lain', content='-', category='sports')
+        third = Blog.objects.create(title='Ketiga', content='-', category='sports')
+        with self.settings(BLOG_VIEW_FLUSH_SECONDS=3600):
+            for blog_id in (self.blog.id, other.id, third.id, third.id):
+                self.counter.hit(blog_id)
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries:
+            self.counter.flush()
+        blog_updates = [q for q in queries if q['sql'].startswith('UPDATE "blog_blog"')]
+        self.assertEqual(len(blog_updates), 2)
+        self.assertEqual(
+            list(Blog.objects.order_by('pk').values_list('blog_views', flat=True)),
+            [6, 1, 2],
+        )
+
+    @override_settings(BLOG_VIEW_FLUSH_TIMER=True, BLOG_VIEW_FLUSH_SECONDS=5, BACKGROUND_TASKS_EAGER=True)
+    def test_lone_hit_flushed_by_timer(self):
+        with mock.patch('blog.counters.threading.Timer') as timer:
+            self.counter.hit(self.blog.id)
+            self.counter.hit(self.blog.id)
+        timer.assert_called_once()
+        interval, callback = timer.call_args.args
+        self.assertEqual(interval, 5)
+
+        # Timer berjalan tanpa hit lain: buffer langsung ditulis ke database.
+        callback(*timer.call_args.kwargs['args'])
+        self.blog.refresh_from_db()
+        self.assertEqual(self.blog.blog_views, 7)
+        self.assertEqual(self.counter.pending(self.blog.id), 0)
+
+    @override_settings(BLOG_VIEW_FLUSH_SECONDS=0)
+    def test_failed_flush_does_not_break_page_view(self):
+        from django.db import DatabaseError
+        with mock.patch('blog.rankings.record_views', side_effect=DatabaseError), \
+                self.assertLogs('blog.counters', 'ERROR'):
+            response = Client().get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.counter.pending(self.blog.id), 1)
+
+        self.assertEqual(self.counter.flush(), 1)
+        self.blog.refresh_from_db()
+        self.assertEqual(self.blog.blog_views, 6)
+
+    def test_increment_views_keeps_date_added(self):
+        Blog.objects.filter(pk=self.blog.pk).update(date_added='2020-01-01')
+        self.blog.refresh_from_db()
+        self.blog.increment_views()
+        self.blog.refresh_from_db()
+        self.assertEqual(self.blog.blog_views, 6)
+        self.assertEqual(str(self.blog.date_added), '2020-01-01')
+
+
+class BlogRankingTest(TestCase):
+    def setUp(self):
+        from blog.counters import view_counter
+        view_counter.flush()
+        self.user = User.objects.create_user(username='penulis', password='testpass123')
+        self.old = Blog.objects.create(title='Lama', content='-', category='sports')
+        self.hot = Blog.objects.create(title='Panas', content='-', category='sports')
+        self.talk = Blog.objects.create(title='Ramai', content='-', category='sports')
+
+    def test_events_update_scores_and_buckets(self):
+        from blog.models import BlogActivity, Comment
+        from blog.rankings import record_views
+        record_views({self.hot.id: 10, self.old.id: 2})
+        Comment.objects.create(blog=self.talk, user=self.user, content='Setuju')
+
+        self.hot.refresh_from_db()
+        self.talk.refresh_from_db()
+        self.assertEqual(self.hot.blog_views, 10)
+        self.assertEqual(self.hot.trending_score, 10)
+        self.assertEqual(self.talk.discussion_score, 1)
+        self.assertEqual(BlogActivity.objects.get(blog=self.talk).comments, 1)
+
+        record_views({self.hot.id: 1})
+        self.assertEqual(BlogActivity.objects.get(blog=self.hot).views, 11)
+
+    def test_refresh_applies_decay_and_drops_stale_activity(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from blog.models import BlogActivity
+        from blog.rankings import record_views, refresh_rankings, TRENDING_HALF_LIFE_HOURS, WINDOW_DAYS
+        now = timezone.now()
+        record_views({self.old.id: 100}, when=now - timedelta(days=WINDOW_DAYS + 1))
+        record_views({self.hot.id: 8}, when=now - timedelta(hours=TRENDING_HALF_LIFE_HOURS))
+
+        self.assertEqual(refresh_rankings(now=now), 1)
+        self.old.refresh_from_db()
+        self.hot.refresh_from_db()
+        self.assertEqual(self.old.trending_score, 0)
+        self.assertAlmostEqual(self.hot.trending_score, 4, delta=0.5)
+        self.assertFalse(BlogActivity.objects.filter(blog=self.old).exists())
+
+    def test_blogmain_sorted_by_trending_and_discussion(self):
+        Blog.objects.filter(pk=self.hot.pk).update(trending_score=50)
+        Blog.objects.filter(pk=self.talk.pk).update(discussion_score=3)
+        client = Client()
+        response = client.get(reverse('blog:show_blogmain'), {'sort': 'trending'})
+        self.assertEqual(list(response.context['posts'])[0], self.hot)
+        response = client.get(reverse('blog:show_blogmain'), {'sort': 'discussed'})
+        self.assertEqual(list(response.context['posts'])[0], self.talk)
+        self.assertEqual(response.context['active_sort'], 'discussed')
+
+
+class BlogFeedTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.user = User.objects.create_user(username='pembaca', password='testpass123')
+        self.client = Client()
+        self.posts = [
+            Blog.objects.create(title=f'Post {i}', content='-', category='sports', user=self.user)
+            for i in range(15)
+        ]
+
+    def test_feed_paginates_with_cursor(self):
+        url = reverse('blog:show_blogmain')
+        first = self.client.get(url, {'filter': 'sports'})
+        self.assertEqual(len(first.context['posts']), 12)
+        self.assertIsNotNone(first.context['next_cursor'])
+
+        second = self.client.get(url, {'filter': 'sports', 'cursor': first.context['next_cursor']})
+        seen = {post.pk for post in first.context['posts']} | {post.pk for post in second.context['posts']}
+        self.assertEqual(seen, {post.pk for post in self.posts})
+        self.assertIsNone(second.context['next_cursor'])
+
+    def test_comment_count_maintained_by_signals(self):
+        from blog.models import Comment
+        blog = self.posts[0]
+        comment = Comment.objects.create(blog=blog, user=self.user, content='Mantap')
+        Comment.objects.create(blog=blog, user=self.user, content='Setuju')
+        blog.refresh_from_db()
+        self.assertEqual(blog.comment_count, 2)
+        comment.delete()
+        blog.refresh_from_db()
+        self.assertEqual(blog.comment_count, 1)
+
+    def test_pages_cached_until_new_post(self):
+        url = reverse('blog:show_blogmain')
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            self.client.get(url)
+        new = Blog.objects.create(title='Baru', content='-', category='sports', user=self.user)
+        response = self.client.get(url)
+        self.assertEqual(response.context['posts'][0], new)
+
+
+class BlogCommentThreadTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.user = User.objects.create_user(username='komentator', password='testpass123')
+        self.client = Client()
+        self.client.login(username='komentator', password='testpass123')
+        self.blog = Blog.objects.create(title='Diskusi', content='-', category='sports', user=self.user)
+
+    def comment(self, content, parent=None):
+        from blog.models import Comment
+        return Comment.objects.create(blog=self.blog, user=self.user, content=content, parent=parent)
+
+    def test_replies_stored_as_materialized_path(self):
+        root = self.comment('Root')
+        child = self.comment('Child', parent=root)
+        grandchild = self.comment('Grandchild', parent=child)
+        self.assertEqual(root.path, str(root.pk).zfill(10))
+        self.assertEqual(grandchild.path, f'{child.path}/{str(grandchild.pk).zfill(10)}')
+        self.assertEqual(grandchild.depth, 2)
+
+        deep = grandchild
+        for _ in range(5):
+            deep = self.comment('Deep', parent=deep)
+        self.assertEqual(deep.depth, 5)
+
+    def test_comment_page_fetches_threads_in_fixed_queries(self):
+        from blog.comments import get_comment_page
+        roots = [self.comment(f'Root {i}') for i in range(3)]
+        reply = self.comment('Reply', parent=roots[0])
+        self.comment('Nested', parent=reply)
+        self.comment('Other', parent=roots[2])
+
+        with self.assertNumQueries(2):
+            page = get_comment_page(self.blog)
+            names = [c.user.username for c in page.items for c in [c, *c.thread]]
+        self.assertEqual(len(names), 6)
+        by_id = {comment.pk: comment for comment in page.items}
+        self.assertEqual([c.content for c in by_id[roots[0].pk].thread], ['Reply', 'Nested'])
+
+    def test_show_blog_paginates_and_json_loads_more(self):
+        for i in range(25):
+            self.comment(f'Komentar {i}')
+        response = self.client.get(reverse('blog:show_blog', args=[self.blog.id]))
+        self.assertEqual(len(response.context['comments']), 20)
+        cursor = response.context['comments_next_cursor']
+
+        data = self.client.get(reverse('blog:show_blog_comments', args=[self.blog.id]), {'cursor': cursor}).json()
+        self.assertEqual([c['content'] for c in data['comments']], [f'Komentar {i}' for i in range(4, -1, -1)])
+        self.assertIsNone(data['next_cursor'])
+
+    def test_reply_posted_through_detail_form(self):
+        root = self.comment('Root')
+        self.client.post(reverse('blog:show_blog', args=[self.blog.id]), {'content': 'Balas', 'parent': root.pk})
+        self.assertEqual(root.replies.get().content, 'Balas')
+
+    def test_invalid_reply_parent_is_rejected_by_form(self):
+        from blog.models import Comment
+        other_blog = Blog.objects.create(user=self.user, title='Lain', content='Isi', category='community posts')
+        foreign = Comment.objects.create(blog=other_blog, user=self.user, content='Asing')
+        url = reverse('blog:show_blog', args=[self.blog.id])
+        for parent in ('abc', foreign.pk):
+            response = self.client.post(url, {'content': 'Balas', 'parent': parent})
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('parent', response.context['form'].errors)
+        self.assertFalse(Comment.objects.filter(content='Balas').exists())
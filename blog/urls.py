@@ -1,5 +1,5 @@
 from django.urls import path
-from blog.views import show_blogmain,add_blog,show_blog,show_xml,show_json,show_xml_by_id,show_json_by_id,edit_blog,delete_blog,add_blog_ajax
+from blog.views import show_blogmain,add_blog,show_blog,show_blog_comments,show_xml,show_json,show_xml_by_id,show_json_by_id,edit_blog,delete_blog,add_blog_ajax
 from django.conf.urls.static import static
 from django.conf import settings
 
@@ -9,6 +9,7 @@ urlpatterns = [
     path('', show_blogmain, name='show_blogmain'),
     path('add-blog/',add_blog,name='add_blog'),
     path('blog/<int:id>/',show_blog,name='show_blog'),
+    path('blog/<int:id>/comments/', show_blog_comments, name='show_blog_comments'),
     path('xml/',show_xml,name='show_xml'),
     path('json/',show_json,name='show_json'),
     path('xml/<str:blog_id>/', show_xml_by_id, name='show_xml_by_id'),
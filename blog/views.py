@@ -4,33 +4,26 @@ from blog.forms import BlogForm,CommentForm
 from django.http import HttpResponse,HttpResponseRedirect,JsonResponse
 from django.core import serializers
 from django.contrib.auth.decorators import login_required
-from django.db.models import Count
+from blog.counters import record_view
+from blog.comments import get_comment_page, serialize_page
+from blog.feed import get_feed_page, normalize
+from main.pagination import InvalidCursor
 from django.http import HttpResponseForbidden
-\
+
+
 def show_blogmain(request):
-    filter_type = request.GET.get("filter", "all")
-
-    if filter_type == 'e-sports':
-        blog_list = Blog.objects.filter(category='e-sports')
-    elif filter_type == 'sports':
-        blog_list = Blog.objects.filter(category='sports')
-    elif filter_type == 'community posts':
-        blog_list = Blog.objects.filter(category='community posts')
-    elif filter_type == 'my_blog':
-        if request.user.is_authenticated:
-            blog_list = Blog.objects.filter(user=request.user)
-        else:
-            blog_list = Blog.objects.none()
-    else:
-        blog_list = Blog.objects.all()
+    filter_type, sort = normalize(request.GET.get("filter", "all"), request.GET.get("sort", "latest"))
 
-    blog_list = blog_list.annotate(
-        comment_count=Count('comments')
-    ).order_by('-created_at')
+    try:
+        page = get_feed_page(request.user, filter_type, sort, cursor=request.GET.get("cursor"))
+    except InvalidCursor:
+        page = get_feed_page(request.user, filter_type, sort)
 
     context = {
-        'posts': blog_list,
+        'posts': page.items,
+        'next_cursor': page.next_cursor,
         'active_filter': filter_type,
+        'active_sort': sort,
     }
     return render(request, "main_blog.html", context)
 
@@ -63,11 +56,10 @@ def add_blog(request):
 
 def show_blog(request, id):
     blog = get_object_or_404(Blog, pk=id)
-    comments = blog.comments.order_by('-created_at')
     if request.method == "POST":
         if not request.user.is_authenticated:
             return redirect('login')
-        form = CommentForm(request.POST)
+        form = CommentForm(request.POST, blog=blog)
         if form.is_valid():
             comment = form.save(commit=False)
             comment.blog = blog
@@ -75,16 +67,34 @@ def show_blog(request, id):
             comment.save()
             return redirect('blog:show_blog', id=id)
     else:
-        form = CommentForm()
-    blog.increment_views()
+        form = CommentForm(blog=blog)
+    blog.blog_views = record_view(request, blog)
+
+    comments, comments_next_cursor = [], None
+    if request.user.is_authenticated:
+        page = get_comment_page(blog)
+        comments, comments_next_cursor = page.items, page.next_cursor
+
     context = {
         'blog': blog,
         'comments': comments,
+        'comments_next_cursor': comments_next_cursor,
         'form': form,
     }
 
     return render(request, "blog_detail.html", context)
 
+def show_blog_comments(request, id):
+    """Halaman komentar berikutnya (JSON) untuk tombol "load more"."""
+    if not request.user.is_authenticated:
+        return JsonResponse({'detail': 'Login untuk melihat komentar.'}, status=403)
+    blog = get_object_or_404(Blog, pk=id)
+    try:
+        page = get_comment_page(blog, cursor=request.GET.get('cursor'))
+    except InvalidCursor as exc:
+        return JsonResponse({'detail': str(exc)}, status=400)
+    return JsonResponse(serialize_page(page))
+
 def show_xml(request):
     blog_list = Blog.objects.all()
     xml_data = serializers.serialize("xml", blog_list)
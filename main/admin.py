@@ -1,3 +1,28 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import CustomUser
+
+
+@admin.register(CustomUser)
+class CustomUserAdmin(admin.ModelAdmin):
+    list_display = ('user', 'role', 'booking_count', 'active_booking_count', 'total_spent', 'last_booking_at')
+    list_filter = ('role',)
+    search_fields = ('user__username',)
+    # Statistik ikut di-JOIN sehingga daftar berapa pun panjangnya tetap satu query.
+    list_select_related = ('user', 'user__booking_stats')
+
+    @admin.display(description='Booking')
+    def booking_count(self, obj):
+        return obj.get_booking_count()
+
+    @admin.display(description='Aktif')
+    def active_booking_count(self, obj):
+        return obj.get_active_booking_count()
+
+    @admin.display(description='Total transaksi')
+    def total_spent(self, obj):
+        return obj.get_booking_stats().total_spent
+
+    @admin.display(description='Booking terakhir')
+    def last_booking_at(self, obj):
+        return obj.get_booking_stats().last_booking_at
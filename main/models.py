@@ -23,9 +23,18 @@ class CustomUser(models.Model):
     def is_regular_user(self):
         return self.role == 'user'
 
+    def get_booking_stats(self):
+        """Ringkasan booking user (satu baris ``UserBookingStats``, lihat venue/stats.py)"""
+        from venue.stats import get_booking_stats
+        return get_booking_stats(self.user)
+
     def get_booking_count(self):
         """Jumlah booking yang pernah dibuat user"""
-        return self.user.booking_set.count()
+        return self.get_booking_stats().total_count
+
+    def get_active_booking_count(self):
+        """Jumlah booking yang masih aktif (pending/confirmed)"""
+        return self.get_booking_stats().active_count
 
     def get_active_bookings(self):
         """Booking yang masih aktif (pending/confirmed)"""
@@ -34,3 +43,26 @@ class CustomUser(models.Model):
     def get_booking_history(self):
         """Semua booking history user"""
         return self.user.booking_set.all().order_by('-created_at')
+
+
+class ImageRendition(models.Model):
+    """
+    Turunan ukuran tetap (WebP/JPEG) dari gambar yang di-upload.
+
+    File disimpan content-addressed (``renditions/<sha256>/<lebar>.<format>``)
+    sehingga upload dengan isi yang sama memakai file yang sama.
+    Lihat main/thumbnails.py.
+    """
+    source = models.CharField(max_length=255, db_index=True, help_text="Nama file asli di storage")
+    digest = models.CharField(max_length=64)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    format = models.CharField(max_length=10)
+    path = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('source', 'width', 'format')
+
+    def __str__(self):
+        return f"{self.source} ({self.width}w {self.format})"
@@ -0,0 +1,110 @@
+"""
+Keyset (cursor) pagination yang dipakai bersama oleh beberapa app.
+
+Berbeda dengan OFFSET, halaman berikutnya diambil dengan kondisi
+``(kolom, pk) < (nilai_terakhir, pk_terakhir)`` sehingga biaya query tetap
+konstan seberapa jauh pun user menggulir, selama ada index yang cocok.
+"""
+import base64
+import json
+from dataclasses import dataclass, field
+
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 20
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class KeysetPage:
+    items: list = field(default_factory=list)
+    next_cursor: str | None = None
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def encode_cursor(values):
+    raw = json.dumps([str(value) for value in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, model, ordering):
+    """Ubah token cursor kembali menjadi nilai Python sesuai tipe field."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        raw_values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor('Cursor tidak valid.') from exc
+
+    if not isinstance(raw_values, list) or len(raw_values) != len(ordering):
+        raise InvalidCursor('Cursor tidak valid.')
+
+    values = []
+    for name, raw in zip(ordering, raw_values):
+        field_name = name.lstrip('-')
+        if field_name == 'pk':
+            model_field = model._meta.pk
+        else:
+            model_field = model._meta.get_field(field_name)
+        try:
+            values.append(model_field.to_python(raw))
+        except Exception as exc:
+            raise InvalidCursor('Cursor tidak valid.') from exc
+    return values
+
+
+def _after_filter(ordering, values):
+    """
+    Bangun Q untuk "baris setelah cursor" pada ordering multi-kolom, mis.
+    ``-created_at, -pk`` -> created_at < v0 OR (created_at = v0 AND pk < v1).
+    """
+    condition = Q()
+    for index, name in enumerate(ordering):
+        field_name = name.lstrip('-')
+        lookup = 'lt' if name.startswith('-') else 'gt'
+        clause = Q(**{f'{field_name}__{lookup}': values[index]})
+        for prev_name, prev_value in zip(ordering[:index], values[:index]):
+            clause &= Q(**{prev_name.lstrip('-'): prev_value})
+        condition |= clause
+    return condition
+
+
+def _resolve_value(obj, name):
+    field_name = name.lstrip('-')
+    if field_name == 'pk':
+        return obj.pk
+    return getattr(obj, field_name)
+
+
+def keyset_paginate(queryset, ordering, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Ambil satu halaman dari ``queryset`` berdasarkan ``ordering``.
+
+    ``ordering`` harus diakhiri kolom unik (biasanya ``'-pk'``) supaya urutan
+    deterministik. Mengembalikan ``KeysetPage`` berisi item dan ``next_cursor``.
+    Raise ``InvalidCursor`` jika token cursor rusak.
+    """
+    ordering = list(ordering)
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        values = decode_cursor(cursor, queryset.model, ordering)
+        queryset = queryset.filter(_after_filter(ordering, values))
+
+    rows = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor([_resolve_value(last, name) for name in ordering])
+    return KeysetPage(items=rows, next_cursor=next_cursor)
@@ -0,0 +1,92 @@
+"""
+Antrian pekerjaan latar belakang sederhana di dalam proses web (tanpa broker).
+
+Pekerjaan dijalankan di ``ThreadPoolExecutor`` kecil; cocok untuk pekerjaan
+singkat yang boleh hilang saat proses restart (mis. membuat thumbnail yang
+bisa dibuat ulang). Setiap pekerjaan menutup koneksi database thread-nya
+sendiri setelah selesai.
+
+Setting:
+- ``BACKGROUND_TASK_WORKERS``: jumlah thread worker (default 2).
+- ``BACKGROUND_TASKS_EAGER``: jalankan langsung di thread pemanggil
+  (dipakai di test / development).
+
+``run_after_response`` menunda pekerjaan sampai response request saat ini
+selesai dikirim, yaitu setelah semua middleware (termasuk penyimpanan
+session) selesai.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db import connections, transaction
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+_request_local = threading.local()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'BACKGROUND_TASK_WORKERS', 2),
+                thread_name_prefix='venyuk-task',
+            )
+        return _executor
+
+
+def _run(func, args, kwargs):
+    try:
+        return func(*args, **kwargs)
+    except Exception:
+        logger.exception("Pekerjaan latar belakang %s gagal", getattr(func, '__qualname__', func))
+    finally:
+        connections.close_all()
+
+
+def run_in_background(func, *args, **kwargs):
+    """Jalankan ``func(*args, **kwargs)`` di worker latar belakang."""
+    if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            logger.exception("Pekerjaan latar belakang %s gagal", getattr(func, '__qualname__', func))
+            return None
+    return _get_executor().submit(_run, func, args, kwargs)
+
+
+def run_after_commit(func, *args, **kwargs):
+    """Seperti ``run_in_background`` tetapi baru dijalankan setelah transaksi commit."""
+    transaction.on_commit(lambda: run_in_background(func, *args, **kwargs))
+
+
+def run_after_response(func, *args, **kwargs):
+    """
+    Seperti ``run_in_background`` tetapi baru dijalankan saat sinyal
+    ``request_finished`` request di thread ini. Hanya untuk dipanggil dari
+    dalam request.
+    """
+    pending = getattr(_request_local, 'pending', None)
+    if pending is None:
+        pending = _request_local.pending = []
+    pending.append((func, args, kwargs))
+
+
+@receiver(request_started)
+def _reset_after_response(**kwargs):
+    _request_local.pending = []
+
+
+@receiver(request_finished)
+def _flush_after_response(**kwargs):
+    pending = getattr(_request_local, 'pending', None) or []
+    _request_local.pending = []
+    for func, args, kwargs_ in pending:
+        run_in_background(func, *args, **kwargs_)
@@ -0,0 +1,38 @@
+from django import template
+from django.utils.html import format_html
+
+from main.thumbnails import is_remote, rendition_urls
+
+register = template.Library()
+
+DEFAULT_SIZES = '(min-width: 1024px) 33vw, (min-width: 640px) 50vw, 100vw'
+FALLBACK_WIDTH = 640
+
+
+def _srcset(entries):
+    return ', '.join(f"{url} {width}w" for url, width in entries)
+
+
+@register.simple_tag
+def responsive_image(image, alt='', css_class='', sizes=DEFAULT_SIZES):
+    """
+    ``<picture>`` dengan ``srcset`` WebP + JPEG untuk field gambar ``image``.
+    Jika rendition belum dibuat, gambar asli dipakai apa adanya.
+    """
+    name = getattr(image, 'name', image) or ''
+    if not name:
+        return ''
+    if is_remote(name):
+        return format_html('<img src="{}" alt="{}" class="{}" loading="lazy">', name, alt, css_class)
+
+    urls = rendition_urls(name)
+    jpeg = urls.get('jpeg')
+    if not jpeg:
+        return format_html('<img src="{}" alt="{}" class="{}" loading="lazy">', image.url, alt, css_class)
+
+    fallback = [url for url, width in jpeg if width <= FALLBACK_WIDTH] or [jpeg[0][0]]
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}" class="{}" loading="lazy" decoding="async"></picture>',
+        _srcset(urls.get('webp', [])), sizes, fallback[-1], _srcset(jpeg), sizes, alt, css_class,
+    )
@@ -1,3 +1,80 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from io import BytesIO
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+
+from main.models import ImageRendition
+
+
+def make_image(width, height, name='foto.jpg', color=(200, 30, 30)):
+    from PIL import Image
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), color).save(buffer, 'JPEG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+class ThumbnailPipelineTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root, BACKGROUND_TASKS_EAGER=True)
+        self.override.enable()
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def create_venue(self, image, name='Lapangan'):
+        from venue.models import Venue
+        with self.captureOnCommitCallbacks(execute=True):
+            return Venue.objects.create(name=name, category='futsal', price=100000, thumbnail=image)
+
+    def test_upload_generates_content_addressed_renditions(self):
+        venue = self.create_venue(make_image(1600, 900))
+        renditions = ImageRendition.objects.filter(source=venue.thumbnail.name)
+        self.assertEqual(
+            sorted(renditions.values_list('width', 'format')),
+            [(320, 'jpeg'), (320, 'webp'), (640, 'jpeg'), (640, 'webp'), (1024, 'jpeg'), (1024, 'webp')],
+        )
+        small = renditions.get(width=320, format='webp')
+        self.assertEqual(small.height, 180)
+        self.assertTrue(default_storage.exists(small.path))
+        self.assertIn(small.digest, small.path)
+
+        twin = self.create_venue(make_image(1600, 900, name='sama.jpg'), name='Kembar')
+        twin_paths = set(ImageRendition.objects.filter(source=twin.thumbnail.name).values_list('path', flat=True))
+        self.assertEqual(twin_paths, set(renditions.values_list('path', flat=True)))
+
+    def test_small_images_are_not_upscaled(self):
+        venue = self.create_venue(make_image(200, 100))
+        widths = set(ImageRendition.objects.filter(source=venue.thumbnail.name).values_list('width', flat=True))
+        self.assertEqual(widths, {200})
+
+    def test_template_tag_emits_srcset(self):
+        venue = self.create_venue(make_image(1600, 900))
+        html = Template(
+            '{% load renditions %}{% responsive_image venue.thumbnail alt=venue.name css_class="card" %}'
+        ).render(Context({'venue': venue}))
+        self.assertIn('<source type="image/webp" srcset="', html)
+        self.assertIn('320w', html)
+        self.assertIn('1024w', html)
+        self.assertIn('640.jpeg"', html)
+
+        remote = Template('{% load renditions %}{% responsive_image url %}').render(
+            Context({'url': 'https://example.com/a.jpg'})
+        )
+        self.assertIn('src="https://example.com/a.jpg"', remote)
+
+
+class BackgroundTaskTest(TestCase):
+    @override_settings(BACKGROUND_TASKS_EAGER=False)
+    def test_run_in_background_uses_worker_thread(self):
+        import threading
+        from main.tasks import run_in_background
+        future = run_in_background(lambda: threading.current_thread().name)
+        self.assertTrue(future.result(timeout=5).startswith('venyuk-task'))
@@ -0,0 +1,123 @@
+"""
+Pipeline thumbnail untuk gambar yang di-upload (blog, venue, foto profil).
+
+Setelah model dengan field gambar disimpan, ``generate_renditions`` dijalankan
+di worker latar belakang (main/tasks.py) dan membuat versi WebP + JPEG
+berukuran tetap (``RENDITION_WIDTHS``). File disimpan content-addressed
+berdasarkan SHA-256 isi file asli sehingga gambar yang sama tidak diproses
+dua kali. Template memakai tag ``{% responsive_image %}``
+(main/templatetags/renditions.py) yang mengeluarkan ``<picture>`` dengan
+``srcset``; selama rendition belum ada, gambar asli yang dipakai.
+"""
+import hashlib
+import logging
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models.signals import post_save
+
+from .models import ImageRendition
+from .tasks import run_after_commit
+
+logger = logging.getLogger(__name__)
+
+RENDITION_WIDTHS = (320, 640, 1024)
+# format -> (format Pillow, opsi encoder)
+RENDITION_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+RENDITION_ROOT = 'renditions'
+CACHE_TTL_SECONDS = 60 * 60
+MISS_TTL_SECONDS = 60
+
+
+def is_remote(name):
+    return (name or '').startswith(('http://', 'https://'))
+
+
+def _cache_key(source):
+    return 'renditions:' + hashlib.sha1(source.encode()).hexdigest()
+
+
+def get_renditions(source):
+    """
+    List ``(format, width, path)`` untuk file ``source``, diurutkan dari yang
+    terkecil. Hasil di-cache sehingga kartu di halaman daftar tidak query DB.
+    """
+    if not source or is_remote(source):
+        return []
+    key = _cache_key(source)
+    renditions = cache.get(key)
+    if renditions is None:
+        renditions = list(
+            ImageRendition.objects.filter(source=source)
+            .order_by('width', 'format')
+            .values_list('format', 'width', 'path')
+        )
+        cache.set(key, renditions, CACHE_TTL_SECONDS if renditions else MISS_TTL_SECONDS)
+    return renditions
+
+
+def generate_renditions(source):
+    """Buat semua rendition untuk file ``source``. Aman dipanggil berulang."""
+    from PIL import Image, ImageOps
+
+    if not source or is_remote(source) or not default_storage.exists(source):
+        return []
+
+    with default_storage.open(source, 'rb') as original:
+        data = original.read()
+    digest = hashlib.sha256(data).hexdigest()
+
+    image = ImageOps.exif_transpose(Image.open(BytesIO(data)))
+    if image.mode != 'RGB':
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        rgba = image.convert('RGBA')
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        image = background
+
+    rows = []
+    for width in sorted({min(width, image.width) for width in RENDITION_WIDTHS}):
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for fmt, (pil_format, options) in RENDITION_FORMATS.items():
+            path = f"{RENDITION_ROOT}/{digest[:2]}/{digest}/{width}.{fmt}"
+            if not default_storage.exists(path):
+                buffer = BytesIO()
+                resized.save(buffer, pil_format, **options)
+                path = default_storage.save(path, ContentFile(buffer.getvalue()))
+            rows.append(ImageRendition(
+                source=source, digest=digest, width=width, height=height, format=fmt, path=path,
+            ))
+
+    ImageRendition.objects.bulk_create(rows, ignore_conflicts=True)
+    cache.delete(_cache_key(source))
+    return rows
+
+
+def schedule_renditions(source):
+    """Jadwalkan pembuatan rendition setelah transaksi aktif commit."""
+    if source and not is_remote(source) and not get_renditions(source):
+        run_after_commit(generate_renditions, source)
+
+
+def track_image_field(model, field_name):
+    """Buat rendition otomatis setiap kali ``model.<field_name>`` berisi gambar baru."""
+    def create_renditions(sender, instance, **kwargs):
+        schedule_renditions(getattr(instance, field_name).name)
+
+    post_save.connect(
+        create_renditions, sender=model, weak=False,
+        dispatch_uid=f'renditions:{model._meta.label}.{field_name}',
+    )
+
+
+def rendition_urls(source):
+    """``{format: [(url, width), ...]}`` untuk ``source`` (kosong jika belum ada)."""
+    result = {}
+    for fmt, width, path in get_renditions(source):
+        result.setdefault(fmt, []).append((default_storage.url(path), width))
+    return result
@@ -1,5 +1,66 @@
-from django.contrib import admin
-from promo.models import Promo
+from django.contrib import admin, messages
+from django.http import HttpResponse
+from django.template.response import TemplateResponse
+from django.utils import timezone
 
-# Register your models here.
-admin.site.register(Promo)
\ No newline at end of file
+from promo.bulk import generate_promo_codes, write_codes_csv
+from promo.forms import BulkPromoCodeForm
+from promo.models import Promo, PromoRedemption
+
+
+def _csv_response(promos, filename):
+    response = HttpResponse(content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    write_codes_csv(promos, response)
+    return response
+
+
+@admin.register(Promo)
+class PromoAdmin(admin.ModelAdmin):
+    list_display = ('code', 'title', 'category', 'amount_discount', 'campaign', 'max_uses', 'start_date', 'end_date', 'is_active', 'is_public')
+    list_filter = ('category', 'is_active', 'is_public', 'campaign')
+    search_fields = ('code', 'title', 'campaign')
+    actions = ['generate_codes', 'export_codes_csv']
+
+    @admin.action(description="Generate kode massal dari promo terpilih")
+    def generate_codes(self, request, queryset):
+        if queryset.count() != 1:
+            self.message_user(request, "Pilih tepat satu promo sebagai template.", messages.ERROR)
+            return None
+        template = queryset.get()
+
+        if 'apply' in request.POST:
+            form = BulkPromoCodeForm(request.POST)
+            if form.is_valid():
+                promos = generate_promo_codes(
+                    template,
+                    form.cleaned_data['count'],
+                    campaign=form.cleaned_data['campaign'],
+                    max_uses=form.cleaned_data['max_uses'],
+                )
+                campaign = promos[0].campaign or template.code
+                return _csv_response(promos, f"promo-{campaign}-{timezone.localdate():%Y%m%d}.csv")
+        else:
+            form = BulkPromoCodeForm(initial={'campaign': template.campaign})
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': "Generate kode promo massal",
+            'template_promo': template,
+            'form': form,
+            'action_checkbox_name': admin.helpers.ACTION_CHECKBOX_NAME,
+        }
+        return TemplateResponse(request, 'admin/promo/generate_codes.html', context)
+
+    @admin.action(description="Ekspor kode terpilih ke CSV")
+    def export_codes_csv(self, request, queryset):
+        return _csv_response(queryset.order_by('pk').iterator(), f"promo-{timezone.localdate():%Y%m%d}.csv")
+
+
+@admin.register(PromoRedemption)
+class PromoRedemptionAdmin(admin.ModelAdmin):
+    list_display = ('promo', 'user', 'status', 'amount_discount', 'discount_value', 'created_at')
+    list_filter = ('status',)
+    list_select_related = ('promo', 'user')
+    raw_id_fields = ('promo', 'user', 'booking', 'purchase')
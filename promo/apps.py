@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PromoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'promo'
+
+    def ready(self):
+        import promo.signals
@@ -0,0 +1,108 @@
+"""
+Pembuatan kode promo massal (mis. 100 ribu kode sekali pakai per kampanye).
+
+Berbeda dengan ``Promo._generate_unique_code`` yang melakukan satu query
+``exists()`` per kode, di sini kode dibuat di memori per chunk:
+
+- suffix acak dari ``secrets`` memakai alfabet tanpa karakter ambigu
+  (tanpa 0/O, 1/I/L), 31^8 kemungkinan per prefix sehingga tabrakan sangat
+  jarang;
+- duplikat di dalam batch disaring dengan ``set``;
+- kode yang sudah ada di database dicek dengan SATU query ``code__in`` per
+  chunk, lalu hanya kode yang bertabrakan yang dibuat ulang;
+- baris disimpan dengan ``bulk_create`` dalam satu transaksi.
+
+Kode massal disimpan dengan ``is_public=False``: kode dibagikan langsung ke
+penerimanya, jadi tidak pernah tampil di daftar promo publik dan tidak ikut
+dimuat ke cache promo aktif (promo/listing.py, promo/engine.py).
+"""
+import csv
+import secrets
+
+from django.db import transaction
+
+from .engine import invalidate_cache
+from .listing import invalidate_listing
+from .models import Promo
+
+CODE_ALPHABET = 'ABCDEFGHJKMNPQRSTUVWXYZ23456789'
+SUFFIX_LENGTH = 8
+CHUNK_SIZE = 1000
+MAX_COUNT = 100000
+CSV_FIELDS = ['code', 'campaign', 'category', 'amount_discount', 'max_uses', 'start_date', 'end_date']
+
+
+def _candidate(prefix, length=SUFFIX_LENGTH):
+    suffix = ''.join(secrets.choice(CODE_ALPHABET) for _ in range(length))
+    return f"{prefix}-{suffix}"
+
+
+def mint_codes(prefix, count, chunk_size=CHUNK_SIZE, suffix_length=SUFFIX_LENGTH):
+    """
+    Kembalikan list ``count`` kode unik yang belum ada di database.
+
+    Setiap chunk hanya butuh satu query ke database (ditambah satu query per
+    putaran ulang untuk kode yang kebetulan bertabrakan).
+    """
+    codes = []
+    seen = set()
+    while len(codes) < count:
+        needed = min(chunk_size, count - len(codes))
+        batch = set()
+        while len(batch) < needed:
+            code = _candidate(prefix, suffix_length)
+            if code not in seen:
+                batch.add(code)
+                seen.add(code)
+
+        taken = set(Promo.objects.filter(code__in=batch).values_list('code', flat=True))
+        codes.extend(code for code in batch if code not in taken)
+    return codes
+
+
+def generate_promo_codes(template, count, campaign='', max_uses=1, chunk_size=CHUNK_SIZE):
+    """
+    Buat ``count`` promo baru yang menyalin syarat ``template`` (diskon,
+    kategori, periode, status) dengan kode unik masing-masing. Kode baru
+    selalu privat (``is_public=False``).
+
+    Mengembalikan list ``Promo`` yang sudah tersimpan.
+    """
+    if count < 1 or count > MAX_COUNT:
+        raise ValueError(f"Jumlah kode harus antara 1 dan {MAX_COUNT}.")
+
+    campaign = campaign or template.campaign
+    codes = mint_codes(template.code_prefix(), count, chunk_size=chunk_size)
+    promos = [
+        Promo(
+            title=template.title,
+            description=template.description,
+            amount_discount=template.amount_discount,
+            category=template.category,
+            code=code,
+            campaign=campaign,
+            max_uses=max_uses,
+            max_uses_per_user=template.max_uses_per_user,
+            start_date=template.start_date,
+            end_date=template.end_date,
+            is_active=template.is_active,
+            is_public=False,
+        )
+        for code in codes
+    ]
+
+    with transaction.atomic():
+        Promo.objects.bulk_create(promos, batch_size=chunk_size)
+
+    # bulk_create tidak memicu signal post_save.
+    invalidate_cache()
+    invalidate_listing()
+    return promos
+
+
+def write_codes_csv(promos, output):
+    """Tulis kode promo ke ``output`` (file-like) sebagai CSV."""
+    writer = csv.writer(output)
+    writer.writerow(CSV_FIELDS)
+    for promo in promos:
+        writer.writerow([getattr(promo, field) for field in CSV_FIELDS])
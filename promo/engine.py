@@ -0,0 +1,238 @@
+"""
+Satu-satunya tempat aturan validasi promo.
+
+Dipakai oleh endpoint ``promo:promo-validate``, booking venue, dan checkout
+ven_shop sehingga aturan yang berlaku selalu sama:
+
+- kode dinormalisasi (strip + upper) lalu dicocokkan persis ke kolom ``code``
+  yang unik (memakai index, bukan ``code__iexact``);
+- kategori dicek dari kolom ``category``, bukan dari prefix kode;
+- promo harus aktif, berada di antara ``start_date`` dan ``end_date``,
+  dan ``max_uses`` masih tersisa.
+
+Promo publik yang aktif disimpan di cache memori proses dengan TTL pendek
+sehingga validasi biasanya tidak menyentuh database sama sekali. Kode massal
+privat (bisa sampai 100 ribu per kampanye) tidak dimuat ke cache; kode
+tersebut divalidasi dengan lookup ke kolom ``code``. Cache dikosongkan
+lewat signal setiap kali promo disimpan/dihapus (lihat promo/signals.py).
+
+Validasi hanya "perkiraan"; pemakaian kuota yang sebenarnya dilakukan oleh
+``reserve_promo`` dengan UPDATE bersyarat ``max_uses > 0`` dan dicatat di
+``PromoRedemption`` sehingga kuota tidak pernah terpakai melebihi batas.
+"""
+import threading
+import time
+from collections import Counter, namedtuple
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Promo, PromoRedemption, normalize_code
+
+CACHE_TTL_SECONDS = 30
+
+ActivePromo = namedtuple(
+    'ActivePromo',
+    ['id', 'code', 'category', 'amount_discount', 'max_uses', 'max_uses_per_user',
+     'is_active', 'start_date', 'end_date'],
+)
+
+_FIELDS = ActivePromo._fields
+_cache_lock = threading.Lock()
+_cache = {'promos': {}, 'expires_at': 0.0, 'day': None}
+
+
+class PromoUnavailable(Exception):
+    """Promo tidak bisa dipakai saat reservasi (kuota habis / batas per user)."""
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+@dataclass(frozen=True)
+class PromoResult:
+    """Hasil validasi promo; ``valid=False`` selalu disertai ``message``."""
+    valid: bool
+    message: str
+    code: str = ''
+    promo_id: int | None = None
+    category: str = ''
+    amount_discount: int = 0
+
+    def discount_for(self, amount):
+        """Besar potongan (Decimal, 2 desimal) untuk harga ``amount``."""
+        if not self.valid:
+            return Decimal('0.00')
+        discount = Decimal(amount) * self.amount_discount / 100
+        return discount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+    def apply(self, amount):
+        """Harga setelah diskon."""
+        return Decimal(amount) - self.discount_for(amount)
+
+    def to_dict(self):
+        data = {'valid': self.valid, 'message': self.message}
+        if self.valid:
+            data['code'] = self.code
+            data['amount_discount'] = self.amount_discount
+        return data
+
+
+def invalidate_cache():
+    with _cache_lock:
+        _cache['expires_at'] = 0.0
+
+
+def _active_promos(today):
+    with _cache_lock:
+        if _cache['expires_at'] > time.monotonic() and _cache['day'] == today:
+            return _cache['promos']
+
+        rows = Promo.objects.filter(
+            is_active=True, is_public=True, start_date__lte=today, end_date__gte=today,
+        ).values_list(*_FIELDS)
+        promos = {row[1]: ActivePromo(*row) for row in rows}
+
+        _cache.update(promos=promos, expires_at=time.monotonic() + CACHE_TTL_SECONDS, day=today)
+        return promos
+
+
+def _user_uses(promo_id, user):
+    return PromoRedemption.objects.filter(
+        promo_id=promo_id, user=user, status__in=PromoRedemption.ACTIVE_STATUSES,
+    ).count()
+
+
+def _check(promo, category, today):
+    if category and promo.category != category:
+        label = dict(Promo.CATEGORY_CHOICES).get(promo.category, promo.category)
+        return PromoResult(False, f"Kode promo ini hanya berlaku untuk {label}.")
+    if not promo.is_active or promo.end_date < today:
+        return PromoResult(False, "Kode promo sudah tidak berlaku.")
+    if promo.start_date > today:
+        return PromoResult(False, "Kode promo belum berlaku.")
+    if promo.max_uses <= 0:
+        return PromoResult(False, "Kuota promo sudah habis.")
+    return PromoResult(
+        valid=True,
+        message=f"Promo {promo.code} berlaku! Diskon {promo.amount_discount}%.",
+        code=promo.code,
+        promo_id=promo.id,
+        category=promo.category,
+        amount_discount=promo.amount_discount,
+    )
+
+
+def validate_promo_code(code, category=None, user=None):
+    """
+    Validasi ``code`` untuk ``category`` ('shop' / 'venue' / None = bebas).
+
+    Mengembalikan ``PromoResult``. Promo aktif dilayani dari cache; kode yang
+    tidak ada di cache dicek dengan satu lookup ke kolom ``code`` yang unik.
+    Jika ``user`` diberikan dan promo punya batas per user, pemakaian user
+    tersebut ikut dicek.
+    """
+    code = normalize_code(code)
+    if not code:
+        return PromoResult(False, "Kode promo belum diisi.")
+
+    category = (category or '').strip().lower() or None
+    today = timezone.localdate()
+
+    promo = _active_promos(today).get(code)
+    if promo is None:
+        row = Promo.objects.filter(code=code).values_list(*_FIELDS).first()
+        if row is None:
+            return PromoResult(False, "Kode promo tidak ditemukan.")
+        promo = ActivePromo(*row)
+
+    result = _check(promo, category, today)
+    if (result.valid and promo.max_uses_per_user and user is not None
+            and user.is_authenticated and _user_uses(promo.id, user) >= promo.max_uses_per_user):
+        return PromoResult(False, "Anda sudah mencapai batas pemakaian promo ini.")
+    return result
+
+
+def reserve_promo(result, user, *, booking=None, purchase=None, amount=0,
+                  status=PromoRedemption.STATUS_RESERVED):
+    """
+    Pakai satu kuota promo untuk ``user`` dan catat di ledger.
+
+    Kuota dikurangi dengan ``UPDATE ... SET max_uses = max_uses - 1 WHERE
+    max_uses > 0``; UPDATE tersebut sekaligus mengunci baris promo sampai
+    transaksi selesai sehingga cek batas per user di bawahnya terserialisasi.
+    Raise ``PromoUnavailable`` (dan seluruh perubahan di-rollback) jika kuota
+    habis atau batas per user tercapai.
+    """
+    if not result.valid:
+        raise PromoUnavailable(result.message)
+
+    with transaction.atomic():
+        taken = Promo.objects.filter(pk=result.promo_id, max_uses__gt=0).update(
+            max_uses=F('max_uses') - 1,
+        )
+        if not taken:
+            raise PromoUnavailable("Kuota promo sudah habis.")
+
+        per_user = Promo.objects.filter(pk=result.promo_id).values_list('max_uses_per_user', flat=True).get()
+        if per_user and _user_uses(result.promo_id, user) >= per_user:
+            raise PromoUnavailable("Anda sudah mencapai batas pemakaian promo ini.")
+
+        return PromoRedemption.objects.create(
+            promo_id=result.promo_id,
+            user=user,
+            booking=booking,
+            purchase=purchase,
+            status=status,
+            amount_discount=result.amount_discount,
+            discount_value=result.discount_for(amount),
+        )
+
+
+def release_booking_promos(booking):
+    """
+    Lepas promo yang dipakai ``booking`` (mis. saat dibatalkan) dan kembalikan
+    kuotanya. Aman dipanggil berkali-kali: perubahan status bersyarat
+    memastikan kuota hanya dikembalikan sekali. Mengembalikan jumlah promo
+    yang dilepas.
+    """
+    released = 0
+    redemptions = PromoRedemption.objects.filter(
+        booking=booking, status__in=PromoRedemption.ACTIVE_STATUSES,
+    ).values_list('pk', 'promo_id')
+
+    with transaction.atomic():
+        for redemption_id, promo_id in redemptions:
+            changed = PromoRedemption.objects.filter(
+                pk=redemption_id, status__in=PromoRedemption.ACTIVE_STATUSES,
+            ).update(status=PromoRedemption.STATUS_RELEASED, updated_at=timezone.now())
+            if changed:
+                Promo.objects.filter(pk=promo_id).update(max_uses=F('max_uses') + 1)
+                released += 1
+    return released
+
+
+def release_promos_for_bookings(booking_ids):
+    """
+    Versi massal ``release_booking_promos`` untuk banyak booking sekaligus
+    (dipakai sweeper booking kedaluwarsa). Kuota dikembalikan dengan satu
+    UPDATE per promo. Mengembalikan jumlah promo yang dilepas.
+    """
+    with transaction.atomic():
+        redemptions = list(
+            PromoRedemption.objects.select_for_update()
+            .filter(booking_id__in=booking_ids, status__in=PromoRedemption.ACTIVE_STATUSES)
+            .values_list('pk', 'promo_id')
+        )
+        if not redemptions:
+            return 0
+        PromoRedemption.objects.filter(pk__in=[pk for pk, _ in redemptions]).update(
+            status=PromoRedemption.STATUS_RELEASED, updated_at=timezone.now(),
+        )
+        for promo_id, count in Counter(promo_id for _, promo_id in redemptions).items():
+            Promo.objects.filter(pk=promo_id).update(max_uses=F('max_uses') + count)
+    return len(redemptions)
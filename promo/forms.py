@@ -13,6 +13,7 @@ class PromoForm(forms.ModelForm):
             'amount_discount', 
             'category', 
             'max_uses', 
+            'max_uses_per_user',
             'start_date', 
             'end_date', 
             'is_active'
@@ -43,4 +44,8 @@ class PromoForm(forms.ModelForm):
                 self.fields[field_name].widget.attrs.update({'class': 'tailwind-date-input-class'})
 
 
-
+class BulkPromoCodeForm(forms.Form):
+    """Form halaman perantara admin action 'Generate kode massal'."""
+    count = forms.IntegerField(min_value=1, max_value=100000, initial=1000, label='Jumlah kode')
+    campaign = forms.CharField(max_length=50, required=False, label='Nama kampanye')
+    max_uses = forms.IntegerField(min_value=1, initial=1, label='Kuota per kode')
@@ -0,0 +1,89 @@
+"""
+Snapshot daftar promo aktif untuk ``promo:get_promos_json``.
+
+Daftar promo aktif hari ini (sudah di-serialize, termasuk ``url_detail``)
+dibangun sekali lalu disimpan di cache Django dengan key per tanggal, sehingga
+promo yang melewati ``start_date`` / ``end_date`` otomatis masuk/keluar saat
+tanggal berganti. Snapshot dihapus lewat signal setiap kali promo disimpan /
+dihapus (lihat promo/signals.py), tetapi cache default bersifat per proses
+sehingga signal hanya mengosongkan snapshot di worker yang menyimpan promo.
+TTL pendek (sama dengan cache promo di promo/engine.py) membatasi berapa lama
+worker lain masih menampilkan promo yang dinonaktifkan / habis kuotanya, dan
+menjaga ``max_uses`` yang berubah lewat UPDATE bersyarat tetap segar.
+
+Hanya promo publik (``is_public``) yang masuk; kode massal sekali pakai
+(promo/bulk.py) tidak pernah dipublikasikan.
+
+URL edit/hapus untuk superuser disimpan terpisah dan hanya ditempel
+(overlay) untuk superuser, tanpa ``reverse()`` per promo per request.
+"""
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Promo
+
+CACHE_TTL_SECONDS = 30
+_KEY_PREFIX = 'promo:listing:'
+
+
+def _cache_key(day):
+    return f'{_KEY_PREFIX}{day.isoformat()}'
+
+
+def _url_builder(name):
+    """``reverse()`` sekali dengan placeholder, lalu cukup string replace."""
+    placeholder = 'PROMOCODEPLACEHOLDER'
+    pattern = reverse(name, kwargs={'code': placeholder})
+    return lambda code: pattern.replace(placeholder, code)
+
+
+def build_snapshot(day):
+    detail_url = _url_builder('promo:promo_detail')
+    update_url = _url_builder('promo:promo_update')
+    delete_url = _url_builder('promo:promo_delete')
+
+    promos = []
+    admin_urls = []
+    rows = Promo.objects.filter(
+        is_active=True, is_public=True, start_date__lte=day, end_date__gte=day,
+    ).order_by('-created_at')
+    for promo in rows:
+        data = promo.to_dict()
+        data['url_detail'] = detail_url(promo.code)
+        promos.append(data)
+        admin_urls.append({
+            'url_update': update_url(promo.code),
+            'url_delete': delete_url(promo.code),
+        })
+    return {'promos': promos, 'admin_urls': admin_urls}
+
+
+def get_snapshot(day=None):
+    day = day or timezone.localdate()
+    key = _cache_key(day)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_snapshot(day)
+        cache.set(key, snapshot, CACHE_TTL_SECONDS)
+    return snapshot
+
+
+def invalidate_listing(day=None):
+    cache.delete(_cache_key(day or timezone.localdate()))
+
+
+def active_promos(category=None, include_admin_urls=False, day=None):
+    """
+    List promo aktif (dict siap JSON), opsional difilter ``category``
+    ('shop' / 'venue'). ``include_admin_urls`` menambahkan URL edit/hapus.
+    """
+    snapshot = get_snapshot(day)
+    category = (category or '').lower() or None
+
+    promos = []
+    for data, admin_urls in zip(snapshot['promos'], snapshot['admin_urls']):
+        if category and data['category'] != category:
+            continue
+        promos.append({**data, **admin_urls} if include_admin_urls else data)
+    return promos
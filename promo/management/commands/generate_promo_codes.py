@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from promo.bulk import MAX_COUNT, generate_promo_codes, write_codes_csv
+from promo.models import Promo, normalize_code
+
+
+class Command(BaseCommand):
+    help = "Buat kode promo sekali pakai secara massal dari sebuah promo template dan ekspor ke CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from-promo', required=True, help="Kode promo yang dijadikan template")
+        parser.add_argument('--count', type=int, required=True, help=f"Jumlah kode (maks. {MAX_COUNT})")
+        parser.add_argument('--campaign', default='', help="Nama kampanye untuk kode baru")
+        parser.add_argument('--max-uses', type=int, default=1, help="Kuota per kode (default 1)")
+        parser.add_argument('--output', help="Path file CSV (default: stdout)")
+
+    def handle(self, *args, **options):
+        try:
+            template = Promo.objects.get(code=normalize_code(options['from_promo']))
+        except Promo.DoesNotExist:
+            raise CommandError(f"Promo {options['from_promo']} tidak ditemukan.")
+
+        try:
+            promos = generate_promo_codes(
+                template,
+                options['count'],
+                campaign=options['campaign'],
+                max_uses=options['max_uses'],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        if options['output']:
+            with open(options['output'], 'w', newline='') as output:
+                write_codes_csv(promos, output)
+            self.stderr.write(self.style.SUCCESS(
+                f"{len(promos)} kode promo dibuat dan disimpan ke {options['output']}."
+            ))
+        else:
+            write_codes_csv(promos, self.stdout)
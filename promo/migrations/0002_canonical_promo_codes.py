@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+def uppercase_codes(apps, schema_editor):
+    """Samakan semua kode ke bentuk kanonik (upper-case) agar lookup cukup pakai ``code=``."""
+    Promo = apps.get_model('promo', 'Promo')
+    for promo in Promo.objects.exclude(code=''):
+        canonical = promo.code.strip().upper()
+        if canonical != promo.code:
+            Promo.objects.filter(pk=promo.pk).update(code=canonical)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('promo', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(uppercase_codes, migrations.RunPython.noop),
+    ]
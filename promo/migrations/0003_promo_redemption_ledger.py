@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('promo', '0002_canonical_promo_codes'),
+        ('ven_shop', '0008_purchase_snapshots_and_monthly_summary'),
+        ('venue', '0005_alter_booking_options_venue_image_url_venue_user_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='promo',
+            name='max_uses_per_user',
+            field=models.PositiveIntegerField(default=0, help_text='Berapa kali satu user boleh memakai promo ini (0 = tanpa batas)'),
+        ),
+        migrations.CreateModel(
+            name='PromoRedemption',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('reserved', 'Reserved'), ('redeemed', 'Redeemed'), ('released', 'Released')], default='reserved', max_length=10)),
+                ('amount_discount', models.PositiveSmallIntegerField(help_text='Persentase diskon saat promo dipakai')),
+                ('discount_value', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('booking', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='promo_redemptions', to='venue.booking')),
+                ('promo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='redemptions', to='promo.promo')),
+                ('purchase', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='promo_redemptions', to='ven_shop.purchased_product')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='promo_redemptions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['promo', 'user', 'status'], name='promo_promo_promo_i_ce8fb2_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('promo', '0003_promo_redemption_ledger'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='promo',
+            name='campaign',
+            field=models.CharField(blank=True, db_index=True, help_text='Nama kampanye untuk kode yang dibuat massal (kosong = promo biasa)', max_length=50),
+        ),
+    ]
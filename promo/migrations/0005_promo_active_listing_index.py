@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('promo', '0004_promo_campaign'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='promo',
+            index=models.Index(fields=['is_active', 'start_date', 'end_date', 'category'], name='promo_promo_is_acti_633a25_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:08
+
+from django.db import migrations, models
+
+
+def hide_campaign_codes(apps, schema_editor):
+    """Kode massal lama hanya bisa dikenali dari kolom ``campaign``; jadikan privat."""
+    Promo = apps.get_model('promo', 'Promo')
+    Promo.objects.exclude(campaign='').update(is_public=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('promo', '0005_promo_active_listing_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='promo',
+            name='is_public',
+            field=models.BooleanField(default=True, help_text='Tampil di daftar promo publik. Kode massal sekali pakai selalu privat (dibagikan langsung)'),
+        ),
+        migrations.RunPython(hide_campaign_codes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('promo', '0006_promo_is_public'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='promo',
+            name='promo_promo_is_acti_633a25_idx',
+        ),
+        migrations.AddIndex(
+            model_name='promo',
+            index=models.Index(fields=['is_active', 'is_public', 'start_date', 'end_date', 'category'], name='promo_promo_is_acti_f63aa4_idx'),
+        ),
+    ]
@@ -1,8 +1,14 @@
 from django.db import models
+from django.conf import settings
 from django.utils import timezone
 import uuid
 
 
+def normalize_code(code):
+    """Bentuk kanonik kode promo: tanpa spasi di ujung dan huruf besar."""
+    return (code or '').strip().upper()
+
+
 class Promo(models.Model):
     """
     Model untuk menyimpan data promo.
@@ -29,13 +35,32 @@ class Promo(models.Model):
     
     category = models.CharField(max_length=10, choices=CATEGORY_CHOICES, default='venue')
     max_uses = models.PositiveIntegerField(default=100, help_text="Berapa kali promo ini bisa digunakan")
+    max_uses_per_user = models.PositiveIntegerField(
+        default=0,
+        help_text="Berapa kali satu user boleh memakai promo ini (0 = tanpa batas)"
+    )
+    campaign = models.CharField(
+        max_length=50,
+        blank=True,
+        db_index=True,
+        help_text="Nama kampanye untuk kode yang dibuat massal (kosong = promo biasa)"
+    )
     start_date = models.DateField(default=timezone.now, help_text="Tanggal promo mulai aktif")
     end_date = models.DateField(help_text="Tanggal promo berakhir")
     is_active = models.BooleanField(default=True, help_text="Centang jika promo ini aktif dan bisa dilihat publik")
+    is_public = models.BooleanField(
+        default=True,
+        help_text="Tampil di daftar promo publik. Kode massal sekali pakai selalu privat (dibagikan langsung)"
+    )
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_active', 'is_public', 'start_date', 'end_date', 'category']),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -46,6 +71,10 @@ class Promo(models.Model):
         now = timezone.now().date()
         return self.is_active and self.start_date <= now <= self.end_date
 
+    def code_prefix(self):
+        """Prefix kode promo, cth: VENUE15."""
+        return f"{self.category.upper()}{self.amount_discount}"
+
     def _generate_unique_code(self):
         """
         Helper method internal untuk membuat kode unik.
@@ -53,7 +82,7 @@ class Promo(models.Model):
         Contoh: VENUE15-F3E9A1
         """
         while True:
-            prefix = f"{self.category.upper()}{self.amount_discount}"
+            prefix = self.code_prefix()
             random_suffix = uuid.uuid4().hex[:6].upper()
             code = f"{prefix}-{random_suffix}"
             if not Promo.objects.filter(code=code).exists():
@@ -65,6 +94,8 @@ class Promo(models.Model):
         """
         if not self.code:
             self.code = self._generate_unique_code()
+        else:
+            self.code = normalize_code(self.code)
         
         super().save(*args, **kwargs)
 
@@ -88,3 +119,42 @@ class Promo(models.Model):
             'is_active': self.is_active,
             'code': self.code,
         }
+
+
+class PromoRedemption(models.Model):
+    """
+    Ledger pemakaian promo. Setiap pemakaian mengurangi ``Promo.max_uses``
+    secara atomik; baris ``reserved`` dapat dilepas (``released``) saat
+    booking dibatalkan sehingga kuota dikembalikan.
+    """
+    STATUS_RESERVED = 'reserved'
+    STATUS_REDEEMED = 'redeemed'
+    STATUS_RELEASED = 'released'
+    STATUS_CHOICES = [
+        (STATUS_RESERVED, 'Reserved'),
+        (STATUS_REDEEMED, 'Redeemed'),
+        (STATUS_RELEASED, 'Released'),
+    ]
+    ACTIVE_STATUSES = [STATUS_RESERVED, STATUS_REDEEMED]
+
+    promo = models.ForeignKey(Promo, on_delete=models.CASCADE, related_name='redemptions')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='promo_redemptions')
+    booking = models.ForeignKey(
+        'venue.Booking', on_delete=models.SET_NULL, null=True, blank=True, related_name='promo_redemptions'
+    )
+    purchase = models.ForeignKey(
+        'ven_shop.Purchased_Product', on_delete=models.SET_NULL, null=True, blank=True, related_name='promo_redemptions'
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_RESERVED)
+    amount_discount = models.PositiveSmallIntegerField(help_text="Persentase diskon saat promo dipakai")
+    discount_value = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['promo', 'user', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.promo.code} - {self.user} ({self.status})"
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Promo
+from .engine import invalidate_cache
+from .listing import invalidate_listing
+
+
+@receiver(post_save, sender=Promo)
+@receiver(post_delete, sender=Promo)
+def refresh_promo_cache(sender, instance, **kwargs):
+    invalidate_cache()
+    invalidate_listing()
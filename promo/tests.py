@@ -1,3 +1,321 @@
-from django.test import TestCase
+import json
+from datetime import timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.utils import timezone
+
+from promo import engine
+from promo.models import Promo, PromoRedemption
+
+
+class PromoEngineTest(TestCase):
+    def setUp(self):
+        engine.invalidate_cache()
+        self.today = timezone.localdate()
+        self.venue_promo = Promo.objects.create(
+            title='Promo Venue', description='Diskon lapangan', amount_discount=20,
+            category='venue', max_uses=5,
+            start_date=self.today - timedelta(days=1), end_date=self.today + timedelta(days=7),
+        )
+        self.shop_promo = Promo.objects.create(
+            title='Promo Shop', description='Diskon alat', amount_discount=10,
+            category='shop', max_uses=5,
+            start_date=self.today, end_date=self.today + timedelta(days=7),
+        )
+
+    def test_code_is_canonical_upper_case(self):
+        promo = Promo.objects.create(
+            title='Manual', description='-', amount_discount=5, category='shop',
+            code='  hemat5 ', start_date=self.today, end_date=self.today,
+        )
+        self.assertEqual(promo.code, 'HEMAT5')
+
+    def test_valid_code_is_case_insensitive(self):
+        result = engine.validate_promo_code(self.venue_promo.code.lower(), 'venue')
+        self.assertTrue(result.valid)
+        self.assertEqual(result.promo_id, self.venue_promo.id)
+        self.assertEqual(result.apply(100000), Decimal('80000.00'))
+
+    def test_category_checked_from_column(self):
+        result = engine.validate_promo_code(self.shop_promo.code, 'venue')
+        self.assertFalse(result.valid)
+        self.assertIn('Shop', result.message)
+
+    def test_unknown_and_empty_codes(self):
+        self.assertEqual(engine.validate_promo_code('TIDAKADA', 'venue').message, 'Kode promo tidak ditemukan.')
+        self.assertEqual(engine.validate_promo_code('   ').message, 'Kode promo belum diisi.')
+
+    def test_expired_future_and_exhausted_promos(self):
+        self.venue_promo.end_date = self.today - timedelta(days=1)
+        self.venue_promo.save()
+        self.assertEqual(
+            engine.validate_promo_code(self.venue_promo.code).message, 'Kode promo sudah tidak berlaku.'
+        )
+
+        self.shop_promo.start_date = self.today + timedelta(days=1)
+        self.shop_promo.end_date = self.today + timedelta(days=2)
+        self.shop_promo.save()
+        self.assertEqual(engine.validate_promo_code(self.shop_promo.code).message, 'Kode promo belum berlaku.')
+
+        self.shop_promo.start_date = self.today
+        self.shop_promo.max_uses = 0
+        self.shop_promo.save()
+        self.assertEqual(engine.validate_promo_code(self.shop_promo.code).message, 'Kuota promo sudah habis.')
+
+    def test_active_promos_served_from_cache(self):
+        engine.validate_promo_code(self.venue_promo.code, 'venue')
+        with self.assertNumQueries(0):
+            self.assertTrue(engine.validate_promo_code(self.venue_promo.code, 'venue').valid)
+
+    def test_cache_invalidated_on_save(self):
+        engine.validate_promo_code(self.venue_promo.code, 'venue')
+        self.venue_promo.is_active = False
+        self.venue_promo.save()
+        self.assertFalse(engine.validate_promo_code(self.venue_promo.code, 'venue').valid)
+
+
+class PromoRedemptionTest(TestCase):
+    def setUp(self):
+        engine.invalidate_cache()
+        today = timezone.localdate()
+        self.user = User.objects.create_user(username='pemakai', password='testpass123')
+        self.other = User.objects.create_user(username='lainnya', password='testpass123')
+        self.promo = Promo.objects.create(
+            title='Promo Terbatas', description='-', amount_discount=10, category='venue',
+            max_uses=2, max_uses_per_user=1,
+            start_date=today, end_date=today + timedelta(days=3),
+        )
+
+    def test_reserve_decrements_quota_and_records_ledger(self):
+        result = engine.validate_promo_code(self.promo.code, 'venue', user=self.user)
+        redemption = engine.reserve_promo(result, self.user, amount=50000)
+        self.assertEqual(redemption.status, PromoRedemption.STATUS_RESERVED)
+        self.assertEqual(redemption.discount_value, Decimal('5000.00'))
+        self.promo.refresh_from_db()
+        self.assertEqual(self.promo.max_uses, 1)
+
+    def test_per_user_limit_rolls_back_decrement(self):
+        result = engine.validate_promo_code(self.promo.code, 'venue', user=self.user)
+        engine.reserve_promo(result, self.user)
+        with self.assertRaises(engine.PromoUnavailable):
+            engine.reserve_promo(result, self.user)
+        self.promo.refresh_from_db()
+        self.assertEqual(self.promo.max_uses, 1)
+        self.assertEqual(PromoRedemption.objects.count(), 1)
+
+        again = engine.validate_promo_code(self.promo.code, 'venue', user=self.user)
+        self.assertFalse(again.valid)
+        self.assertTrue(engine.validate_promo_code(self.promo.code, 'venue', user=self.other).valid)
+
+    def test_reserve_never_oversells_stale_result(self):
+        result = engine.validate_promo_code(self.promo.code, 'venue')
+        engine.reserve_promo(result, self.user)
+        engine.reserve_promo(result, self.other)
+        third = User.objects.create_user(username='ketiga', password='testpass123')
+        with self.assertRaisesMessage(engine.PromoUnavailable, 'Kuota promo sudah habis.'):
+            engine.reserve_promo(result, third)
+        self.promo.refresh_from_db()
+        self.assertEqual(self.promo.max_uses, 0)
+
+
+class ValidatePromoViewTest(TestCase):
+    def setUp(self):
+        engine.invalidate_cache()
+        today = timezone.localdate()
+        self.promo = Promo.objects.create(
+            title='Promo Venue', description='-', amount_discount=15, category='venue',
+            start_date=today, end_date=today + timedelta(days=3),
+        )
+
+    def test_validate_endpoint(self):
+        response = Client().post(reverse('promo:promo-validate'), {
+            'promo_code': self.promo.code.lower(), 'promo_type': 'venue',
+        })
+        data = json.loads(response.content)
+        self.assertTrue(data['valid'])
+        self.assertEqual(data['amount_discount'], 15)
+
+    def test_validate_endpoint_wrong_category(self):
+        response = Client().post(reverse('promo:promo-validate'), {
+            'promo_code': self.promo.code, 'promo_type': 'shop',
+        })
+        self.assertFalse(json.loads(response.content)['valid'])
+
+
+class ShopCheckoutPromoTest(TestCase):
+    def setUp(self):
+        from ven_shop.models import Product
+        engine.invalidate_cache()
+        today = timezone.localdate()
+        self.user = User.objects.create_user(username='pembeli', password='testpass123')
+        self.client = Client()
+        self.client.login(username='pembeli', password='testpass123')
+        self.product = Product.objects.create(
+            title='Raket', content='-', category='badminton', price=100000,
+            stock=3, brand='Yonex', user=self.user,
+        )
+        self.promo = Promo.objects.create(
+            title='Promo Shop', description='-', amount_discount=25, category='shop',
+            start_date=today, end_date=today + timedelta(days=3),
+        )
+
+    def test_checkout_applies_shop_promo(self):
+        from ven_shop.models import Purchased_Product
+        response = self.client.post(
+            reverse('ven_shop:checkout_product', args=[self.product.id]),
+            {'promo_code': self.promo.code},
+        )
+        self.assertEqual(response.status_code, 302)
+        purchase = Purchased_Product.objects.get()
+        self.assertEqual(purchase.price_paid, 75000)
+        redemption = PromoRedemption.objects.get()
+        self.assertEqual(redemption.purchase, purchase)
+        self.assertEqual(redemption.status, PromoRedemption.STATUS_REDEEMED)
+
+    def test_checkout_with_full_discount_records_zero_price(self):
+        from ven_shop.models import Purchased_Product
+        Promo.objects.filter(pk=self.promo.pk).update(amount_discount=100)
+        engine.invalidate_cache()
+        self.client.post(
+            reverse('ven_shop:checkout_product', args=[self.product.id]),
+            {'promo_code': self.promo.code},
+        )
+        self.assertEqual(Purchased_Product.objects.get().price_paid, 0)
+
+    def test_checkout_rolls_back_when_quota_runs_out(self):
+        from ven_shop.models import Purchased_Product
+        result = engine.validate_promo_code(self.promo.code, 'shop')
+        Promo.objects.filter(pk=self.promo.pk).update(max_uses=0)
+        with self.assertRaises(engine.PromoUnavailable):
+            engine.reserve_promo(result, self.user)
+
+        response = self.client.post(
+            reverse('ven_shop:checkout_product', args=[self.product.id]),
+            {'promo_code': self.promo.code},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Purchased_Product.objects.count(), 0)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 3)
+
+    def test_checkout_rejects_invalid_promo(self):
+        response = self.client.post(
+            reverse('ven_shop:checkout_product', args=[self.product.id]),
+            {'promo_code': 'SALAH'},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['error'], 'Kode promo tidak ditemukan.')
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 3)
+
+
+class BulkPromoCodeTest(TestCase):
+    def setUp(self):
+        today = timezone.localdate()
+        self.template = Promo.objects.create(
+            title='Promo Kampanye', description='-', amount_discount=15, category='shop',
+            start_date=today, end_date=today + timedelta(days=30),
+        )
+
+    def test_generates_unique_single_use_codes(self):
+        from promo.bulk import generate_promo_codes
+        promos = generate_promo_codes(self.template, 250, campaign='harbolnas', chunk_size=100)
+        codes = [promo.code for promo in promos]
+        self.assertEqual(len(set(codes)), 250)
+        self.assertTrue(all(code.startswith('SHOP15-') for code in codes))
+        self.assertEqual(Promo.objects.filter(campaign='harbolnas', max_uses=1, is_public=False).count(), 250)
+
+    def test_existing_codes_are_skipped_with_one_query_per_chunk(self):
+        from unittest import mock
+        from promo import bulk
+        Promo.objects.filter(pk=self.template.pk).update(code='SHOP15-AAAA')
+        candidates = iter(['SHOP15-AAAA', 'SHOP15-BBBB', 'SHOP15-BBBB', 'SHOP15-CCCC'])
+        with mock.patch.object(bulk, '_candidate', side_effect=lambda *args: next(candidates)):
+            with self.assertNumQueries(2):
+                codes = bulk.mint_codes('SHOP15', 2)
+        self.assertEqual(sorted(codes), ['SHOP15-BBBB', 'SHOP15-CCCC'])
+
+    def test_management_command_writes_csv(self):
+        import csv
+        import io
+        from django.core.management import call_command
+        out = io.StringIO()
+        call_command('generate_promo_codes', '--from-promo', self.template.code.lower(),
+                     '--count', '5', '--campaign', 'flash', stdout=out)
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual({row['campaign'] for row in rows}, {'flash'})
+        self.assertEqual(Promo.objects.filter(campaign='flash').count(), 5)
+
+    def test_admin_action_generates_and_downloads_csv(self):
+        User.objects.create_superuser(username='boss', password='testpass123', email='boss@example.com')
+        client = Client()
+        client.login(username='boss', password='testpass123')
+        url = reverse('admin:promo_promo_changelist')
+        data = {'action': 'generate_codes', '_selected_action': [self.template.pk]}
+
+        response = client.post(url, data)
+        self.assertTemplateUsed(response, 'admin/promo/generate_codes.html')
+
+        response = client.post(url, {**data, 'apply': '1', 'count': 3, 'campaign': 'admin', 'max_uses': 1})
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(len(response.content.decode().strip().splitlines()), 4)
+
+
+class PromoListingSnapshotTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.today = timezone.localdate()
+        self.client = Client()
+        self.url = reverse('promo:get_promos_json')
+        self.shop = Promo.objects.create(
+            title='Promo Shop', description='-', amount_discount=10, category='shop',
+            start_date=self.today, end_date=self.today + timedelta(days=1),
+        )
+        self.venue = Promo.objects.create(
+            title='Promo Venue', description='-', amount_discount=20, category='venue',
+            start_date=self.today - timedelta(days=3), end_date=self.today,
+        )
+
+    def test_listing_served_from_snapshot(self):
+        response = self.client.get(self.url)
+        codes = [promo['code'] for promo in json.loads(response.content)['promos']]
+        self.assertEqual(codes, [self.venue.code, self.shop.code])
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'category': 'SHOP'})
+        promos = json.loads(response.content)['promos']
+        self.assertEqual([promo['code'] for promo in promos], [self.shop.code])
+        self.assertEqual(promos[0]['url_detail'], reverse('promo:promo_detail', args=[self.shop.code]))
+        self.assertNotIn('url_update', promos[0])
+
+    def test_snapshot_rebuilt_on_save_and_date_change(self):
+        from promo.listing import active_promos
+        self.client.get(self.url)
+        self.shop.is_active = False
+        self.shop.save()
+        promos = json.loads(self.client.get(self.url).content)['promos']
+        self.assertEqual([promo['code'] for promo in promos], [self.venue.code])
+
+        tomorrow = [promo['code'] for promo in active_promos(day=self.today + timedelta(days=1))]
+        self.assertEqual(tomorrow, [])
+
+    def test_generated_codes_never_listed_or_cached(self):
+        from promo.bulk import generate_promo_codes
+        private = generate_promo_codes(self.shop, 3, campaign='rahasia')
+        engine.invalidate_cache()
+
+        codes = {promo['code'] for promo in json.loads(self.client.get(self.url).content)['promos']}
+        self.assertEqual(codes, {self.shop.code, self.venue.code})
+        self.assertNotIn(private[0].code, engine._active_promos(self.today))
+        self.assertTrue(engine.validate_promo_code(private[0].code.lower(), 'shop').valid)
+
+    def test_superuser_gets_admin_url_overlay(self):
+        User.objects.create_superuser(username='boss', password='testpass123', email='boss@example.com')
+        self.client.login(username='boss', password='testpass123')
+        promos = json.loads(self.client.get(self.url, {'category': 'VENUE'}).content)['promos']
+        self.assertEqual(promos[0]['url_update'], reverse('promo:promo_update', args=[self.venue.code]))
+        self.assertEqual(promos[0]['url_delete'], reverse('promo:promo_delete', args=[self.venue.code]))
@@ -1,10 +1,11 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.http import Http404, JsonResponse
-from django.urls import reverse
 from django.contrib.auth.decorators import user_passes_test
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.utils import timezone
 from .models import Promo
+from .engine import validate_promo_code
+from .listing import active_promos
 from .forms import PromoForm
 from functools import wraps 
 
@@ -21,43 +22,10 @@ def admin_required(view_func):
 def validate_promo(request):
 
     if request.method == "POST":
-        code = request.POST.get("promo_code", "").strip()
-        promo_type = request.POST.get("promo_type", "").strip().lower()
-        now = timezone.now().date()
-
-        if not code:
-            return JsonResponse({"valid": False, "message": "Kode promo belum diisi."})
-
-        try:
-            promo = Promo.objects.get(code__iexact=code)
-        except Promo.DoesNotExist:
-            return JsonResponse({
-                "valid": False,
-                "message": "Kode promo tidak ditemukan."
-            })
-
-        if promo_type == "venue" and not promo.code.upper().startswith("VENUE"):
-            return JsonResponse({
-                "valid": False,
-                "message": "Kode promo ini hanya berlaku untuk Venue."
-            })
-        elif promo_type == "shop" and not promo.code.upper().startswith("SHOP"):
-            return JsonResponse({
-                "valid": False,
-                "message": "Kode promo ini hanya berlaku untuk Shop."
-            })
-
-        if not promo.is_active or promo.end_date < now:
-            return JsonResponse({
-                "valid": False,
-                "message": "Kode promo sudah tidak berlaku."
-            })
-
-        return JsonResponse({
-            "valid": True,
-            "amount_discount": promo.amount_discount,
-            "message": f"Promo {promo.code} berlaku! Diskon {promo.amount_discount}%."
-        })
+        code = request.POST.get("promo_code", "")
+        promo_type = request.POST.get("promo_type", "")
+        result = validate_promo_code(code, promo_type)
+        return JsonResponse(result.to_dict())
 
     return JsonResponse({
         "valid": False,
@@ -151,26 +119,11 @@ def promo_delete_view(request, code):
 
 def get_promos_json_view(request):
     category_filter = request.GET.get('category')
-    today = timezone.localdate() 
-
-    promo_query = Promo.objects.filter(
-        is_active=True,
-        start_date__lte=today,
-        end_date__gte=today
-    ).order_by('-created_at')
-
-    if category_filter in ['SHOP', 'VENUE']:
-        promo_query = promo_query.filter(category__iexact=category_filter)
-        
-    promos_list = []
-    for promo in promo_query:
-        promo_data = promo.to_dict()
-        promo_data['url_detail'] = reverse('promo:promo_detail', kwargs={'code': promo.code})
-        
-        if request.user.is_superuser:
-            promo_data['url_update'] = reverse('promo:promo_update', kwargs={'code': promo.code})
-            promo_data['url_delete'] = reverse('promo:promo_delete', kwargs={'code': promo.code})
-
-        promos_list.append(promo_data)
+    if category_filter not in ['SHOP', 'VENUE']:
+        category_filter = None
 
+    promos_list = active_promos(
+        category=category_filter,
+        include_admin_urls=request.user.is_superuser,
+    )
     return JsonResponse({'promos': promos_list})
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class VenShopConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'ven_shop'
\ No newline at end of file
+    name = 'ven_shop'
+
+    def ready(self):
+        import ven_shop.signals
@@ -1,8 +1,4 @@
-<<<<<<< HEAD
 # Generated by Django 5.2.7 on 2025-10-26 16:37
-=======
-# Generated by Django 5.2.6 on 2025-10-26 16:37
->>>>>>> 65ade45798b28d9ccb6b226a78339b2636d8eafa
 
 from django.db import migrations
 
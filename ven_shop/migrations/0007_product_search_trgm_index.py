@@ -0,0 +1,44 @@
+from django.db import migrations
+
+# Index trigram hanya dibuat di PostgreSQL; SQLite memakai inverted index
+# n-gram di memori (ven_shop/search.py), jadi migration ini no-op di sana.
+CREATE_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ven_shop_product_title_trgm "
+    "ON ven_shop_product USING gin (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ven_shop_product_brand_trgm "
+    "ON ven_shop_product USING gin (brand gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ven_shop_product_content_trgm "
+    "ON ven_shop_product USING gin (content gin_trgm_ops)",
+]
+
+DROP_SQL = [
+    "DROP INDEX IF EXISTS ven_shop_product_title_trgm",
+    "DROP INDEX IF EXISTS ven_shop_product_brand_trgm",
+    "DROP INDEX IF EXISTS ven_shop_product_content_trgm",
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in CREATE_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in DROP_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ven_shop', '0006_merge_20251026_2337'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
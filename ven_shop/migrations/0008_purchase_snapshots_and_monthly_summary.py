@@ -0,0 +1,114 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill_snapshots(apps, schema_editor):
+    """Isi snapshot & rollup bulanan untuk riwayat pembelian yang sudah ada."""
+    Purchased_Product = apps.get_model('ven_shop', 'Purchased_Product')
+    PurchaseMonthlySummary = apps.get_model('ven_shop', 'PurchaseMonthlySummary')
+
+    fields = ['product_title', 'product_brand', 'product_category', 'product_thumbnail', 'price_paid']
+    purchases = Purchased_Product.objects.select_related('product').filter(product__isnull=False).order_by('pk')
+    batch = []
+    # Tulis per batch supaya memori tetap terbatas di tabel yang besar.
+    for purchase in purchases.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        purchase.product_title = purchase.product.title
+        purchase.product_brand = purchase.product.brand
+        purchase.product_category = purchase.product.category
+        purchase.product_thumbnail = purchase.product.thumbnail
+        purchase.price_paid = purchase.product.price
+        batch.append(purchase)
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            Purchased_Product.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        Purchased_Product.objects.bulk_update(batch, fields)
+
+    rollups = (
+        Purchased_Product.objects.annotate(month=TruncMonth('purchase_date'))
+        .values('user_id', 'month')
+        .annotate(total_items=Count('id'), total_spent=Sum('price_paid'))
+    )
+    PurchaseMonthlySummary.objects.bulk_create([
+        PurchaseMonthlySummary(
+            user_id=row['user_id'],
+            month=row['month'].date() if hasattr(row['month'], 'date') else row['month'],
+            total_items=row['total_items'],
+            total_spent=row['total_spent'] or 0,
+        )
+        for row in rollups
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ven_shop', '0007_product_search_trgm_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PurchaseMonthlySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='Tanggal 1 dari bulan terkait')),
+                ('total_items', models.PositiveIntegerField(default=0)),
+                ('total_spent', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-month'],
+            },
+        ),
+        migrations.AddField(
+            model_name='purchased_product',
+            name='price_paid',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='purchased_product',
+            name='product_brand',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='purchased_product',
+            name='product_category',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='purchased_product',
+            name='product_thumbnail',
+            field=models.URLField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='purchased_product',
+            name='product_title',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='purchased_product',
+            name='product',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='ven_shop.product'),
+        ),
+        migrations.AddIndex(
+            model_name='purchased_product',
+            index=models.Index(fields=['user', 'purchase_date'], name='ven_shop_pu_user_id_9e8324_idx'),
+        ),
+        migrations.AddField(
+            model_name='purchasemonthlysummary',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='purchase_summaries', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterUniqueTogether(
+            name='purchasemonthlysummary',
+            unique_together={('user', 'month')},
+        ),
+        migrations.RunPython(backfill_snapshots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ven_shop', '0008_purchase_snapshots_and_monthly_summary'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='purchased_product',
+            name='price_paid',
+            field=models.IntegerField(blank=True, default=None, null=True),
+        ),
+    ]
@@ -1,6 +1,8 @@
 import uuid
-from django.db import models
+from django.db import models, transaction, IntegrityError
+from django.db.models import F
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 
 class Product(models.Model):
@@ -32,9 +34,71 @@ class Product(models.Model):
         return self.title
     
 class Purchased_Product(models.Model):
+    """
+    Satu baris riwayat pembelian. Data produk disalin (snapshot) saat pembelian
+    sehingga riwayat tetap benar walaupun produk diedit atau dihapus.
+    """
     user = models.ForeignKey(User, on_delete=models.CASCADE)
-    product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    product = models.ForeignKey(Product, on_delete=models.SET_NULL, null=True, blank=True)
     purchase_date = models.DateTimeField(auto_now_add=True)
 
+    # Snapshot produk saat dibeli (tidak diubah setelah baris dibuat)
+    product_title = models.CharField(max_length=255, blank=True)
+    product_brand = models.CharField(max_length=255, blank=True)
+    product_category = models.CharField(max_length=20, blank=True)
+    product_thumbnail = models.URLField(blank=True, null=True)
+    # None = belum diisi (diambil dari harga produk); 0 = gratis (mis. promo 100%)
+    price_paid = models.IntegerField(null=True, blank=True, default=None)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'purchase_date']),
+        ]
+
     def __str__(self):
-        return f"{self.user.username} - {self.product.title}"
\ No newline at end of file
+        return f"{self.user.username} - {self.product_title}"
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.product is not None:
+            self.product_title = self.product_title or self.product.title
+            self.product_brand = self.product_brand or self.product.brand
+            self.product_category = self.product_category or self.product.category
+            self.product_thumbnail = self.product_thumbnail or self.product.thumbnail
+            if self.price_paid is None:
+                self.price_paid = self.product.price
+        super().save(*args, **kwargs)
+
+
+class PurchaseMonthlySummary(models.Model):
+    """Total pembelian per user per bulan, diperbarui setiap ada pembelian."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='purchase_summaries')
+    month = models.DateField(help_text="Tanggal 1 dari bulan terkait")
+    total_items = models.PositiveIntegerField(default=0)
+    total_spent = models.BigIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('user', 'month')
+        ordering = ['-month']
+
+    def __str__(self):
+        return f"{self.user.username} - {self.month:%Y-%m}"
+
+    @classmethod
+    def record(cls, user_id, purchase_date, amount, items=1):
+        """Tambahkan ``items``/``amount`` (boleh negatif) ke rollup bulan terkait."""
+        month = timezone.localtime(purchase_date).date().replace(day=1)
+        changes = {
+            'total_items': F('total_items') + items,
+            'total_spent': F('total_spent') + amount,
+        }
+        if cls.objects.filter(user_id=user_id, month=month).update(**changes) or items <= 0:
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    user_id=user_id, month=month,
+                    total_items=items, total_spent=amount,
+                )
+        except IntegrityError:
+            # Baris bulan ini baru saja dibuat oleh request lain
+            cls.objects.filter(user_id=user_id, month=month).update(**changes)
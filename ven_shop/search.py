@@ -0,0 +1,215 @@
+"""
+Pencarian produk untuk Ven-Shop (title, brand, content).
+
+Dua backend dengan interface yang sama:
+- PostgreSQL (production): filter hanya memakai operator trigram yang
+  dilayani GIN index ``gin_trgm_ops`` (lihat migration 0007); prefix match
+  hanya menaikkan urutan, tidak ikut di WHERE, karena ``istartswith``
+  (``UPPER(col) LIKE``) tidak bisa memakai index tersebut.
+- SQLite / lainnya (development): inverted index n-gram di memori proses,
+  dibangun sekali saat query pertama lalu diperbarui per produk lewat
+  signal post_save / post_delete (lihat ven_shop/signals.py).
+
+Kedua backend toleran typo dan mendukung prefix ("raket yon" -> "Raket Yonex").
+"""
+import re
+import threading
+from collections import defaultdict
+
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from ven_shop.models import Product
+
+NGRAM_SIZE = 3
+MIN_SCORE = 0.45          # ambang skor per kata query (0..1)
+FIELD_WEIGHTS = {'title': 3.0, 'brand': 2.0, 'content': 1.0}
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 50
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    """Pecah teks menjadi kata lowercase (huruf/angka saja)."""
+    return _TOKEN_RE.findall((text or '').lower())
+
+
+def word_ngrams(word):
+    """
+    N-gram dengan padding di awal kata saja, sehingga n-gram sebuah prefix
+    selalu merupakan subset n-gram kata lengkapnya (prefix match = skor 1.0).
+    """
+    padded = '$' * (NGRAM_SIZE - 1) + word
+    return {padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)}
+
+
+class NgramIndex:
+    """
+    Inverted index n-gram -> kata -> produk, disimpan di memori proses.
+
+    Skor sebuah kata dokumen terhadap kata query adalah proporsi n-gram query
+    yang juga dimiliki kata tersebut. Skor produk = jumlah skor terbaik per kata
+    query dikali bobot field (title > brand > content).
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._gram_words = defaultdict(set)      # ngram -> {word}
+        self._word_docs = defaultdict(dict)      # word -> {product_id: weight}
+        self._doc_words = {}                     # product_id -> {word}
+
+    @property
+    def built(self):
+        return self._built
+
+    def rebuild(self):
+        with self._lock:
+            self.clear()
+            rows = Product.objects.values_list('id', 'title', 'brand', 'content')
+            for product_id, title, brand, content in rows.iterator():
+                self._add(product_id, {'title': title, 'brand': brand, 'content': content})
+            self._built = True
+
+    def clear(self):
+        with self._lock:
+            self._gram_words.clear()
+            self._word_docs.clear()
+            self._doc_words.clear()
+            self._built = False
+
+    def update(self, product):
+        """Pasang ulang satu produk (dipanggil dari signal post_save)."""
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(product.pk)
+            self._add(product.pk, {
+                'title': product.title,
+                'brand': product.brand,
+                'content': product.content,
+            })
+
+    def remove(self, product_id):
+        """Hapus satu produk (dipanggil dari signal post_delete)."""
+        with self._lock:
+            if self._built:
+                self._remove(product_id)
+
+    def _add(self, product_id, fields):
+        weights = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for word in tokenize(fields.get(field)):
+                weights[word] = max(weights.get(word, 0.0), weight)
+
+        for word, weight in weights.items():
+            if word not in self._word_docs:
+                for gram in word_ngrams(word):
+                    self._gram_words[gram].add(word)
+            self._word_docs[word][product_id] = weight
+        self._doc_words[product_id] = set(weights)
+
+    def _remove(self, product_id):
+        for word in self._doc_words.pop(product_id, ()):
+            docs = self._word_docs.get(word)
+            if docs is None:
+                continue
+            docs.pop(product_id, None)
+            if not docs:
+                del self._word_docs[word]
+                for gram in word_ngrams(word):
+                    words = self._gram_words.get(gram)
+                    if words is not None:
+                        words.discard(word)
+                        if not words:
+                            del self._gram_words[gram]
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """Kembalikan list ``(product_id, score)`` terurut dari skor tertinggi."""
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        with self._lock:
+            if not self._built:
+                self.rebuild()
+
+            totals = defaultdict(float)
+            for term in terms:
+                grams = word_ngrams(term)
+                shared = defaultdict(int)
+                for gram in grams:
+                    for word in self._gram_words.get(gram, ()):
+                        shared[word] += 1
+
+                best = {}
+                for word, count in shared.items():
+                    score = count / len(grams)
+                    if score < MIN_SCORE:
+                        continue
+                    for product_id, weight in self._word_docs[word].items():
+                        weighted = score * weight
+                        if weighted > best.get(product_id, 0.0):
+                            best[product_id] = weighted
+
+                for product_id, score in best.items():
+                    totals[product_id] += score
+
+        ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit]
+
+
+product_index = NgramIndex()
+
+
+def _search_postgres(query, limit):
+    from django.contrib.postgres.search import TrigramWordSimilarity
+    from django.db.models.functions import Greatest
+
+    similarity = Greatest(
+        TrigramWordSimilarity(query, 'title'),
+        TrigramWordSimilarity(query, 'brand'),
+    )
+    # Prefix ("raket yon") sudah lolos operator word similarity; di sini
+    # hanya dipakai untuk mendahulukan hasilnya.
+    prefix = Case(
+        When(Q(title__istartswith=query) | Q(brand__istartswith=query), then=Value(1)),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    matches = (
+        Q(title__trigram_word_similar=query)
+        | Q(brand__trigram_word_similar=query)
+        | Q(content__trigram_word_similar=query)
+    )
+    rows = (
+        Product.objects.filter(matches)
+        .annotate(score=similarity, prefix=prefix)
+        .order_by('-prefix', '-score', 'title')
+        .values_list('id', 'score')[:limit]
+    )
+    return list(rows)
+
+
+def search_product_ids(query, limit=DEFAULT_LIMIT):
+    """
+    List ``(product_id, score)`` untuk query, memakai backend sesuai database.
+    ``limit`` dibatasi ``MAX_LIMIT``; ``None`` = semua hasil (halaman katalog).
+    """
+    query = (query or '').strip()
+    if not query:
+        return []
+    if limit is not None:
+        limit = max(1, min(int(limit), MAX_LIMIT))
+
+    if connection.vendor == 'postgresql':
+        return _search_postgres(query, limit)
+    return product_index.search(query, limit)
+
+
+def search_products(query, limit=DEFAULT_LIMIT):
+    """List objek ``Product`` hasil pencarian, urutan sesuai relevansi."""
+    ranked = search_product_ids(query, limit)
+    products = Product.objects.in_bulk([product_id for product_id, _ in ranked])
+    return [products[product_id] for product_id, _ in ranked if product_id in products]
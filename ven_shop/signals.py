@@ -0,0 +1,27 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Product, Purchased_Product, PurchaseMonthlySummary
+from .search import product_index
+
+
+@receiver(post_save, sender=Product)
+def index_product(sender, instance, **kwargs):
+    product_index.update(instance)
+
+
+@receiver(post_delete, sender=Product)
+def unindex_product(sender, instance, **kwargs):
+    product_index.remove(instance.pk)
+
+
+@receiver(post_save, sender=Purchased_Product)
+def add_purchase_to_summary(sender, instance, created, **kwargs):
+    if created:
+        PurchaseMonthlySummary.record(instance.user_id, instance.purchase_date, instance.price_paid or 0)
+
+
+@receiver(post_delete, sender=Purchased_Product)
+def remove_purchase_from_summary(sender, instance, **kwargs):
+    PurchaseMonthlySummary.record(
+        instance.user_id, instance.purchase_date, -(instance.price_paid or 0), items=-1
+    )
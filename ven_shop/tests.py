@@ -224,4 +224,155 @@ def test_purchase_history_empty(self):
     # Test tanpa purchase
     response = self.client.get(reverse('ven_shop:purchase_history'))
     self.assertEqual(response.status_code, 200)
-    self.assertEqual(len(response.context['purchases']), 0)
\ No newline at end of file
+    self.assertEqual(len(response.context['purchases']), 0)
+
+class ProductSearchTest(TestCase):
+    # Test search backend (n-gram index di SQLite) dan endpoint typeahead
+
+    def setUp(self):
+        from ven_shop.search import product_index
+        self.index = product_index
+        self.index.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(username='searcher', password='testpass123')
+
+        self.racket = Product.objects.create(
+            title='Raket Astrox 88D', content='Raket badminton untuk smash keras',
+            category='badminton', price=1500000, stock=5, brand='Yonex', user=self.user
+        )
+        self.shoes = Product.objects.create(
+            title='Sepatu Lari Pegasus', content='Sepatu running ringan',
+            category='running', price=1200000, stock=3, brand='Nike', user=self.user
+        )
+
+    def tearDown(self):
+        self.index.clear()
+
+    def test_prefix_query(self):
+        from ven_shop.search import search_products
+        self.assertEqual(search_products('astr'), [self.racket])
+        self.assertEqual(search_products('yon'), [self.racket])
+
+    def test_typo_tolerant_query(self):
+        from ven_shop.search import search_products
+        self.assertEqual(search_products('pegasis'), [self.shoes])
+        self.assertEqual(search_products('yonx'), [self.racket])
+
+    def test_title_ranks_above_content(self):
+        from ven_shop.search import search_products
+        Product.objects.create(
+            title='Tas Raket', content='Muat dua raket', category='badminton',
+            price=300000, stock=2, brand='Lining', user=self.user
+        )
+        strings = Product.objects.create(
+            title='Senar BG65', content='Senar untuk raket badminton', category='badminton',
+            price=100000, stock=2, brand='Yonex', user=self.user
+        )
+        results = search_products('raket')
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[-1], strings)
+        self.assertNotIn(self.shoes, results)
+
+        self.client.login(username='searcher', password='testpass123')
+        response = self.client.get(reverse('ven_shop:show_main'), {'q': 'raket'})
+        self.assertEqual(list(response.context['Product_list']), results)
+
+    def test_index_updates_on_save_and_delete(self):
+        from ven_shop.search import search_products
+        search_products('raket')  # build index
+        self.racket.title = 'Raket Nanoflare'
+        self.racket.save()
+        self.assertEqual(search_products('nanofl'), [self.racket])
+        self.assertEqual(search_products('astrox'), [])
+
+        self.racket.delete()
+        self.assertEqual(search_products('nanoflare'), [])
+
+    def test_search_json_endpoint(self):
+        response = self.client.get(reverse('ven_shop:search_json'), {'q': 'sepat'})
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data['query'], 'sepat')
+        self.assertEqual([item['id'] for item in data['results']], [str(self.shoes.id)])
+
+    def test_search_json_empty_query(self):
+        response = self.client.get(reverse('ven_shop:search_json'))
+        self.assertEqual(json.loads(response.content)['results'], [])
+
+    def test_show_main_filters_by_query(self):
+        response = self.client.get(reverse('ven_shop:show_main'), {'q': 'nike'})
+        self.assertEqual(list(response.context['Product_list']), [self.shoes])
+
+
+class PurchaseHistoryTest(TestCase):
+    # Test snapshot pembelian, rollup bulanan, dan keyset pagination
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='buyer', password='testpass123')
+        self.client.login(username='buyer', password='testpass123')
+        self.product = Product.objects.create(
+            title='Bola Futsal', content='Bola ukuran 4', category='football',
+            price=250000, stock=100, brand='Specs', user=self.user
+        )
+
+    def test_purchase_snapshot_survives_product_edit_and_delete(self):
+        purchase = Purchased_Product.objects.create(user=self.user, product=self.product)
+        self.assertEqual(purchase.product_title, 'Bola Futsal')
+        self.assertEqual(purchase.price_paid, 250000)
+
+        self.product.title = 'Bola Futsal v2'
+        self.product.price = 999999
+        self.product.save()
+        self.product.delete()
+
+        purchase.refresh_from_db()
+        self.assertIsNone(purchase.product_id)
+        self.assertEqual(purchase.product_title, 'Bola Futsal')
+        self.assertEqual(purchase.price_paid, 250000)
+
+        response = self.client.get(reverse('ven_shop:purchase_history'))
+        self.assertContains(response, 'Bola Futsal')
+
+    def test_monthly_summary_tracks_purchases(self):
+        from ven_shop.models import PurchaseMonthlySummary
+        Purchased_Product.objects.create(user=self.user, product=self.product)
+        Purchased_Product.objects.create(user=self.user, product=self.product, price_paid=200000)
+
+        summary = PurchaseMonthlySummary.objects.get(user=self.user)
+        self.assertEqual(summary.total_items, 2)
+        self.assertEqual(summary.total_spent, 450000)
+
+        response = self.client.get(reverse('ven_shop:purchase_history'))
+        self.assertEqual(response.context['total_purchases'], 2)
+        self.assertEqual(response.context['total_spent'], 450000)
+
+    def test_zero_price_purchase_is_kept(self):
+        from ven_shop.models import PurchaseMonthlySummary
+        purchase = Purchased_Product.objects.create(user=self.user, product=self.product, price_paid=0)
+        purchase.refresh_from_db()
+        self.assertEqual(purchase.price_paid, 0)
+        summary = PurchaseMonthlySummary.objects.get(user=self.user)
+        self.assertEqual((summary.total_items, summary.total_spent), (1, 0))
+
+    def test_history_keyset_pagination(self):
+        for _ in range(25):
+            Purchased_Product.objects.create(user=self.user, product=self.product)
+
+        first = self.client.get(reverse('ven_shop:purchase_history'))
+        self.assertEqual(len(first.context['purchases']), 20)
+        cursor = first.context['next_cursor']
+        self.assertIsNotNone(cursor)
+
+        second = self.client.get(reverse('ven_shop:purchase_history'), {'cursor': cursor})
+        self.assertEqual(len(second.context['purchases']), 5)
+        self.assertIsNone(second.context['next_cursor'])
+
+        seen = {p.pk for p in first.context['purchases']} | {p.pk for p in second.context['purchases']}
+        self.assertEqual(len(seen), 25)
+
+    def test_history_invalid_cursor_falls_back_to_first_page(self):
+        Purchased_Product.objects.create(user=self.user, product=self.product)
+        response = self.client.get(reverse('ven_shop:purchase_history'), {'cursor': 'rusak!!'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['purchases']), 1)
@@ -1,5 +1,5 @@
 from django.urls import path
-from ven_shop.views import show_main, create_product, show_product, show_xml, show_json, show_xml_by_id, show_json_by_id, edit_product, delete_product, checkout_product, purchase_success, rating, purchase_history
+from ven_shop.views import show_main, create_product, show_product, show_xml, show_json, show_xml_by_id, show_json_by_id, edit_product, delete_product, checkout_product, purchase_success, rating, purchase_history, search_json
 
 app_name = 'ven_shop'
 
@@ -17,4 +17,5 @@ urlpatterns = [
     path('success/<uuid:id>/', purchase_success, name='purchase_success'),  
     path('rate/<uuid:id>/', rating, name='submit_rating'), 
     path('purchase-history/', purchase_history, name='purchase_history'),
+    path('search/', search_json, name='search_json'),
 ]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from ven_shop.models import Product, Purchased_Product
+from ven_shop.models import Product, Purchased_Product, PurchaseMonthlySummary
 from django.http import HttpResponse
 from django.core import serializers
 from django.shortcuts import render, redirect, get_object_or_404
@@ -14,7 +14,12 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 from django.utils.html import strip_tags
 from ven_shop.forms import ProductForm
-from django.db.models import F
+from ven_shop.search import search_product_ids, search_products, DEFAULT_LIMIT
+from main.pagination import keyset_paginate, InvalidCursor
+from promo.engine import PromoUnavailable, reserve_promo, validate_promo_code
+from promo.models import PromoRedemption
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Sum, When
 import requests
 import uuid
 
@@ -30,10 +35,21 @@ def show_main(request):
     
     if categories:
         products = products.filter(category__in=categories)
+
+    # Pencarian teks (title, brand, content) lewat search backend; urutan
+    # relevansi dari backend dipertahankan.
+    query = request.GET.get('q', '').strip()
+    if query:
+        ranked_ids = [product_id for product_id, _ in search_product_ids(query, limit=None)]
+        products = products.filter(pk__in=ranked_ids).order_by(Case(
+            *[When(pk=product_id, then=rank) for rank, product_id in enumerate(ranked_ids)],
+            output_field=IntegerField(),
+        ))
     
     context = {
         'Product_list': products,
         'selected_categories': categories,
+        'search_query': query,
     }
     
     return render(request, 'main.html', context)
@@ -94,6 +110,29 @@ def show_json_by_id(request, id):
     except Product.DoesNotExist:
         return JsonResponse({'detail': 'Not found'}, status=404)
 
+@csrf_exempt
+def search_json(request):
+    """Endpoint typeahead: /search/?q=<teks>&limit=<n>"""
+    query = request.GET.get('q', '').strip()
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        limit = DEFAULT_LIMIT
+
+    data = [
+        {
+            'id': str(product.id),
+            'title': product.title,
+            'brand': product.brand,
+            'category': product.category,
+            'price': product.price,
+            'thumbnail': product.thumbnail,
+            'url': reverse('ven_shop:show_product', args=[product.id]),
+        }
+        for product in search_products(query, limit)
+    ]
+    return JsonResponse({'query': query, 'results': data})
+
 @login_required(login_url='/authenticate/login/')
 @csrf_exempt
 def create_product(request):
@@ -146,16 +185,45 @@ def checkout_product(request, id):
     
     if request.method == 'POST':
         product.refresh_from_db() 
+
+        price_paid = product.price
+        promo_result = None
+        promo_code = request.POST.get('promo_code', '').strip()
+        if promo_code:
+            promo_result = validate_promo_code(promo_code, 'shop', user=request.user)
+            if not promo_result.valid:
+                context = {
+                    'product': product,
+                    'error': promo_result.message,
+                }
+                return render(request, 'checkout.html', context)
+            price_paid = int(promo_result.apply(product.price))
         
         if product.stock > 0:
-            product.stock = F('stock') - 1
-            product.save()
-            
-            product.refresh_from_db() 
-            Purchased_Product.objects.create(
-                user=request.user,
-                product=product
-            )
+            try:
+                with transaction.atomic():
+                    product.stock = F('stock') - 1
+                    product.save()
+
+                    product.refresh_from_db()
+                    purchase = Purchased_Product.objects.create(
+                        user=request.user,
+                        product=product,
+                        price_paid=price_paid
+                    )
+                    if promo_result:
+                        reserve_promo(
+                            promo_result, request.user,
+                            purchase=purchase,
+                            amount=product.price,
+                            status=PromoRedemption.STATUS_REDEEMED,
+                        )
+            except PromoUnavailable as exc:
+                context = {
+                    'product': product,
+                    'error': exc.message,
+                }
+                return render(request, 'checkout.html', context)
             
             # Ambil email dari form
             email = request.POST.get('email', '').strip()  # Wajib, strip whitespace
@@ -217,12 +285,25 @@ def rating(request, id):
 @login_required(login_url='/authenticate/login/')
 @csrf_exempt
 def purchase_history(request):
-    purchases = Purchased_Product.objects.filter(user=request.user).select_related('product').order_by('-purchase_date')
-    
+    purchases = Purchased_Product.objects.filter(user=request.user).only(
+        'id', 'purchase_date', 'product_id', 'product_title', 'product_brand',
+        'product_category', 'product_thumbnail', 'price_paid',
+    )
+    try:
+        page = keyset_paginate(purchases, ['-purchase_date', '-pk'], request.GET.get('cursor'))
+    except InvalidCursor:
+        page = keyset_paginate(purchases, ['-purchase_date', '-pk'])
+
+    monthly_summaries = list(PurchaseMonthlySummary.objects.filter(user=request.user)[:12])
+    summary = PurchaseMonthlySummary.objects.filter(user=request.user).aggregate(
+        total_items=Sum('total_items'), total_spent=Sum('total_spent')
+    )
+
     context = {
-        'purchases': purchases
+        'purchases': page,
+        'next_cursor': page.next_cursor,
+        'monthly_summaries': monthly_summaries,
+        'total_purchases': summary['total_items'] or 0,
+        'total_spent': summary['total_spent'] or 0,
     }
     return render(request, 'purchase_history.html', context)
-
-
-
@@ -1,3 +1,95 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 
-# Register your models here.
+from .lifecycle import InvalidTransition
+from .models import (
+    Booking, BookingSeries, Holiday, RemoteImage, VenueDailyStats, VenueOperatingHours, VenueRate, WaitlistEntry,
+)
+
+
+def _transition_action(status, description):
+    @admin.action(description=description)
+    def action(modeladmin, request, queryset):
+        changed = failed = 0
+        for booking in queryset:
+            try:
+                booking.transition_to(status)
+                changed += 1
+            except InvalidTransition:
+                failed += 1
+        modeladmin.message_user(request, f"{changed} booking diubah menjadi {status}.")
+        if failed:
+            modeladmin.message_user(
+                request, f"{failed} booking dilewati karena transisi tidak sah.", messages.WARNING,
+            )
+    action.__name__ = f'mark_{status}'
+    return action
+
+
+@admin.register(Booking)
+class BookingAdmin(admin.ModelAdmin):
+    list_display = ('venue', 'user', 'booking_date', 'start_time', 'end_time', 'status', 'total_price')
+    list_filter = ('status', 'booking_date')
+    search_fields = ('venue__name', 'user__username')
+    list_select_related = ('venue', 'user')
+    raw_id_fields = ('series',)
+    # Status hanya diubah lewat action supaya transisi tervalidasi.
+    readonly_fields = ('status',)
+    actions = [
+        _transition_action('confirmed', "Konfirmasi booking terpilih"),
+        _transition_action('cancelled', "Batalkan booking terpilih"),
+    ]
+
+
+@admin.register(BookingSeries)
+class BookingSeriesAdmin(admin.ModelAdmin):
+    list_display = ('venue', 'user', 'start_date', 'start_time', 'end_time', 'interval_weeks', 'occurrences')
+    search_fields = ('venue__name', 'user__username')
+    list_select_related = ('venue', 'user')
+
+
+@admin.register(RemoteImage)
+class RemoteImageAdmin(admin.ModelAdmin):
+    list_display = ('url', 'status', 'http_status', 'failure_count', 'last_checked_at', 'next_check_at')
+    list_filter = ('status',)
+    search_fields = ('url',)
+    readonly_fields = ('url_hash', 'local_path', 'width', 'height', 'created_at')
+
+
+@admin.register(VenueRate)
+class VenueRateAdmin(admin.ModelAdmin):
+    list_display = ('venue', 'day_type', 'start_time', 'end_time', 'price_per_hour')
+    list_filter = ('day_type',)
+    search_fields = ('venue__name',)
+    list_select_related = ('venue',)
+
+
+@admin.register(VenueOperatingHours)
+class VenueOperatingHoursAdmin(admin.ModelAdmin):
+    list_display = ('venue', 'weekday', 'open_time', 'close_time', 'is_closed')
+    list_filter = ('weekday', 'is_closed')
+    search_fields = ('venue__name',)
+    list_select_related = ('venue',)
+
+
+@admin.register(Holiday)
+class HolidayAdmin(admin.ModelAdmin):
+    list_display = ('date', 'name')
+    date_hierarchy = 'date'
+
+
+@admin.register(WaitlistEntry)
+class WaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = ('venue', 'user', 'booking_date', 'slot_time', 'status', 'created_at', 'notified_at')
+    list_filter = ('status', 'booking_date')
+    search_fields = ('venue__name', 'user__username')
+    list_select_related = ('venue', 'user')
+
+
+@admin.register(VenueDailyStats)
+class VenueDailyStatsAdmin(admin.ModelAdmin):
+    list_display = ('venue', 'date', 'booking_count', 'booked_minutes', 'occupancy_percent', 'revenue',
+                    'cancelled_count', 'expired_count', 'promo_discount')
+    list_filter = ('date',)
+    search_fields = ('venue__name',)
+    list_select_related = ('venue',)
+    date_hierarchy = 'date'
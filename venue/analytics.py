@@ -0,0 +1,209 @@
+"""
+Rollup harian per venue (``VenueDailyStats``) untuk laporan pemilik venue.
+
+Setiap perubahan ``Booking`` (dan promo yang menempel padanya) menghitung
+ulang hanya baris ``(venue, tanggal)`` yang terdampak: tanggal lama dan baru
+jika booking dipindah. Perhitungan memakai query agregat yang sama dengan
+backfill (``rebuild_daily_stats``), dibatasi ke venue + tanggal tersebut
+lewat index ``venue, booking_date, status``, lalu di-upsert.
+
+Definisi per hari:
+
+- ``booking_count`` / ``booked_minutes`` / ``revenue``: booking berstatus
+  pending, confirmed atau completed (``UserBookingStats.SPEND_STATUSES``);
+  ``revenue`` adalah harga setelah diskon;
+- ``promo_discount``: potongan promo aktif pada booking tersebut;
+- ``cancelled_count`` / ``expired_count``: booking batal / kedaluwarsa;
+- ``open_minutes``: lama jam buka venue hari itu (venue/slots.py), penyebut
+  okupansi.
+
+Perubahan yang melewati signal (``QuerySet.update`` / ``bulk_create``) harus
+memanggil ``rebuild_daily_stats`` untuk tanggal yang terdampak.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import ExtractHour, ExtractMinute
+
+from promo.models import PromoRedemption
+
+from .models import Booking, UserBookingStats, Venue, VenueDailyStats
+from .slots import weekly_templates
+
+DAILY_FIELDS = ['booking_count', 'booked_minutes', 'open_minutes', 'revenue',
+                'cancelled_count', 'expired_count', 'promo_discount']
+BACKFILL_VENUE_BATCH = 100
+MAX_SERIES_DAYS = 366
+
+_SPEND = Q(status__in=UserBookingStats.SPEND_STATUSES)
+
+
+def _minutes_of(field):
+    return ExtractHour(field) * 60 + ExtractMinute(field)
+
+
+def _open_minutes(templates, day):
+    if not templates:
+        return 0
+    template = templates[day.weekday()]
+    return template.end_minute - template.open_minute
+
+
+def snapshot(booking):
+    """Ingat venue / tanggal saat dimuat supaya baris lama ikut dihitung ulang saat booking dipindah."""
+    booking._daily_snapshot = (booking.__dict__.get('venue_id'), booking.__dict__.get('booking_date'))
+
+
+def booking_changed(booking):
+    """Hitung ulang rollup tanggal lama dan baru ``booking``; mengembalikan key yang dihitung."""
+    keys = {(booking.venue_id, booking.booking_date)}
+    old_venue, old_date = getattr(booking, '_daily_snapshot', (None, None))
+    if old_venue is not None and old_date is not None:
+        keys.add((old_venue, old_date))
+    venues = [booking.venue] if Booking.venue.is_cached(booking) else None
+    rebuild_daily_stats(keys, venues=venues)
+    snapshot(booking)
+    return keys
+
+
+def _keys_q(keys, prefix=''):
+    dates_by_venue = defaultdict(set)
+    for venue_id, day in keys:
+        dates_by_venue[venue_id].add(day)
+    condition = Q()
+    for venue_id, dates in dates_by_venue.items():
+        condition |= Q(**{f'{prefix}venue_id': venue_id, f'{prefix}booking_date__in': dates})
+    return condition
+
+
+def rebuild_daily_stats(keys=None, venue_ids=None, venues=None):
+    """
+    Hitung ulang rollup untuk ``keys`` (iterable ``(venue_id, tanggal)``),
+    atau semua tanggal milik ``venue_ids``, dengan dua query agregat
+    ber-GROUP BY lalu upsert. Baris untuk ``keys`` yang tidak lagi punya
+    booking ditulis nol. Mengembalikan jumlah baris yang ditulis.
+    """
+    bookings = Booking.objects.order_by()
+    redemptions = PromoRedemption.objects.filter(
+        status__in=PromoRedemption.ACTIVE_STATUSES,
+        booking__status__in=UserBookingStats.SPEND_STATUSES,
+    ).order_by()
+    rows = {}
+    if keys is not None:
+        keys = set(keys)
+        if not keys:
+            return 0
+        bookings = bookings.filter(_keys_q(keys))
+        redemptions = redemptions.filter(_keys_q(keys, prefix='booking__'))
+        rows = {key: VenueDailyStats(venue_id=key[0], date=key[1]) for key in keys}
+    elif venue_ids is not None:
+        venue_ids = list(venue_ids)
+        bookings = bookings.filter(venue_id__in=venue_ids)
+        redemptions = redemptions.filter(booking__venue_id__in=venue_ids)
+
+    aggregates = bookings.values('venue_id', 'booking_date').annotate(
+        n=Count('pk', filter=_SPEND),
+        minutes=Sum(_minutes_of('end_time') - _minutes_of('start_time'), filter=_SPEND),
+        revenue=Sum('total_price', filter=_SPEND),
+        cancelled=Count('pk', filter=Q(status='cancelled')),
+        expired=Count('pk', filter=Q(status='expired')),
+    )
+    for row in aggregates:
+        key = (row['venue_id'], row['booking_date'])
+        stats = rows.setdefault(key, VenueDailyStats(venue_id=key[0], date=key[1]))
+        stats.booking_count = row['n']
+        stats.booked_minutes = row['minutes'] or 0
+        stats.revenue = row['revenue'] or Decimal('0')
+        stats.cancelled_count = row['cancelled']
+        stats.expired_count = row['expired']
+
+    discounts = redemptions.values('booking__venue_id', 'booking__booking_date').annotate(
+        total=Sum('discount_value'),
+    )
+    for row in discounts:
+        stats = rows.get((row['booking__venue_id'], row['booking__booking_date']))
+        if stats is not None:
+            stats.promo_discount = row['total'] or Decimal('0')
+
+    if not rows:
+        return 0
+
+    venue_list = list(venues or ())
+    known = {venue.pk for venue in venue_list}
+    missing = {venue_id for venue_id, _ in rows} - known
+    if missing:
+        venue_list += list(Venue.objects.filter(pk__in=missing).only('pk', 'slot_minutes'))
+    templates = weekly_templates(venue_list)
+    for (venue_id, day), stats in rows.items():
+        stats.open_minutes = _open_minutes(templates.get(venue_id), day)
+
+    VenueDailyStats.objects.bulk_create(
+        rows.values(), update_conflicts=True, unique_fields=['venue', 'date'], update_fields=DAILY_FIELDS,
+    )
+    return len(rows)
+
+
+def backfill_daily_stats(batch_size=BACKFILL_VENUE_BATCH):
+    """Bangun ulang seluruh rollup, ``batch_size`` venue per putaran."""
+    written = 0
+    venue_ids = list(Venue.objects.order_by('pk').values_list('pk', flat=True))
+    for offset in range(0, len(venue_ids), batch_size):
+        written += rebuild_daily_stats(venue_ids=venue_ids[offset:offset + batch_size])
+    return written
+
+
+def daily_series(venues, start, end):
+    """
+    Deret waktu harian (tanpa tanggal bolong) dari rollup ``venues`` antara
+    ``start`` dan ``end`` (inklusif), dijumlahkan lintas venue. Hari tanpa
+    booking tetap dihitung jam bukanya sehingga okupansi tidak terlalu tinggi.
+    """
+    venues = list(venues)
+    templates = weekly_templates(venues)
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    totals = {day: dict.fromkeys(DAILY_FIELDS, 0) for day in days}
+    for day in days:
+        totals[day]['open_minutes'] = sum(_open_minutes(templates[venue.pk], day) for venue in venues)
+
+    rows = VenueDailyStats.objects.filter(
+        venue__in=venues, date__range=(start, end),
+    ).values('venue_id', 'date', *DAILY_FIELDS)
+    for row in rows:
+        total = totals[row['date']]
+        # Jam buka tersimpan menggantikan jam buka saat ini untuk hari tersebut.
+        total['open_minutes'] -= _open_minutes(templates[row['venue_id']], row['date'])
+        for field in DAILY_FIELDS:
+            total[field] += row[field]
+
+    series = defaultdict(list)
+    for day in days:
+        total = totals[day]
+        series['booked_hours'].append(round(total['booked_minutes'] / 60, 2))
+        series['occupancy_percent'].append(_percent(total['booked_minutes'], total['open_minutes']))
+        series['revenue'].append(float(total['revenue']))
+        series['bookings'].append(total['booking_count'])
+        series['cancellations'].append(total['cancelled_count'])
+        series['expired'].append(total['expired_count'])
+        series['promo_discount'].append(float(total['promo_discount']))
+
+    booked = sum(total['booked_minutes'] for total in totals.values())
+    opened = sum(total['open_minutes'] for total in totals.values())
+    return {
+        'dates': [day.isoformat() for day in days],
+        'series': dict(series),
+        'totals': {
+            'booked_hours': round(booked / 60, 2),
+            'occupancy_percent': _percent(booked, opened),
+            'revenue': sum(series['revenue']),
+            'bookings': sum(series['bookings']),
+            'cancellations': sum(series['cancellations']),
+            'expired': sum(series['expired']),
+            'promo_discount': sum(series['promo_discount']),
+        },
+    }
+
+
+def _percent(part, whole):
+    return round(100 * part / whole, 1) if whole else 0.0
@@ -0,0 +1,178 @@
+"""
+Ketersediaan dinamis venue untuk daftar venue di homepage.
+
+``Venue.is_available`` hanya saklar manual pemilik venue. Kolom
+``next_free_at`` (ber-index), ``free_minutes_today`` dan
+``free_minutes_week`` menyimpan slot kosong berikutnya serta total menit
+kosong hari ini / ``HORIZON_DAYS`` hari ke depan, dihitung dari template slot
+venue (venue/slots.py) dikurangi booking yang masih menahan slot. Homepage
+mengurutkan dan memfilter "tersedia sekarang" langsung dari kolom tersebut,
+tanpa cek ketersediaan per venue.
+
+Kolom dihitung ulang per venue setelah transaksi commit setiap kali booking
+venue itu dalam horizon berubah (signal, venue/lifecycle.py,
+venue/series.py) atau jam operasionalnya berubah. Nilainya juga bergantung
+pada waktu (slot yang sudah lewat, pending yang melewati TTL), jadi command
+``refresh_venue_availability`` perlu dijalankan berkala, mis. bersama
+``sweep_bookings``. Di antara dua run, homepage memanggil
+``refresh_stale_availability`` sebelum memfilter / mengurutkan: venue yang
+``next_free_at``-nya sudah lewat atau dihitung sebelum hari ini dihitung
+ulang saat itu juga, supaya tidak terlewat filter "tersedia sekarang" atau
+naik ke urutan teratas.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db.models import F, Q
+from django.utils import timezone
+
+from main.tasks import run_after_commit
+
+from .models import Booking, Venue
+from .slots import weekly_templates
+
+HORIZON_DAYS = 7
+# "Tersedia sekarang": slot kosong berikutnya dimulai dalam rentang ini.
+AVAILABLE_NOW_MINUTES = 60
+REFRESH_VENUE_BATCH = 200
+AVAILABILITY_FIELDS = ['next_free_at', 'free_minutes_today', 'free_minutes_week', 'availability_updated_at']
+
+
+def _free_mask(template, intervals, now_minute=None):
+    free = template.full_mask & ~template.occupied_mask(intervals)
+    if now_minute is not None and now_minute >= template.open_minute:
+        # Slot yang jam mulainya sudah lewat tidak bisa dibooking lagi.
+        started = (now_minute - template.open_minute) // template.slot_minutes + 1
+        free &= ~((1 << started) - 1)
+    return free
+
+
+def compute_availability(templates, intervals_by_day, now):
+    """
+    ``(next_free_at, free_minutes_today, free_minutes_week)`` satu venue dari
+    template per hari dalam seminggu dan ``{tanggal: [(start_time, end_time)]}``
+    booking yang menahan slot.
+    """
+    local = timezone.localtime(now)
+    today = local.date()
+    next_free_at = None
+    free_today = free_week = 0
+    for offset in range(HORIZON_DAYS):
+        day = today + timedelta(days=offset)
+        template = templates[day.weekday()]
+        if template.closed:
+            continue
+        free = _free_mask(
+            template, intervals_by_day.get(day, ()),
+            now_minute=local.hour * 60 + local.minute if offset == 0 else None,
+        )
+        minutes = free.bit_count() * template.slot_minutes
+        free_week += minutes
+        if offset == 0:
+            free_today = minutes
+        if next_free_at is None and free:
+            minute = template.open_minute + ((free & -free).bit_length() - 1) * template.slot_minutes
+            next_free_at = timezone.make_aware(datetime.combine(day, time(minute // 60, minute % 60)))
+    return next_free_at, free_today, free_week
+
+
+def refresh_availability(venue_ids=None, now=None, batch_size=REFRESH_VENUE_BATCH):
+    """
+    Hitung ulang kolom ketersediaan ``venue_ids`` (atau semua venue), satu
+    query booking dan satu UPDATE massal per ``batch_size`` venue.
+    Mengembalikan jumlah venue yang diperbarui.
+    """
+    from .lifecycle import blocking_q
+
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    venues = Venue.objects.order_by('pk')
+    if venue_ids is not None:
+        venues = venues.filter(pk__in=list(venue_ids))
+    ids = list(venues.values_list('pk', flat=True))
+
+    updated = 0
+    for offset in range(0, len(ids), batch_size):
+        batch = list(Venue.objects.filter(pk__in=ids[offset:offset + batch_size]).only('pk', 'slot_minutes'))
+        templates = weekly_templates(batch)
+        intervals = defaultdict(lambda: defaultdict(list))
+        rows = Booking.objects.filter(
+            blocking_q(now),
+            venue__in=batch,
+            booking_date__range=(today, today + timedelta(days=HORIZON_DAYS - 1)),
+        ).order_by().values_list('venue_id', 'booking_date', 'start_time', 'end_time')
+        for venue_id, booking_date, start_time, end_time in rows:
+            intervals[venue_id][booking_date].append((start_time, end_time))
+
+        for venue in batch:
+            venue.next_free_at, venue.free_minutes_today, venue.free_minutes_week = compute_availability(
+                templates[venue.pk], intervals.get(venue.pk, {}), now,
+            )
+            venue.availability_updated_at = now
+        # bulk_update tidak memicu signal Venue (invalidasi cache / prefetch gambar).
+        Venue.objects.bulk_update(batch, AVAILABILITY_FIELDS)
+        updated += len(batch)
+    return updated
+
+
+def bookings_changed(keys):
+    """
+    Hook perubahan booking: jadwalkan hitung ulang venue yang punya
+    ``(venue_id, tanggal)`` di dalam horizon setelah transaksi commit.
+    """
+    today = timezone.localdate()
+    horizon_end = today + timedelta(days=HORIZON_DAYS)
+    venue_ids = sorted({venue_id for venue_id, day in keys if today <= day < horizon_end}, key=str)
+    if venue_ids:
+        run_after_commit(refresh_availability, venue_ids)
+    return venue_ids
+
+
+def venue_changed(venue_id):
+    """Hook perubahan venue / jam operasional."""
+    run_after_commit(refresh_availability, [venue_id])
+
+
+def stale_availability_q(now):
+    """Venue yang kolom ketersediaannya sudah tidak berlaku pada ``now``."""
+    start_of_day = timezone.make_aware(datetime.combine(timezone.localdate(now), time(0)))
+    return Q(next_free_at__lt=now) | Q(availability_updated_at__lt=start_of_day)
+
+
+def refresh_stale_availability(queryset=None, now=None):
+    """
+    Hitung ulang venue (dari ``queryset`` atau semua venue) yang kolom
+    ketersediaannya basi. Satu query index jika tidak ada yang basi.
+    """
+    now = now or timezone.now()
+    queryset = Venue.objects.all() if queryset is None else queryset
+    stale_ids = list(queryset.filter(stale_availability_q(now)).order_by().values_list('pk', flat=True))
+    if not stale_ids:
+        return 0
+    return refresh_availability(stale_ids, now=now)
+
+
+def available_now_q(now=None):
+    """Venue dengan slot kosong yang dimulai dalam ``AVAILABLE_NOW_MINUTES`` ke depan."""
+    now = now or timezone.now()
+    return Q(next_free_at__gte=now, next_free_at__lt=now + timedelta(minutes=AVAILABLE_NOW_MINUTES))
+
+
+def available_today_q(now=None):
+    """Venue yang masih punya slot kosong hari ini (slot berikutnya sebelum tengah malam)."""
+    now = now or timezone.now()
+    tomorrow = timezone.make_aware(datetime.combine(timezone.localdate(now) + timedelta(days=1), time(0)))
+    return Q(next_free_at__gte=now, next_free_at__lt=tomorrow)
+
+
+def order_by_availability(queryset):
+    """Slot kosong paling cepat dulu; venue penuh seminggu di akhir."""
+    return queryset.order_by(F('next_free_at').asc(nulls_last=True), '-free_minutes_today', 'name')
+
+
+def availability_dict(venue):
+    return {
+        'next_free_at': timezone.localtime(venue.next_free_at).isoformat() if venue.next_free_at else None,
+        'free_hours_today': round(venue.free_minutes_today / 60, 2),
+        'free_hours_week': round(venue.free_minutes_week / 60, 2),
+    }
@@ -0,0 +1,46 @@
+"""
+Riwayat booking user untuk halaman my_bookings.
+
+Dua tab (upcoming / past) dengan keyset pagination ``(-created_at, -pk)``
+yang dilayani index ``(user, created_at)``. Hanya kolom yang ditampilkan
+yang dimuat, termasuk ``Venue.cached_image_url`` sehingga tidak ada
+pemanggilan storage per baris.
+"""
+from django.db.models import Q
+from django.utils import timezone
+
+from main.pagination import keyset_paginate
+
+from .models import Booking
+
+TABS = ('upcoming', 'past')
+PAGE_SIZE = 20
+ORDERING = ('-created_at', '-pk')
+LIST_FIELDS = (
+    'id', 'user_id', 'booking_date', 'start_time', 'end_time', 'total_price', 'status',
+    'created_at', 'updated_at',
+    'venue__id', 'venue__name', 'venue__category', 'venue__address', 'venue__cached_image_url',
+)
+
+
+def normalize_tab(tab):
+    return tab if tab in TABS else TABS[0]
+
+
+def upcoming_q(today=None):
+    """Booking yang masih akan datang dan masih menahan slot."""
+    today = today or timezone.localdate()
+    return Q(booking_date__gte=today, status__in=Booking.BLOCKING_STATUSES)
+
+
+def get_booking_page(user, tab='upcoming', cursor=None, page_size=PAGE_SIZE):
+    """Satu halaman booking ``user`` untuk ``tab``. Raise ``InvalidCursor`` jika cursor rusak."""
+    condition = upcoming_q()
+    if normalize_tab(tab) == 'past':
+        condition = ~condition
+    queryset = (
+        Booking.objects.filter(condition, user=user)
+        .select_related('venue')
+        .only(*LIST_FIELDS)
+    )
+    return keyset_paginate(queryset, ORDERING, cursor=cursor, page_size=page_size)
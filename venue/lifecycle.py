@@ -0,0 +1,169 @@
+"""
+State machine status ``Booking`` dan sweeper periodik.
+
+Transisi yang sah ada di ``Booking.TRANSITIONS``::
+
+    pending   -> confirmed | cancelled | expired
+    confirmed -> cancelled | completed
+
+Perubahan status memakai UPDATE bersyarat pada status lama, sehingga dua
+request yang bersamaan tidak bisa sama-sama berhasil (mis. batal dua kali).
+
+``sweep_bookings`` (command ``sweep_bookings``, jalankan tiap beberapa menit)
+mengubah booking secara massal dengan UPDATE per batch:
+
+- pending yang tidak dikonfirmasi dalam ``BOOKING_PENDING_TTL_MINUTES``
+  (hanya jika TTL diisi) -> expired (kuota promo dikembalikan);
+- confirmed yang jam selesainya sudah lewat -> completed.
+
+Booking yang batal / kedaluwarsa melepas slotnya ke waitlist
+(venue/waitlist.py), kecuali slot yang sudah dimulai, dan ketersediaan venue
+dihitung ulang (venue/availability.py).
+
+TTL pending bersifat opt-in (default ``None``): selama belum ada alur
+konfirmasi / pembayaran untuk pelanggan, booking pending tidak pernah
+di-expire, termasuk yang jam mulainya sudah lewat, supaya tidak hilang dari
+pendapatan dan kuota promonya tidak dikembalikan. Jika TTL diaktifkan,
+``blocking_q`` sudah tidak menghitung pending yang melewati TTL sebelum
+sweeper berjalan sehingga slot langsung terbuka lagi.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from promo.engine import release_booking_promos, release_promos_for_bookings
+
+from .models import Booking
+from .analytics import booking_changed, rebuild_daily_stats
+from .availability import bookings_changed
+from .stats import apply_booking_change, rebuild_booking_stats
+from .waitlist import slots_released
+
+DEFAULT_PENDING_TTL_MINUTES = None
+SWEEP_BATCH_SIZE = 1000
+RELEASE_STATUSES = ('cancelled', 'expired')
+
+
+class InvalidTransition(ValidationError):
+    pass
+
+
+def pending_cutoff(now=None):
+    """
+    Pending yang dibuat sebelum waktu ini sudah melewati TTL, atau ``None``
+    jika TTL tidak diaktifkan.
+    """
+    minutes = getattr(settings, 'BOOKING_PENDING_TTL_MINUTES', DEFAULT_PENDING_TTL_MINUTES)
+    if not minutes:
+        return None
+    return (now or timezone.now()) - timedelta(minutes=minutes)
+
+
+def blocking_q(now=None):
+    """Filter booking yang masih menahan slot: confirmed, atau pending (dalam TTL jika aktif)."""
+    cutoff = pending_cutoff(now)
+    if cutoff is None:
+        return Q(status__in=('confirmed', 'pending'))
+    return Q(status='confirmed') | Q(status='pending', created_at__gte=cutoff)
+
+
+def transition(booking, status, now=None):
+    """
+    Pindahkan ``booking`` ke ``status``. Raise ``InvalidTransition`` jika
+    transisi tidak sah atau status booking sudah diubah oleh proses lain.
+    """
+    if not booking.can_transition_to(status):
+        raise InvalidTransition(
+            f"Booking berstatus {booking.get_status_display()} tidak bisa diubah menjadi {status}."
+        )
+
+    now = now or timezone.now()
+    with transaction.atomic():
+        changed = Booking.objects.filter(pk=booking.pk, status=booking.status).update(
+            status=status, updated_at=now,
+        )
+        if not changed:
+            raise InvalidTransition("Status booking sudah berubah, silakan muat ulang halaman.")
+        booking.status = status
+        booking.updated_at = now
+        apply_booking_change(booking, created=False)
+        if status in RELEASE_STATUSES:
+            release_booking_promos(booking)
+            slots_released([(booking.venue_id, booking.booking_date, booking.start_time, booking.end_time)])
+        bookings_changed(booking_changed(booking))
+    return booking
+
+
+def _local_now(now):
+    local = timezone.localtime(now)
+    return local.date(), local.time()
+
+
+def _not_started(row, today, current_time):
+    booking_date, start_time = row[3], row[4]
+    return booking_date > today or (booking_date == today and start_time > current_time)
+
+
+def _bulk_transition(condition, from_status, to_status, now, batch_size):
+    total = 0
+    today, current_time = _local_now(now)
+    candidates = Booking.objects.filter(condition, status=from_status).order_by()
+    while True:
+        rows = list(candidates.values_list(
+            'pk', 'user_id', 'venue_id', 'booking_date', 'start_time', 'end_time',
+        )[:batch_size])
+        if not rows:
+            return total
+        booking_ids = [row[0] for row in rows]
+        with transaction.atomic():
+            total += Booking.objects.filter(pk__in=booking_ids, status=from_status).update(
+                status=to_status, updated_at=now,
+            )
+            if to_status in RELEASE_STATUSES:
+                release_promos_for_bookings(booking_ids)
+                # Slot yang sudah dimulai tidak bisa dibooking waiter lagi.
+                slots_released([row[2:] for row in rows if _not_started(row, today, current_time)])
+            # UPDATE massal melewati signal, jadi statistik user, rollup
+            # harian dan ketersediaan venue dihitung ulang.
+            keys = {(row[2], row[3]) for row in rows}
+            rebuild_booking_stats({row[1] for row in rows})
+            rebuild_daily_stats(keys)
+            bookings_changed(keys)
+
+
+def sweep_bookings(now=None, batch_size=SWEEP_BATCH_SIZE):
+    """Jalankan expiry dan completion; mengembalikan jumlah booking per status baru."""
+    now = now or timezone.now()
+    today, current_time = _local_now(now)
+
+    ended = Q(booking_date__lt=today) | Q(booking_date=today, end_time__lte=current_time)
+
+    cutoff = pending_cutoff(now)
+    expired = 0
+    if cutoff is not None:
+        expired = _bulk_transition(Q(created_at__lt=cutoff), 'pending', 'expired', now, batch_size)
+
+    return {
+        'expired': expired,
+        'completed': _bulk_transition(ended, 'confirmed', 'completed', now, batch_size),
+    }
+
+
+def cancel_series(series, now=None):
+    """
+    Batalkan semua booking ``series`` yang belum dimulai dan masih aktif,
+    secara massal. Mengembalikan jumlah booking yang dibatalkan.
+    """
+    now = now or timezone.now()
+    today, current_time = _local_now(now)
+    upcoming = Q(series=series) & (
+        Q(booking_date__gt=today) | Q(booking_date=today, start_time__gt=current_time)
+    )
+    return sum(
+        _bulk_transition(upcoming, status, 'cancelled', now, SWEEP_BATCH_SIZE)
+        for status in Booking.BLOCKING_STATUSES
+    )
@@ -0,0 +1,60 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+
+from venue.models import RemoteImage, Venue
+from venue.remote_images import claim, fetch_remote_image
+
+
+def _fetch(remote):
+    return fetch_remote_image(remote.pk) if claim(remote) else 'skipped'
+
+
+def _fetch_in_thread(remote):
+    try:
+        return _fetch(remote)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Ambil dan simpan lokal semua gambar eksternal venue (image_url) yang belum ada / sudah jatuh tempo."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help="Jumlah download paralel (default 4)")
+        parser.add_argument('--refresh', action='store_true', help="Ikut ambil ulang gambar OK yang sudah jatuh tempo")
+        parser.add_argument('--limit', type=int, help="Batas jumlah gambar yang diproses")
+
+    def handle(self, *args, **options):
+        urls = set(
+            Venue.objects.filter(image_url__isnull=False)
+            .filter(Q(thumbnail='') | Q(thumbnail__isnull=True))
+            .exclude(image_url='')
+            .values_list('image_url', flat=True)
+        )
+        RemoteImage.objects.bulk_create(
+            [RemoteImage(url=url, url_hash=RemoteImage.hash_url(url)) for url in urls],
+            ignore_conflicts=True,
+        )
+
+        due = RemoteImage.objects.filter(
+            url_hash__in=[RemoteImage.hash_url(url) for url in urls],
+            next_check_at__lte=timezone.now(),
+        ).exclude(status=RemoteImage.STATUS_DEAD)
+        if not options['refresh']:
+            due = due.exclude(status=RemoteImage.STATUS_OK)
+        due = list(due.order_by('pk')[:options['limit']] if options['limit'] else due.order_by('pk'))
+
+        self.stdout.write(f"{len(urls)} gambar venue, {len(due)} akan diambil.")
+        if options['workers'] <= 1:
+            results = Counter(map(_fetch, due))
+        else:
+            with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+                results = Counter(executor.map(_fetch_in_thread, due))
+
+        summary = ', '.join(f"{status}: {count}" for status, count in sorted(results.items())) or '-'
+        self.stdout.write(self.style.SUCCESS(f"Selesai ({summary})."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from venue.stats import rebuild_booking_stats
+
+
+class Command(BaseCommand):
+    help = "Hitung ulang UserBookingStats dari tabel booking (semua user atau --user tertentu)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='user_ids', help="ID user (boleh berulang)")
+
+    def handle(self, *args, **options):
+        written = rebuild_booking_stats(options['user_ids'])
+        self.stdout.write(self.style.SUCCESS(f"Statistik {written} user diperbarui."))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from venue.analytics import BACKFILL_VENUE_BATCH, backfill_daily_stats, rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = "Hitung ulang rollup harian VenueDailyStats dari tabel booking (semua venue atau --venue tertentu)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--venue', action='append', dest='venue_ids', help="ID venue (boleh berulang)")
+        parser.add_argument('--batch-size', type=int, default=BACKFILL_VENUE_BATCH, help="Jumlah venue per query agregat")
+
+    def handle(self, *args, **options):
+        if options['venue_ids']:
+            written = rebuild_daily_stats(venue_ids=options['venue_ids'])
+        else:
+            written = backfill_daily_stats(batch_size=max(1, options['batch_size']))
+        self.stdout.write(self.style.SUCCESS(f"{written} rollup harian venue diperbarui."))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from venue.models import Venue
+
+
+class Command(BaseCommand):
+    help = (
+        "Isi ulang Venue.cached_image_url dari get_image_url() (jalankan sekali setelah migrate, "
+        "atau setelah route gambar venue / storage berubah)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        changed = []
+        venues = Venue.objects.only('pk', 'thumbnail', 'image_url', 'cached_image_url').order_by('pk')
+        for venue in venues.iterator(chunk_size=batch_size):
+            url = venue.get_image_url() or ''
+            if url != venue.cached_image_url:
+                venue.cached_image_url = url
+                changed.append(venue)
+        Venue.objects.bulk_update(changed, ['cached_image_url'], batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"{len(changed)} URL gambar venue diperbarui."))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from venue.availability import REFRESH_VENUE_BATCH, refresh_availability
+
+
+class Command(BaseCommand):
+    help = (
+        "Hitung ulang slot kosong berikutnya dan jam kosong hari ini / 7 hari ke depan "
+        "per venue (jalankan tiap beberapa menit, mis. bersama sweep_bookings)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--venue', action='append', dest='venue_ids', help="ID venue (boleh berulang)")
+        parser.add_argument('--batch-size', type=int, default=REFRESH_VENUE_BATCH, help="Jumlah venue per query")
+
+    def handle(self, *args, **options):
+        updated = refresh_availability(venue_ids=options['venue_ids'], batch_size=max(1, options['batch_size']))
+        self.stdout.write(self.style.SUCCESS(f"Ketersediaan {updated} venue diperbarui."))
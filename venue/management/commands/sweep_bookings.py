@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from venue.lifecycle import SWEEP_BATCH_SIZE, sweep_bookings
+
+
+class Command(BaseCommand):
+    help = (
+        "Expire booking pending yang melewati TTL (jika BOOKING_PENDING_TTL_MINUTES diisi) "
+        "dan tandai booking confirmed yang sudah lewat sebagai completed (jalankan tiap beberapa menit)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=SWEEP_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        result = sweep_bookings(batch_size=max(1, options['batch_size']))
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['expired']} booking expired, {result['completed']} booking completed."
+        ))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:26
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venue', '0005_alter_booking_options_venue_image_url_venue_user_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RemoteImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=1000)),
+                ('url_hash', models.CharField(max_length=64, unique=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('ok', 'OK'), ('failed', 'Failed'), ('dead', 'Dead')], db_index=True, default='pending', max_length=10)),
+                ('http_status', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('local_path', models.CharField(blank=True, max_length=255)),
+                ('width', models.PositiveIntegerField(blank=True, null=True)),
+                ('height', models.PositiveIntegerField(blank=True, null=True)),
+                ('failure_count', models.PositiveSmallIntegerField(default=0)),
+                ('last_error', models.CharField(blank=True, max_length=255)),
+                ('last_checked_at', models.DateTimeField(blank=True, null=True)),
+                ('next_check_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
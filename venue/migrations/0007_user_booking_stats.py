@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Sum
+
+
+def backfill_booking_stats(apps, schema_editor):
+    Booking = apps.get_model('venue', 'Booking')
+    UserBookingStats = apps.get_model('venue', 'UserBookingStats')
+    rows = {}
+    aggregates = Booking.objects.order_by().values('user_id', 'status').annotate(
+        n=Count('id'), spend=Sum('total_price'), last=Max('created_at'),
+    )
+    for row in aggregates:
+        stats = rows.setdefault(row['user_id'], UserBookingStats(user_id=row['user_id']))
+        field = f"{row['status']}_count"
+        if hasattr(stats, field):
+            setattr(stats, field, row['n'])
+        if row['status'] != 'cancelled':
+            stats.total_spent += row['spend'] or 0
+        if stats.last_booking_at is None or row['last'] > stats.last_booking_at:
+            stats.last_booking_at = row['last']
+    UserBookingStats.objects.bulk_create(rows.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('venue', '0006_remote_image'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserBookingStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='booking_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('pending_count', models.PositiveIntegerField(default=0)),
+                ('confirmed_count', models.PositiveIntegerField(default=0)),
+                ('cancelled_count', models.PositiveIntegerField(default=0)),
+                ('completed_count', models.PositiveIntegerField(default=0)),
+                ('total_spent', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('last_booking_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_booking_stats, migrations.RunPython.noop),
+    ]
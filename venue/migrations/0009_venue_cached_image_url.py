@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:43
+
+from django.db import migrations, models
+
+
+# Tidak ada backfill di sini: URL bergantung pada URLconf saat ini, jadi isi
+# kolom ini dengan `manage.py rebuild_venue_image_urls` setelah migrate.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venue', '0008_booking_lifecycle'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venue',
+            name='cached_image_url',
+            field=models.CharField(blank=True, default='', max_length=1000),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venue', '0009_venue_cached_image_url'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Holiday',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('name', models.CharField(max_length=100)),
+            ],
+            options={
+                'ordering': ['date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='VenueRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day_type', models.CharField(choices=[('weekday', 'Hari Kerja'), ('weekend', 'Akhir Pekan'), ('holiday', 'Hari Libur')], max_length=10)),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('price_per_hour', models.PositiveIntegerField()),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rates', to='venue.venue')),
+            ],
+            options={
+                'ordering': ['venue', 'day_type', 'start_time'],
+            },
+        ),
+    ]
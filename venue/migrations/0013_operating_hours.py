@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:54
+
+import datetime
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_slot_end_time(apps, schema_editor):
+    # Entry lama dibuat saat slot selalu satu jam.
+    WaitlistEntry = apps.get_model('venue', 'WaitlistEntry')
+    entries = list(WaitlistEntry.objects.filter(slot_end_time__isnull=True))
+    for entry in entries:
+        start = datetime.datetime.combine(entry.booking_date, entry.slot_time)
+        entry.slot_end_time = (start + datetime.timedelta(hours=1)).time()
+    WaitlistEntry.objects.bulk_update(entries, ['slot_end_time'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venue', '0012_waitlist'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venue',
+            name='max_booking_minutes',
+            field=models.PositiveSmallIntegerField(default=720),
+        ),
+        migrations.AddField(
+            model_name='venue',
+            name='min_booking_minutes',
+            field=models.PositiveSmallIntegerField(default=60),
+        ),
+        migrations.AddField(
+            model_name='venue',
+            name='slot_minutes',
+            field=models.PositiveSmallIntegerField(choices=[(15, '15 menit'), (30, '30 menit'), (60, '1 jam'), (120, '2 jam')], default=60),
+        ),
+        migrations.AddField(
+            model_name='waitlistentry',
+            name='slot_end_time',
+            field=models.TimeField(null=True),
+        ),
+        migrations.RunPython(backfill_slot_end_time, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='waitlistentry',
+            name='slot_end_time',
+            field=models.TimeField(),
+        ),
+        migrations.CreateModel(
+            name='VenueOperatingHours',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekday', models.PositiveSmallIntegerField(choices=[(0, 'Senin'), (1, 'Selasa'), (2, 'Rabu'), (3, 'Kamis'), (4, 'Jumat'), (5, 'Sabtu'), (6, 'Minggu')])),
+                ('open_time', models.TimeField(default=datetime.time(7, 0))),
+                ('close_time', models.TimeField(default=datetime.time(22, 0))),
+                ('is_closed', models.BooleanField(default=False)),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='operating_hours', to='venue.venue')),
+            ],
+            options={
+                'ordering': ['venue', 'weekday'],
+                'constraints': [models.UniqueConstraint(fields=('venue', 'weekday'), name='unique_venue_weekday_hours')],
+            },
+        ),
+    ]
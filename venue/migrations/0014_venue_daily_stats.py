@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venue', '0013_operating_hours'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VenueDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('booking_count', models.PositiveIntegerField(default=0)),
+                ('booked_minutes', models.PositiveIntegerField(default=0)),
+                ('open_minutes', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('cancelled_count', models.PositiveIntegerField(default=0)),
+                ('expired_count', models.PositiveIntegerField(default=0)),
+                ('promo_discount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='venue.venue')),
+            ],
+            options={
+                'ordering': ['venue', 'date'],
+                'constraints': [models.UniqueConstraint(fields=('venue', 'date'), name='unique_venue_daily_stats')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venue', '0014_venue_daily_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venue',
+            name='availability_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='venue',
+            name='free_minutes_today',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='venue',
+            name='free_minutes_week',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='venue',
+            name='next_free_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
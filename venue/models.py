@@ -1,11 +1,21 @@
 from django.db import models
+import hashlib
 import uuid
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from datetime import datetime, date, time
+from datetime import datetime, date, time, timedelta
 from django.contrib.auth.models import User
 from django.core.validators import URLValidator
 from django.core.exceptions import ValidationError
+from django.urls import reverse
+from django.utils import timezone
+
+def format_minutes(minutes):
+    """120 -> '2 jam', 90 -> '1 jam 30 menit', 30 -> '30 menit'."""
+    hours, minutes = divmod(minutes, 60)
+    parts = ([f"{hours} jam"] if hours else []) + ([f"{minutes} menit"] if minutes else [])
+    return ' '.join(parts) or '0 menit'
+
 
 class Venue(models.Model):
     CATEGORY_CHOICES = [
@@ -32,9 +42,24 @@ class Venue(models.Model):
     address = models.TextField(blank=True)
     thumbnail = models.ImageField(upload_to='venues/', blank=True, null=True)
     image_url = models.URLField(blank=True, null=True)  # TAMBAH FIELD INI
+    # Hasil get_image_url() yang disimpan saat save; dipakai daftar panjang
+    # (mis. my_bookings) supaya tidak memanggil storage per baris.
+    cached_image_url = models.CharField(max_length=1000, blank=True, default='')
     rating = models.FloatField(default=0.0)
     price = models.IntegerField(default=0)
     is_available = models.BooleanField(default=True)
+    # Granularitas slot dan batas durasi booking; jam buka per hari ada di
+    # VenueOperatingHours (lihat venue/slots.py).
+    SLOT_MINUTES_CHOICES = [(15, '15 menit'), (30, '30 menit'), (60, '1 jam'), (120, '2 jam')]
+    slot_minutes = models.PositiveSmallIntegerField(choices=SLOT_MINUTES_CHOICES, default=60)
+    min_booking_minutes = models.PositiveSmallIntegerField(default=60)
+    max_booking_minutes = models.PositiveSmallIntegerField(default=12 * 60)
+    # Ketersediaan dinamis (venue/availability.py): slot kosong berikutnya dan
+    # menit kosong hari ini / 7 hari ke depan, diperbarui dari booking.
+    next_free_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    free_minutes_today = models.PositiveIntegerField(default=0)
+    free_minutes_week = models.PositiveIntegerField(default=0)
+    availability_updated_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -62,7 +87,10 @@ class Venue(models.Model):
         if self.thumbnail and self.thumbnail.url:
             return self.thumbnail.url
         elif self.image_url:
-            return self.image_url
+            # Gambar eksternal dilayani lewat proxy lokal (lihat venue/remote_images.py);
+            # parameter v berubah jika image_url diganti sehingga cache browser ikut berganti.
+            version = RemoteImage.hash_url(self.image_url)[:10]
+            return f"{reverse('venue:venue_image', args=[self.pk])}?v={version}"
         return None
     
     def clean(self):
@@ -77,6 +105,48 @@ class Venue(models.Model):
     def save(self, *args, **kwargs):
         self.clean()
         super().save(*args, **kwargs)
+        # Dihitung setelah save karena storage bisa mengganti nama file upload.
+        url = self.get_image_url() or ''
+        if url != self.cached_image_url:
+            self.cached_image_url = url
+            Venue.objects.filter(pk=self.pk).update(cached_image_url=url)
+
+class RemoteImage(models.Model):
+    """
+    Salinan lokal gambar eksternal (``Venue.image_url``) beserta status
+    kesehatan link-nya. Diisi oleh venue/remote_images.py.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_OK = 'ok'
+    STATUS_FAILED = 'failed'
+    STATUS_DEAD = 'dead'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_OK, 'OK'),
+        (STATUS_FAILED, 'Failed'),
+        (STATUS_DEAD, 'Dead'),
+    ]
+
+    url = models.URLField(max_length=1000)
+    url_hash = models.CharField(max_length=64, unique=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True)
+    http_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    local_path = models.CharField(max_length=255, blank=True)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    failure_count = models.PositiveSmallIntegerField(default=0)
+    last_error = models.CharField(max_length=255, blank=True)
+    last_checked_at = models.DateTimeField(null=True, blank=True)
+    next_check_at = models.DateTimeField(default=timezone.now, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.url} ({self.status})"
+
+    @staticmethod
+    def hash_url(url):
+        return hashlib.sha256(url.encode()).hexdigest()
+
 
 class Booking(models.Model):
     STATUS_CHOICES = [
@@ -84,7 +154,18 @@ class Booking(models.Model):
         ('confirmed', 'Confirmed'),
         ('cancelled', 'Cancelled'),
         ('completed', 'Completed'),
+        ('expired', 'Expired'),
     ]
+    # Status yang menahan slot venue.
+    BLOCKING_STATUSES = ('pending', 'confirmed')
+    # Transisi status yang sah (lihat venue/lifecycle.py).
+    TRANSITIONS = {
+        'pending': ('confirmed', 'cancelled', 'expired'),
+        'confirmed': ('cancelled', 'completed'),
+        'cancelled': (),
+        'completed': (),
+        'expired': (),
+    }
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -94,6 +175,10 @@ class Booking(models.Model):
     end_time = models.TimeField()
     total_price = models.DecimalField(max_digits=10, decimal_places=2)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    # Diisi jika booking dibuat sebagai bagian dari booking rutin (venue/series.py).
+    series = models.ForeignKey(
+        'BookingSeries', on_delete=models.SET_NULL, null=True, blank=True, related_name='bookings',
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -102,6 +187,7 @@ class Booking(models.Model):
         indexes = [
             models.Index(fields=['venue', 'booking_date', 'status']),
             models.Index(fields=['user', 'created_at']),
+            models.Index(fields=['status', 'booking_date']),
         ]
 
     def __str__(self):
@@ -131,6 +217,14 @@ class Booking(models.Model):
         
         return True
 
+    def can_transition_to(self, status):
+        return status in self.TRANSITIONS.get(self.status, ())
+
+    def transition_to(self, status):
+        """Ubah status dengan validasi transisi; raise ``InvalidTransition`` jika tidak sah."""
+        from .lifecycle import transition
+        return transition(self, status)
+
     def has_time_conflict(self, other_booking):
         """Check if this booking conflicts with another booking"""
         if self.venue != other_booking.venue:
@@ -153,12 +247,12 @@ class Booking(models.Model):
             if self.end_time <= self.start_time:
                 raise ValidationError("Waktu selesai harus setelah waktu mulai")
             
-            # Validasi durasi minimal 1 jam
+            # Validasi durasi minimal (default 1 jam, bisa diatur per venue)
             start_dt = datetime.combine(date.today(), self.start_time)
             end_dt = datetime.combine(date.today(), self.end_time)
-            duration_hours = (end_dt - start_dt).seconds / 3600
-            if duration_hours < 1:
-                raise ValidationError("Durasi booking minimal 1 jam")
+            min_minutes = self.venue.min_booking_minutes if self.venue_id else 60
+            if (end_dt - start_dt).seconds < min_minutes * 60:
+                raise ValidationError(f"Durasi booking minimal {format_minutes(min_minutes)}")
         
         # Validasi tanggal booking tidak boleh di masa lalu
         if self.booking_date and self.booking_date < date.today():
@@ -177,12 +271,249 @@ class Booking(models.Model):
     
     def check_availability(self):
         """Cek apakah venue available pada waktu yang diminta"""
+        from .lifecycle import blocking_q
+
         conflicting_bookings = Booking.objects.filter(
+            blocking_q(),
             venue=self.venue,
             booking_date=self.booking_date,
-            status__in=['pending', 'confirmed'],
             start_time__lt=self.end_time,
             end_time__gt=self.start_time
         ).exclude(id=self.id)
         
-        return not conflicting_bookings.exists()
\ No newline at end of file
+        return not conflicting_bookings.exists()
+
+
+class BookingSeries(models.Model):
+    """
+    Booking rutin: slot yang sama di venue yang sama setiap ``interval_weeks``
+    minggu sebanyak ``occurrences`` kali. Setiap kejadian disimpan sebagai
+    ``Booking`` biasa yang menunjuk ke series ini (lihat venue/series.py).
+    """
+    MAX_OCCURRENCES = 52
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='booking_series')
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='booking_series')
+    start_date = models.DateField()
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    interval_weeks = models.PositiveSmallIntegerField(default=1)
+    occurrences = models.PositiveSmallIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name_plural = 'booking series'
+
+    def __str__(self):
+        return f"{self.user.username} - {self.venue.name} - {self.start_date} x{self.occurrences}"
+
+    def occurrence_dates(self):
+        step = timedelta(weeks=self.interval_weeks)
+        return [self.start_date + step * index for index in range(self.occurrences)]
+
+    def clean(self):
+        if not 1 <= self.occurrences <= self.MAX_OCCURRENCES:
+            raise ValidationError(f"Jumlah pertemuan harus antara 1 dan {self.MAX_OCCURRENCES}")
+        if self.interval_weeks < 1:
+            raise ValidationError("Interval minimal 1 minggu")
+        # Validasi waktu / tanggal sama dengan booking tunggal; kejadian
+        # berikutnya selalu setelah kejadian pertama.
+        Booking(
+            venue=self.venue, booking_date=self.start_date,
+            start_time=self.start_time, end_time=self.end_time,
+        ).clean()
+
+
+class WaitlistEntry(models.Model):
+    """
+    Antrian user untuk satu slot (``slot_time`` - ``slot_end_time``, mengikuti
+    ukuran slot venue) yang sudah penuh di sebuah venue. Saat booking yang menahan slot tersebut batal atau
+    kedaluwarsa, user pertama yang menunggu dipromosikan menjadi ``notified``
+    dan diberi tahu (lihat venue/waitlist.py).
+    """
+    STATUS_WAITING = 'waiting'
+    STATUS_NOTIFIED = 'notified'
+    STATUS_CANCELLED = 'cancelled'
+    STATUS_CHOICES = [
+        (STATUS_WAITING, 'Menunggu'),
+        (STATUS_NOTIFIED, 'Diberi tahu'),
+        (STATUS_CANCELLED, 'Dibatalkan'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='waitlist_entries')
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='waitlist_entries')
+    booking_date = models.DateField()
+    slot_time = models.TimeField()
+    slot_end_time = models.TimeField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_WAITING)
+    created_at = models.DateTimeField(auto_now_add=True)
+    notified_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            # Lookup saat slot dilepas: venue + tanggal + status, rentang jam, urut antrian.
+            models.Index(fields=['venue', 'booking_date', 'status', 'slot_time', 'created_at']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'venue', 'booking_date', 'slot_time'],
+                condition=models.Q(status='waiting'),
+                name='unique_waiting_entry',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.venue_id} - {self.booking_date} {self.slot_time} ({self.status})"
+
+
+class UserBookingStats(models.Model):
+    """
+    Proyeksi ringkasan booking per user: jumlah per status, total nilai
+    booking (selain yang dibatalkan / kedaluwarsa) dan waktu booking terakhir.
+
+    Dipelihara oleh signal ``Booking`` (lihat venue/stats.py) sehingga
+    profil / dashboard cukup membaca satu baris, bukan menghitung ulang
+    ``booking_set`` setiap kali.
+    """
+    SPEND_STATUSES = ('pending', 'confirmed', 'completed')
+    ACTIVE_STATUSES = ('pending', 'confirmed')
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='booking_stats')
+    pending_count = models.PositiveIntegerField(default=0)
+    confirmed_count = models.PositiveIntegerField(default=0)
+    cancelled_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    expired_count = models.PositiveIntegerField(default=0)
+    total_spent = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    last_booking_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.total_count} booking"
+
+    def count_for(self, status):
+        return getattr(self, f'{status}_count', 0)
+
+    @property
+    def total_count(self):
+        return sum(self.count_for(status) for status, _ in Booking.STATUS_CHOICES)
+
+    @property
+    def active_count(self):
+        return sum(self.count_for(status) for status in self.ACTIVE_STATUSES)
+
+
+class VenueDailyStats(models.Model):
+    """
+    Rollup harian per venue (berdasarkan tanggal main / ``booking_date``)
+    untuk laporan pemilik venue: jam terisi, okupansi, pendapatan, pembatalan
+    dan potongan promo. Dipelihara oleh signal ``Booking`` / ``PromoRedemption``
+    (lihat venue/analytics.py) sehingga dashboard tidak memindai ``Booking``.
+    """
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField()
+    booking_count = models.PositiveIntegerField(default=0)
+    booked_minutes = models.PositiveIntegerField(default=0)
+    # Menit buka venue pada hari tersebut saat rollup dihitung (penyebut okupansi).
+    open_minutes = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    cancelled_count = models.PositiveIntegerField(default=0)
+    expired_count = models.PositiveIntegerField(default=0)
+    promo_discount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['venue', 'date']
+        constraints = [
+            models.UniqueConstraint(fields=['venue', 'date'], name='unique_venue_daily_stats'),
+        ]
+
+    def __str__(self):
+        return f"{self.venue_id} {self.date}: {self.booking_count} booking"
+
+    @property
+    def occupancy_percent(self):
+        if not self.open_minutes:
+            return 0.0
+        return round(100 * self.booked_minutes / self.open_minutes, 1)
+
+
+class VenueRate(models.Model):
+    """
+    Tarif khusus per jam untuk jendela waktu tertentu (mis. jam sibuk) pada
+    jenis hari tertentu. Di luar jendela yang diatur berlaku ``Venue.price``.
+    ``end_time`` 00:00 berarti sampai akhir hari. Lihat venue/pricing.py.
+    """
+    DAY_WEEKDAY = 'weekday'
+    DAY_WEEKEND = 'weekend'
+    DAY_HOLIDAY = 'holiday'
+    DAY_TYPE_CHOICES = [
+        (DAY_WEEKDAY, 'Hari Kerja'),
+        (DAY_WEEKEND, 'Akhir Pekan'),
+        (DAY_HOLIDAY, 'Hari Libur'),
+    ]
+
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='rates')
+    day_type = models.CharField(max_length=10, choices=DAY_TYPE_CHOICES)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    price_per_hour = models.PositiveIntegerField()
+
+    class Meta:
+        ordering = ['venue', 'day_type', 'start_time']
+
+    def __str__(self):
+        return f"{self.venue_id} {self.day_type} {self.start_time}-{self.end_time}: {self.price_per_hour}"
+
+    def clean(self):
+        if self.end_time != time(0) and self.end_time <= self.start_time:
+            raise ValidationError("Waktu selesai tarif harus setelah waktu mulai")
+
+
+class VenueOperatingHours(models.Model):
+    """
+    Jam buka venue per hari dalam seminggu. Hari tanpa baris memakai jam
+    default (07:00 - 22:00). ``close_time`` 00:00 berarti sampai tengah malam
+    (venue 24 jam: buka 00:00, tutup 00:00); booking tidak melewati tengah
+    malam.
+    """
+    WEEKDAY_CHOICES = [
+        (0, 'Senin'), (1, 'Selasa'), (2, 'Rabu'), (3, 'Kamis'),
+        (4, 'Jumat'), (5, 'Sabtu'), (6, 'Minggu'),
+    ]
+
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='operating_hours')
+    weekday = models.PositiveSmallIntegerField(choices=WEEKDAY_CHOICES)
+    open_time = models.TimeField(default=time(7))
+    close_time = models.TimeField(default=time(22))
+    is_closed = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ['venue', 'weekday']
+        constraints = [
+            models.UniqueConstraint(fields=['venue', 'weekday'], name='unique_venue_weekday_hours'),
+        ]
+
+    def __str__(self):
+        if self.is_closed:
+            return f"{self.venue_id} {self.get_weekday_display()}: tutup"
+        return f"{self.venue_id} {self.get_weekday_display()}: {self.open_time}-{self.close_time}"
+
+    def clean(self):
+        if not self.is_closed and self.close_time != time(0) and self.close_time <= self.open_time:
+            raise ValidationError("Jam tutup harus setelah jam buka")
+
+
+class Holiday(models.Model):
+    """Tanggal libur nasional; tarif ``holiday`` berlaku pada tanggal ini."""
+    date = models.DateField(unique=True)
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        ordering = ['date']
+
+    def __str__(self):
+        return f"{self.date} {self.name}"
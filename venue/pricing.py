@@ -0,0 +1,211 @@
+"""
+Mesin harga booking venue.
+
+Tarif per venue (``Venue.price`` + ``VenueRate``) dikompilasi sekali menjadi
+tabel per jenis hari (hari kerja / akhir pekan / libur) berisi prefix sum
+tarif per menit. Harga satu booking kemudian cukup ``P[selesai] - P[mulai]``
+(O(1), berapa pun panjangnya), dengan resolusi menit sehingga booking 90
+menit dihargai 1,5 jam.
+
+Tabel disimpan di cache memori proses dengan TTL pendek dan dikosongkan lewat
+signal saat venue / tarif / hari libur berubah (lihat venue/signals.py),
+mengikuti pola cache promo di promo/engine.py.
+
+``quote`` dipakai oleh ``book_venue``, ``edit_booking`` dan endpoint
+``venue:quote_price`` sehingga frontend dan server selalu sepakat.
+"""
+import threading
+import time as monotonic_time
+from dataclasses import dataclass, replace
+from datetime import date, time, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from itertools import accumulate
+
+from .models import Holiday, VenueRate
+
+MINUTES_PER_DAY = 24 * 60
+CACHE_TTL_SECONDS = 60
+CENT = Decimal('0.01')
+
+_lock = threading.Lock()
+_tables = {}                      # venue_id -> (expires_at, price, RateTable)
+_holidays = {'dates': frozenset(), 'expires_at': 0.0}
+
+
+def _minute(value, end=False):
+    minutes = value.hour * 60 + value.minute
+    return MINUTES_PER_DAY if end and minutes == 0 else minutes
+
+
+class RateTable:
+    """Prefix sum tarif per jam untuk setiap menit, per jenis hari."""
+    __slots__ = ('prefix',)
+
+    def __init__(self, base_price, rates):
+        per_minute = {day_type: [base_price] * MINUTES_PER_DAY for day_type in (
+            VenueRate.DAY_WEEKDAY, VenueRate.DAY_WEEKEND,
+        )}
+        holiday_rates = []
+        for rate in rates:
+            if rate.day_type == VenueRate.DAY_HOLIDAY:
+                holiday_rates.append(rate)
+                continue
+            self._fill(per_minute[rate.day_type], rate)
+
+        # Hari libur tanpa tarif khusus mengikuti tarif akhir pekan.
+        per_minute[VenueRate.DAY_HOLIDAY] = list(per_minute[VenueRate.DAY_WEEKEND])
+        for rate in holiday_rates:
+            self._fill(per_minute[VenueRate.DAY_HOLIDAY], rate)
+
+        self.prefix = {
+            day_type: [0, *accumulate(values)] for day_type, values in per_minute.items()
+        }
+
+    @staticmethod
+    def _fill(values, rate):
+        start, end = _minute(rate.start_time), _minute(rate.end_time, end=True)
+        values[start:end] = [rate.price_per_hour] * (end - start)
+
+    def price(self, day_type, start_minute, end_minute):
+        """Harga (Decimal, 2 desimal) untuk rentang menit ``[start, end)``."""
+        prefix = self.prefix[day_type]
+        total = Decimal(prefix[end_minute] - prefix[start_minute]) / 60
+        return total.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+@dataclass(frozen=True)
+class Quote:
+    venue_id: object
+    booking_date: date
+    start_time: time
+    end_time: time
+    day_type: str
+    minutes: int
+    subtotal: Decimal
+    discount: Decimal = Decimal('0.00')
+    promo_code: str = ''
+
+    @property
+    def total(self):
+        return self.subtotal - self.discount
+
+    @property
+    def duration_hours(self):
+        return self.minutes / 60
+
+    def with_discount_percent(self, percent, promo_code=''):
+        discount = (self.subtotal * percent / 100).quantize(CENT, rounding=ROUND_HALF_UP)
+        return replace(self, discount=discount, promo_code=promo_code)
+
+    def with_promo(self, result):
+        """Terapkan ``PromoResult`` yang valid (lihat promo/engine.py)."""
+        if not result.valid:
+            return self
+        return replace(self, discount=result.discount_for(self.subtotal), promo_code=result.code)
+
+    def to_dict(self):
+        return {
+            'venue_id': str(self.venue_id),
+            'booking_date': self.booking_date.isoformat(),
+            'start_time': self.start_time.strftime('%H:%M'),
+            'end_time': self.end_time.strftime('%H:%M'),
+            'day_type': self.day_type,
+            'duration_hours': self.duration_hours,
+            'subtotal': float(self.subtotal),
+            'discount': float(self.discount),
+            'total': float(self.total),
+            'promo_code': self.promo_code,
+        }
+
+
+def invalidate(venue_id=None):
+    """Kosongkan tabel tarif satu venue (atau semua venue)."""
+    with _lock:
+        if venue_id is None:
+            _tables.clear()
+        else:
+            _tables.pop(venue_id, None)
+
+
+def invalidate_holidays():
+    with _lock:
+        _holidays['expires_at'] = 0.0
+
+
+def holiday_dates():
+    with _lock:
+        if _holidays['expires_at'] > monotonic_time.monotonic():
+            return _holidays['dates']
+        dates = frozenset(Holiday.objects.values_list('date', flat=True))
+        _holidays.update(dates=dates, expires_at=monotonic_time.monotonic() + CACHE_TTL_SECONDS)
+        return dates
+
+
+def day_type_for(booking_date, holidays=None):
+    if booking_date in (holiday_dates() if holidays is None else holidays):
+        return VenueRate.DAY_HOLIDAY
+    return VenueRate.DAY_WEEKEND if booking_date.weekday() >= 5 else VenueRate.DAY_WEEKDAY
+
+
+def rate_tables(venues):
+    """
+    Tabel tarif untuk banyak venue sekaligus; venue yang belum ada di cache
+    dikompilasi dari satu query ``VenueRate``. Mengembalikan dict venue_id -> tabel.
+    """
+    now = monotonic_time.monotonic()
+    tables, missing = {}, []
+    with _lock:
+        for venue in venues:
+            cached = _tables.get(venue.pk)
+            # Harga dasar ikut dicek supaya objek venue yang baru diubah tidak
+            # memakai tabel lama dari proses ini.
+            if cached and cached[0] > now and cached[1] == venue.price:
+                tables[venue.pk] = cached[2]
+            else:
+                missing.append(venue)
+    if not missing:
+        return tables
+
+    rates = {}
+    for rate in VenueRate.objects.filter(venue__in=[venue.pk for venue in missing]).order_by('start_time'):
+        rates.setdefault(rate.venue_id, []).append(rate)
+
+    with _lock:
+        for venue in missing:
+            table = RateTable(venue.price, rates.get(venue.pk, ()))
+            _tables[venue.pk] = (now + CACHE_TTL_SECONDS, venue.price, table)
+            tables[venue.pk] = table
+    return tables
+
+
+def quote(venue, booking_date, start_time, end_time, table=None, holidays=None):
+    """Harga booking ``venue`` pada ``booking_date`` dari ``start_time`` sampai ``end_time``."""
+    start, end = _minute(start_time), _minute(end_time, end=True)
+    if end <= start:
+        raise ValueError("Waktu selesai harus setelah waktu mulai")
+    table = table or rate_tables([venue])[venue.pk]
+    day_type = day_type_for(booking_date, holidays)
+    return Quote(
+        venue_id=venue.pk,
+        booking_date=booking_date,
+        start_time=start_time,
+        end_time=end_time,
+        day_type=day_type,
+        minutes=end - start,
+        subtotal=table.price(day_type, start, end),
+    )
+
+
+def quote_range(venues, start_date, start_time, end_time, days=7):
+    """
+    Harga slot yang sama untuk banyak venue selama ``days`` hari; dipakai
+    untuk membandingkan harga seminggu. Mengembalikan dict venue_id -> [Quote].
+    """
+    venues = list(venues)
+    tables = rate_tables(venues)
+    holidays = holiday_dates()
+    dates = [start_date + timedelta(days=offset) for offset in range(days)]
+    return {
+        venue.pk: [quote(venue, day, start_time, end_time, tables[venue.pk], holidays) for day in dates]
+        for venue in venues
+    }
@@ -0,0 +1,152 @@
+"""
+Proxy + cache lokal untuk gambar venue dari host eksternal (``image_url``).
+
+``Venue.get_image_url`` mengarah ke ``venue:venue_image`` alih-alih hotlink.
+View tersebut:
+- melayani salinan lokal (sudah di-resize, JPEG) dengan Cache-Control panjang
+  jika gambar sudah diambil;
+- mengalihkan ke placeholder jika link mati (404/410 atau gagal berulang);
+- selain itu menjadwalkan pengambilan di worker latar belakang
+  (main/tasks.py) dan sementara mengalihkan ke URL asli.
+
+Status setiap link dicatat di ``RemoteImage``. Kegagalan sementara dicoba
+lagi dengan backoff eksponensial; ``prefetch_venue_images`` mengambil semua
+gambar venue hasil import sekaligus.
+"""
+import logging
+from datetime import timedelta
+from io import BytesIO
+
+import requests
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from main.tasks import run_in_background
+
+from .models import RemoteImage
+
+logger = logging.getLogger(__name__)
+
+STORAGE_ROOT = 'remote_images'
+FETCH_TIMEOUT_SECONDS = 10
+MAX_BYTES = 5 * 1024 * 1024
+MAX_WIDTH = 800
+JPEG_QUALITY = 82
+MAX_FAILURES = 5
+FETCH_LEASE = timedelta(minutes=5)
+REFRESH_AFTER = timedelta(days=30)
+MAX_BACKOFF = timedelta(days=7)
+DEAD_HTTP_STATUSES = {404, 410}
+USER_AGENT = 'VenYuk-ImageProxy/1.0'
+
+
+class FetchError(Exception):
+    def __init__(self, message, http_status=None):
+        super().__init__(message)
+        self.http_status = http_status
+
+
+def track(url):
+    """``RemoteImage`` untuk ``url`` (dibuat jika belum ada)."""
+    remote, _ = RemoteImage.objects.get_or_create(url_hash=RemoteImage.hash_url(url), defaults={'url': url})
+    return remote
+
+
+def claim(remote):
+    """
+    Ambil "lease" pengambilan untuk ``remote``: hanya satu worker yang
+    mendapatkannya selama ``FETCH_LEASE`` (UPDATE bersyarat).
+    """
+    now = timezone.now()
+    return bool(
+        RemoteImage.objects.filter(pk=remote.pk, next_check_at__lte=now)
+        .exclude(status=RemoteImage.STATUS_DEAD)
+        .update(next_check_at=now + FETCH_LEASE)
+    )
+
+
+def schedule_fetch(remote):
+    if claim(remote):
+        run_in_background(fetch_remote_image, remote.pk)
+        return True
+    return False
+
+
+def prefetch(url):
+    """Ambil gambar ``url`` sekarang (di thread pemanggil) jika belum ada salinan lokal."""
+    remote = track(url)
+    if remote.status != RemoteImage.STATUS_OK and claim(remote):
+        return fetch_remote_image(remote.pk)
+    return remote.status
+
+
+def _download(url):
+    try:
+        with requests.get(url, stream=True, timeout=FETCH_TIMEOUT_SECONDS,
+                          headers={'User-Agent': USER_AGENT}) as response:
+            if response.status_code >= 400:
+                raise FetchError(f"HTTP {response.status_code}", response.status_code)
+            data = BytesIO()
+            for chunk in response.iter_content(64 * 1024):
+                data.write(chunk)
+                if data.tell() > MAX_BYTES:
+                    raise FetchError("Gambar terlalu besar", response.status_code)
+            return response.status_code, data.getvalue()
+    except requests.RequestException as exc:
+        raise FetchError(str(exc)[:255]) from exc
+
+
+def _render(data):
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        image = ImageOps.exif_transpose(Image.open(BytesIO(data)))
+        image = image.convert('RGB')
+    except (UnidentifiedImageError, OSError) as exc:
+        raise FetchError("Bukan file gambar yang valid") from exc
+    if image.width > MAX_WIDTH:
+        image = image.resize((MAX_WIDTH, max(1, round(image.height * MAX_WIDTH / image.width))), Image.LANCZOS)
+    buffer = BytesIO()
+    image.save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return image.size, buffer.getvalue()
+
+
+def fetch_remote_image(remote_id):
+    """Ambil, resize dan simpan satu gambar. Mengembalikan status akhirnya."""
+    remote = RemoteImage.objects.get(pk=remote_id)
+    now = timezone.now()
+    try:
+        http_status, data = _download(remote.url)
+        (width, height), content = _render(data)
+    except FetchError as exc:
+        failures = remote.failure_count + 1
+        dead = exc.http_status in DEAD_HTTP_STATUSES or failures >= MAX_FAILURES
+        RemoteImage.objects.filter(pk=remote.pk).update(
+            status=RemoteImage.STATUS_DEAD if dead else RemoteImage.STATUS_FAILED,
+            http_status=exc.http_status,
+            failure_count=failures,
+            last_error=str(exc)[:255],
+            last_checked_at=now,
+            next_check_at=now + min(timedelta(hours=2 ** failures), MAX_BACKOFF),
+        )
+        logger.info("Gagal mengambil gambar %s: %s", remote.url, exc)
+        return RemoteImage.STATUS_DEAD if dead else RemoteImage.STATUS_FAILED
+
+    path = f"{STORAGE_ROOT}/{remote.url_hash[:2]}/{remote.url_hash}.jpg"
+    if default_storage.exists(path):
+        default_storage.delete(path)
+    path = default_storage.save(path, ContentFile(content))
+
+    RemoteImage.objects.filter(pk=remote.pk).update(
+        status=RemoteImage.STATUS_OK,
+        http_status=http_status,
+        local_path=path,
+        width=width,
+        height=height,
+        failure_count=0,
+        last_error='',
+        last_checked_at=now,
+        next_check_at=now + REFRESH_AFTER,
+    )
+    return RemoteImage.STATUS_OK
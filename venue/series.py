@@ -0,0 +1,145 @@
+"""
+Booking rutin (``BookingSeries``).
+
+Semua kejadian sebuah series dicek sekaligus: satu query overlap untuk
+seluruh tanggal (``booking_date IN (...)`` + rentang jam, memakai index
+``venue, booking_date, status``) menggantikan satu cek per kejadian. Harga
+dihitung dari tabel tarif yang sama (venue/pricing.py) dan booking dibuat
+dengan satu ``bulk_create`` di dalam satu transaksi.
+
+Jika ada kejadian yang bentrok, series tidak dibuat kecuali pemanggil
+memilih ``skip_conflicts``; dalam hal itu hanya kejadian yang bebas yang
+dibooking. Hasil per kejadian dilaporkan di ``SeriesResult.occurrences``.
+"""
+from dataclasses import dataclass
+
+from django.db import transaction
+
+from .analytics import rebuild_daily_stats
+from .availability import bookings_changed
+from .lifecycle import blocking_q
+from .models import Booking, BookingSeries
+from .pricing import holiday_dates, quote, rate_tables
+from .slots import validate_booking_window
+from .stats import rebuild_booking_stats
+
+STATUS_CREATED = 'created'
+STATUS_CONFLICT = 'conflict'
+STATUS_SKIPPED = 'skipped'
+
+
+@dataclass
+class Occurrence:
+    booking_date: object
+    quote: object
+    # Daftar (start_time, end_time) booking lain yang bentrok.
+    conflicts: tuple = ()
+    status: str = ''
+
+    def to_dict(self):
+        return {
+            'booking_date': self.booking_date.isoformat(),
+            'status': self.status,
+            'price': float(self.quote.subtotal),
+            'conflicts': [
+                {'start_time': start.strftime('%H:%M'), 'end_time': end.strftime('%H:%M')}
+                for start, end in self.conflicts
+            ],
+        }
+
+
+@dataclass
+class SeriesResult:
+    series: BookingSeries | None
+    occurrences: list
+
+    @property
+    def created(self):
+        return [item for item in self.occurrences if item.status == STATUS_CREATED]
+
+    @property
+    def conflicts(self):
+        return [item for item in self.occurrences if item.conflicts]
+
+    @property
+    def total_price(self):
+        return sum((item.quote.subtotal for item in self.created), start=0)
+
+
+def find_conflicts(venue, dates, start_time, end_time, now=None):
+    """
+    Booking yang masih menahan slot dan overlap dengan ``start_time`` -
+    ``end_time`` pada salah satu ``dates``, dalam satu query. Mengembalikan
+    dict tanggal -> [(start_time, end_time), ...].
+    """
+    rows = Booking.objects.filter(
+        blocking_q(now),
+        venue=venue,
+        booking_date__in=list(dates),
+        start_time__lt=end_time,
+        end_time__gt=start_time,
+    ).order_by('booking_date', 'start_time').values_list('booking_date', 'start_time', 'end_time')
+
+    conflicts = {}
+    for booking_date, start, end in rows:
+        conflicts.setdefault(booking_date, []).append((start, end))
+    return conflicts
+
+
+def plan_series(series):
+    """Kejadian ``series`` beserta harga dan bentroknya (belum disimpan)."""
+    dates = series.occurrence_dates()
+    table = rate_tables([series.venue])[series.venue.pk]
+    holidays = holiday_dates()
+    conflicts = find_conflicts(series.venue, dates, series.start_time, series.end_time)
+    return [
+        Occurrence(
+            booking_date=day,
+            quote=quote(series.venue, day, series.start_time, series.end_time, table, holidays),
+            conflicts=tuple(conflicts.get(day, ())),
+        )
+        for day in dates
+    ]
+
+
+def create_series(user, venue, start_date, start_time, end_time, occurrences,
+                  interval_weeks=1, skip_conflicts=False):
+    """
+    Buat series beserta seluruh booking-nya. Raise ``ValidationError`` jika
+    input tidak valid. Jika ada bentrok dan ``skip_conflicts`` False, tidak ada
+    yang disimpan dan ``SeriesResult.series`` bernilai None.
+    """
+    series = BookingSeries(
+        user=user, venue=venue, start_date=start_date, start_time=start_time,
+        end_time=end_time, occurrences=occurrences, interval_weeks=interval_weeks,
+    )
+    series.clean()
+    validate_booking_window(venue, start_date, start_time, end_time)
+
+    with transaction.atomic():
+        planned = plan_series(series)
+        free = [item for item in planned if not item.conflicts]
+        if not free or (len(free) < len(planned) and not skip_conflicts):
+            for item in planned:
+                item.status = STATUS_CONFLICT if item.conflicts else ''
+            return SeriesResult(None, planned)
+
+        series.save()
+        Booking.objects.bulk_create([
+            Booking(
+                user=user, venue=venue, series=series, booking_date=item.booking_date,
+                start_time=start_time, end_time=end_time,
+                total_price=item.quote.subtotal, status='pending',
+            )
+            for item in free
+        ])
+        # bulk_create melewati signal, jadi statistik user, rollup harian dan
+        # ketersediaan venue dihitung ulang.
+        keys = {(venue.pk, item.booking_date) for item in free}
+        rebuild_booking_stats([user.pk])
+        rebuild_daily_stats(keys, venues=[venue])
+        bookings_changed(keys)
+
+    for item in planned:
+        item.status = STATUS_SKIPPED if item.conflicts else STATUS_CREATED
+    return SeriesResult(series, planned)
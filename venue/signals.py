@@ -0,0 +1,74 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from main.tasks import run_after_commit
+from main.thumbnails import track_image_field
+
+from promo.models import PromoRedemption
+
+from . import analytics, availability, pricing, slots, stats
+from .models import Booking, Holiday, Venue, VenueOperatingHours, VenueRate
+from .remote_images import prefetch
+
+track_image_field(Venue, 'thumbnail')
+
+
+@receiver(post_save, sender=Venue)
+def prefetch_venue_image(sender, instance, **kwargs):
+    if instance.image_url and not instance.thumbnail:
+        run_after_commit(prefetch, instance.image_url)
+
+
+@receiver(post_init, sender=Booking)
+def remember_booking_state(sender, instance, **kwargs):
+    stats.snapshot(instance)
+    analytics.snapshot(instance)
+
+
+@receiver(post_save, sender=Booking)
+def update_booking_stats(sender, instance, created, **kwargs):
+    stats.apply_booking_change(instance, created)
+    availability.bookings_changed(analytics.booking_changed(instance))
+
+
+@receiver(post_delete, sender=Booking)
+def remove_booking_stats(sender, instance, **kwargs):
+    stats.remove_booking(instance)
+    key = (instance.venue_id, instance.booking_date)
+    analytics.rebuild_daily_stats([key])
+    availability.bookings_changed([key])
+
+
+@receiver(post_save, sender=PromoRedemption)
+def update_daily_promo_discount(sender, instance, **kwargs):
+    if instance.booking_id:
+        key = Booking.objects.filter(pk=instance.booking_id).values_list('venue_id', 'booking_date').first()
+        if key:
+            analytics.rebuild_daily_stats([key])
+
+
+@receiver([post_save, post_delete], sender=Venue)
+def invalidate_venue_pricing(sender, instance, **kwargs):
+    pricing.invalidate(instance.pk)
+    slots.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Venue)
+def refresh_venue_availability(sender, instance, **kwargs):
+    availability.venue_changed(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=VenueOperatingHours)
+def invalidate_venue_slots(sender, instance, **kwargs):
+    slots.invalidate(instance.venue_id)
+    availability.venue_changed(instance.venue_id)
+
+
+@receiver([post_save, post_delete], sender=VenueRate)
+def invalidate_rate_pricing(sender, instance, **kwargs):
+    pricing.invalidate(instance.venue_id)
+
+
+@receiver([post_save, post_delete], sender=Holiday)
+def invalidate_holiday_pricing(sender, instance, **kwargs):
+    pricing.invalidate_holidays()
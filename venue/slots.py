@@ -0,0 +1,160 @@
+"""
+Jam operasional dan template slot harian per venue.
+
+Jam buka per hari (``VenueOperatingHours``) dan ukuran slot
+(``Venue.slot_minutes``) dikompilasi sekali menjadi ``SlotTemplate`` per hari
+dalam seminggu: label jam setiap batas slot dan bitmask seluruh slot.
+Ketersediaan satu tanggal cukup dihitung dengan menutup (mask) bit slot yang
+terisi booking, tanpa membangun ulang daftar jam setiap request.
+
+Template disimpan di cache memori proses dengan TTL pendek dan dikosongkan
+lewat signal saat venue / jam operasional berubah (lihat venue/signals.py),
+mengikuti pola tabel tarif di venue/pricing.py.
+"""
+import threading
+import time as monotonic_time
+from datetime import time
+
+from django.core.exceptions import ValidationError
+
+from .models import VenueOperatingHours, format_minutes
+
+MINUTES_PER_DAY = 24 * 60
+CACHE_TTL_SECONDS = 60
+DEFAULT_OPEN = time(7)
+DEFAULT_CLOSE = time(22)
+
+_lock = threading.Lock()
+_templates = {}                   # venue_id -> (expires_at, slot_minutes, {weekday: SlotTemplate})
+
+
+def _minute(value, end=False):
+    minutes = value.hour * 60 + value.minute
+    return MINUTES_PER_DAY if end and minutes == 0 else minutes
+
+
+def _label(minute):
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+class SlotTemplate:
+    """Slot satu hari: ``labels[i]`` adalah jam mulai slot ke-i, ditambah jam tutup."""
+    __slots__ = ('open_minute', 'end_minute', 'slot_minutes', 'labels', 'full_mask')
+
+    def __init__(self, open_minute, close_minute, slot_minutes):
+        count = max(0, (close_minute - open_minute) // slot_minutes)
+        # Batas 24:00 tidak bisa disimpan di TimeField, jadi slot terakhir
+        # venue yang tutup tengah malam tidak ditawarkan.
+        if count and open_minute + count * slot_minutes >= MINUTES_PER_DAY:
+            count -= 1
+        self.open_minute = open_minute
+        self.end_minute = open_minute + count * slot_minutes
+        self.slot_minutes = slot_minutes
+        boundaries = range(open_minute, self.end_minute + 1, slot_minutes)
+        self.labels = tuple(_label(minute) for minute in boundaries) if count else ()
+        self.full_mask = (1 << count) - 1
+
+    @property
+    def closed(self):
+        return not self.full_mask
+
+    @property
+    def slot_count(self):
+        return self.full_mask.bit_length()
+
+    def occupied_mask(self, intervals):
+        """Bitmask slot yang overlap dengan salah satu ``(start_time, end_time)``."""
+        mask = 0
+        for start_time, end_time in intervals:
+            start = max(_minute(start_time), self.open_minute)
+            end = min(_minute(end_time, end=True), self.end_minute)
+            if end <= start:
+                continue
+            first = (start - self.open_minute) // self.slot_minutes
+            last = -(-(end - self.open_minute) // self.slot_minutes)
+            mask |= ((1 << (last - first)) - 1) << first
+        return mask & self.full_mask
+
+    def free_labels(self, intervals):
+        """Jam mulai slot yang masih kosong, ditambah jam tutup (batas akhir)."""
+        if self.closed:
+            return []
+        free = self.full_mask & ~self.occupied_mask(intervals)
+        return [self.labels[i] for i in range(self.slot_count) if free >> i & 1] + [self.labels[-1]]
+
+    def contains(self, start_time, end_time):
+        """Apakah rentang waktu berada di dalam jam operasional."""
+        return not self.closed and self.open_minute <= _minute(start_time) and _minute(end_time) <= self.end_minute
+
+
+def invalidate(venue_id=None):
+    """Kosongkan template satu venue (atau semua venue)."""
+    with _lock:
+        if venue_id is None:
+            _templates.clear()
+        else:
+            _templates.pop(venue_id, None)
+
+
+def _compile(venue, hours):
+    by_weekday = {row.weekday: row for row in hours}
+    templates = {}
+    for weekday in range(7):
+        row = by_weekday.get(weekday)
+        if row is not None and row.is_closed:
+            templates[weekday] = SlotTemplate(0, 0, venue.slot_minutes)
+            continue
+        open_time, close_time = (row.open_time, row.close_time) if row else (DEFAULT_OPEN, DEFAULT_CLOSE)
+        templates[weekday] = SlotTemplate(
+            _minute(open_time), _minute(close_time, end=True), venue.slot_minutes,
+        )
+    return templates
+
+
+def weekly_templates(venues):
+    """Template per hari untuk banyak venue sekaligus (satu query untuk yang belum di-cache)."""
+    now = monotonic_time.monotonic()
+    result, missing = {}, []
+    with _lock:
+        for venue in venues:
+            cached = _templates.get(venue.pk)
+            if cached and cached[0] > now and cached[1] == venue.slot_minutes:
+                result[venue.pk] = cached[2]
+            else:
+                missing.append(venue)
+    if not missing:
+        return result
+
+    hours = {}
+    for row in VenueOperatingHours.objects.filter(venue__in=[venue.pk for venue in missing]):
+        hours.setdefault(row.venue_id, []).append(row)
+
+    with _lock:
+        for venue in missing:
+            templates = _compile(venue, hours.get(venue.pk, ()))
+            _templates[venue.pk] = (now + CACHE_TTL_SECONDS, venue.slot_minutes, templates)
+            result[venue.pk] = templates
+    return result
+
+
+def day_template(venue, booking_date):
+    return weekly_templates([venue])[venue.pk][booking_date.weekday()]
+
+
+def validate_booking_window(venue, booking_date, start_time, end_time):
+    """
+    Raise ``ValidationError`` jika venue tutup pada ``booking_date``, rentang
+    waktu di luar jam operasional, atau durasi di luar batas venue.
+    """
+    template = day_template(venue, booking_date)
+    if template.closed:
+        raise ValidationError("Venue tutup pada tanggal tersebut")
+    if not template.contains(start_time, end_time):
+        raise ValidationError(
+            f"Jam operasional venue {template.labels[0]} - {template.labels[-1]}"
+        )
+    minutes = _minute(end_time, end=True) - _minute(start_time)
+    if minutes < venue.min_booking_minutes:
+        raise ValidationError(f"Durasi booking minimal {format_minutes(venue.min_booking_minutes)}")
+    if minutes > venue.max_booking_minutes:
+        raise ValidationError(f"Durasi booking maksimal {format_minutes(venue.max_booking_minutes)}")
@@ -0,0 +1,131 @@
+"""
+Pemeliharaan ``UserBookingStats``.
+
+Setiap ``Booking`` mengingat status dan harga saat dimuat (post_init).
+Setelah disimpan, selisihnya diterapkan ke baris statistik user dengan satu
+``UPDATE ... SET x = x + n`` sehingga aman untuk penulis bersamaan. Jika baris
+statistik belum ada, baris tersebut dibangun ulang dari tabel booking.
+
+Perubahan yang melewati signal (mis. ``QuerySet.update``) harus memanggil
+``rebuild_booking_stats`` untuk user yang terdampak.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import Count, F, Max, Sum
+
+from .models import Booking, UserBookingStats
+
+STATS_FIELDS = ['pending_count', 'confirmed_count', 'cancelled_count', 'completed_count',
+                'expired_count', 'total_spent', 'last_booking_at']
+
+
+def _status_field(status):
+    return f'{status}_count'
+
+
+def snapshot(booking):
+    """Simpan status / harga saat ini sebagai pembanding perubahan berikutnya."""
+    booking._stats_snapshot = (booking.__dict__.get('status'), booking.__dict__.get('total_price'))
+
+
+def _contribution(status, price):
+    """Kontribusi satu booking: (field jumlah, nilai untuk total_spent)."""
+    spend = Decimal(price or 0) if status in UserBookingStats.SPEND_STATUSES else Decimal('0')
+    return _status_field(status), spend
+
+
+def apply_booking_change(booking, created):
+    """Terapkan perubahan ``booking`` (baru atau status/harga berubah) ke statistik user."""
+    deltas = defaultdict(int)
+    spend = Decimal('0')
+
+    old_status, old_price = getattr(booking, '_stats_snapshot', (None, None))
+    if not created and old_status is None:
+        # Status lama tidak diketahui (field di-defer saat dimuat).
+        snapshot(booking)
+        rebuild_booking_stats([booking.user_id])
+        return
+    if not created:
+        field, value = _contribution(old_status, old_price)
+        deltas[field] -= 1
+        spend -= value
+
+    field, value = _contribution(booking.status, booking.total_price)
+    deltas[field] += 1
+    spend += value
+    snapshot(booking)
+
+    updates = {name: F(name) + delta for name, delta in deltas.items() if delta}
+    if spend:
+        updates['total_spent'] = F('total_spent') + spend
+    if created:
+        updates['last_booking_at'] = booking.created_at
+    if not updates:
+        return
+
+    if not UserBookingStats.objects.filter(user_id=booking.user_id).update(**updates):
+        rebuild_booking_stats([booking.user_id])
+
+
+def remove_booking(booking):
+    """
+    Kurangi kontribusi booking yang dihapus. Tidak membuat baris baru (user
+    bisa saja sedang ikut dihapus); ``last_booking_at`` tidak dimundurkan.
+    """
+    old_status, old_price = getattr(booking, '_stats_snapshot', (booking.status, booking.total_price))
+    field, value = _contribution(old_status or booking.status, old_price)
+    UserBookingStats.objects.filter(user_id=booking.user_id).update(
+        **{field: F(field) - 1, 'total_spent': F('total_spent') - value},
+    )
+
+
+def rebuild_booking_stats(user_ids=None):
+    """
+    Hitung ulang statistik dari tabel booking dengan satu query agregat lalu
+    upsert. ``user_ids=None`` berarti semua user yang punya booking.
+    Mengembalikan jumlah baris yang ditulis.
+    """
+    bookings = Booking.objects.order_by()
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        bookings = bookings.filter(user_id__in=user_ids)
+
+    rows = {user_id: UserBookingStats(user_id=user_id) for user_id in (user_ids or [])}
+    aggregates = bookings.values('user_id', 'status').annotate(
+        n=Count('id'), spend=Sum('total_price'), last=Max('created_at'),
+    )
+    for row in aggregates:
+        stats = rows.setdefault(row['user_id'], UserBookingStats(user_id=row['user_id']))
+        field, _ = _contribution(row['status'], 0)
+        if hasattr(stats, field):
+            setattr(stats, field, row['n'])
+        if row['status'] in UserBookingStats.SPEND_STATUSES:
+            stats.total_spent += row['spend'] or 0
+        if stats.last_booking_at is None or row['last'] > stats.last_booking_at:
+            stats.last_booking_at = row['last']
+
+    UserBookingStats.objects.bulk_create(
+        rows.values(), update_conflicts=True, unique_fields=['user'], update_fields=STATS_FIELDS,
+    )
+    return len(rows)
+
+
+def get_booking_stats(user):
+    """Statistik ``user``; objek kosong (tidak disimpan) jika belum pernah booking."""
+    try:
+        return user.booking_stats
+    except UserBookingStats.DoesNotExist:
+        return UserBookingStats(user=user)
+
+
+def attach_booking_stats(users):
+    """
+    Muat statistik banyak user sekaligus (satu query) dan pasang ke
+    ``user.booking_stats`` sehingga ``get_booking_stats`` tidak query lagi.
+    """
+    users = list(users)
+    found = UserBookingStats.objects.in_bulk([user.pk for user in users])
+    for user in users:
+        user.booking_stats = found.get(user.pk) or UserBookingStats(user=user)
+    return users
@@ -1,3 +1,835 @@
-from django.test import TestCase
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.core import mail
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from main.models import CustomUser
+from promo import engine
+from promo.engine import reserve_promo, validate_promo_code
+from promo.models import Promo
+from venue import pricing, slots
+from venue.availability import refresh_availability
+from venue.models import (
+    Venue, Booking, BookingSeries, Holiday, UserBookingStats, VenueDailyStats, VenueOperatingHours, VenueRate,
+    WaitlistEntry,
+)
+from venue.history import get_booking_page
+from venue.lifecycle import InvalidTransition, blocking_q
+from venue.stats import STATS_FIELDS, attach_booking_stats, get_booking_stats
+
+
+class BookVenuePromoTest(TestCase):
+    def setUp(self):
+        engine.invalidate_cache()
+        self.user = User.objects.create_user(username='penyewa', password='testpass123')
+        self.client = Client()
+        self.client.login(username='penyewa', password='testpass123')
+        self.venue = Venue.objects.create(name='Lapangan A', category='futsal', price=100000)
+        self.tomorrow = timezone.localdate() + timedelta(days=1)
+        self.promo = Promo.objects.create(
+            title='Promo Venue', description='-', amount_discount=10, category='venue',
+            max_uses=1, start_date=timezone.localdate(), end_date=self.tomorrow,
+        )
+
+    def book(self, start, end, promo_code=''):
+        return self.client.post(reverse('venue:book_venue', args=[self.venue.id]), {
+            'booking_date': self.tomorrow.strftime('%Y-%m-%d'),
+            'start_time': start,
+            'end_time': end,
+            'promo_code': promo_code,
+        })
+
+    def test_booking_applies_promo_and_consumes_quota(self):
+        response = self.book('10:00', '12:00', self.promo.code.lower())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Booking.objects.get().total_price, Decimal('180000.00'))
+        self.promo.refresh_from_db()
+        self.assertEqual(self.promo.max_uses, 0)
+
+        self.book('13:00', '14:00', self.promo.code)
+        self.assertEqual(Booking.objects.get(start_time='13:00').total_price, Decimal('100000.00'))
+
+    def test_booking_ignores_shop_promo(self):
+        self.promo.category = 'shop'
+        self.promo.save()
+        self.book('10:00', '11:00', self.promo.code)
+        self.assertEqual(Booking.objects.get().total_price, Decimal('100000.00'))
+
+    def test_cancel_booking_releases_promo_quota(self):
+        self.book('10:00', '11:00', self.promo.code)
+        booking = Booking.objects.get()
+        self.assertEqual(booking.promo_redemptions.get().status, 'reserved')
+
+        for _ in range(2):
+            response = self.client.post(reverse('venue:cancel_booking', args=[booking.id]))
+        self.assertEqual(booking.promo_redemptions.get().status, 'released')
+        self.promo.refresh_from_db()
+        self.assertEqual(self.promo.max_uses, 1)
+
+
+class RemoteImageProxyTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from io import BytesIO
+        from PIL import Image
+
+        buffer = BytesIO()
+        Image.new('RGB', (1600, 1200), (10, 120, 200)).save(buffer, 'PNG')
+        image_bytes = buffer.getvalue()
+
+        class Origin(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/lapangan.png':
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'image/png')
+                    self.end_headers()
+                    self.wfile.write(image_bytes)
+                elif self.path == '/error.png':
+                    self.send_error(500)
+                else:
+                    self.send_error(404)
+
+            def log_message(self, *args):
+                pass
+
+        cls.origin = ThreadingHTTPServer(('127.0.0.1', 0), Origin)
+        threading.Thread(target=cls.origin.serve_forever, daemon=True).start()
+        cls.base_url = f'http://127.0.0.1:{cls.origin.server_port}'
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.origin.shutdown()
+        cls.origin.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        import tempfile
+        from django.test import override_settings
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root, BACKGROUND_TASKS_EAGER=True)
+        self.override.enable()
+
+    def tearDown(self):
+        import shutil
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def venue(self, path):
+        return Venue.objects.create(name='Impor', category='futsal', price=1, image_url=f'{self.base_url}{path}')
+
+    def test_proxy_fetches_resizes_and_serves_with_long_cache(self):
+        from venue.models import RemoteImage
+        venue = self.venue('/lapangan.png')
+        url = venue.get_image_url()
+        self.assertTrue(url.startswith(reverse('venue:venue_image', args=[venue.id])))
+
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 302)
+        self.assertEqual(first['Location'], venue.image_url)
+
+        remote = RemoteImage.objects.get()
+        self.assertEqual((remote.status, remote.width, remote.height), ('ok', 800, 600))
+
+        second = self.client.get(url)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second['Content-Type'], 'image/jpeg')
+        self.assertIn('max-age=2592000', second['Cache-Control'])
+        self.assertTrue(b''.join(second.streaming_content).startswith(b'\xff\xd8'))
+
+    def test_dead_and_failing_links_are_tracked(self):
+        from venue.models import RemoteImage
+        from venue.remote_images import fetch_remote_image, track
+        dead = self.venue('/hilang.png')
+        self.client.get(dead.get_image_url())
+        remote = RemoteImage.objects.get(url=dead.image_url)
+        self.assertEqual((remote.status, remote.http_status), ('dead', 404))
+        response = self.client.get(dead.get_image_url())
+        self.assertTrue(response['Location'].endswith('images/placeholder.png'))
+
+        flaky = track(f'{self.base_url}/error.png')
+        self.assertEqual(fetch_remote_image(flaky.pk), 'failed')
+        flaky.refresh_from_db()
+        self.assertEqual(flaky.failure_count, 1)
+        self.assertGreater(flaky.next_check_at, timezone.now())
+
+    def test_prefetch_command_fetches_all_imported_venues(self):
+        from venue.models import RemoteImage
+        self.venue('/lapangan.png')
+        self.venue('/lapangan.png')
+        self.venue('/hilang.png')
+        out = StringIO()
+        call_command('prefetch_venue_images', '--workers', '1', stdout=out)
+        self.assertEqual(
+            dict(RemoteImage.objects.values_list('url', 'status')),
+            {f'{self.base_url}/lapangan.png': 'ok', f'{self.base_url}/hilang.png': 'dead'},
+        )
+        self.assertIn('dead: 1, ok: 1', out.getvalue())
+
+
+class UserBookingStatsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='statistik', password='testpass123')
+        self.venue = Venue.objects.create(name='Lapangan S', category='futsal', price=100000)
+        self.tomorrow = timezone.localdate() + timedelta(days=1)
+
+    def booking(self, start, price=100000, status='pending'):
+        return Booking.objects.create(
+            user=self.user, venue=self.venue, booking_date=self.tomorrow,
+            start_time=time(start), end_time=time(start + 1), total_price=price, status=status,
+        )
+
+    def stats(self):
+        return UserBookingStats.objects.get(user=self.user)
+
+    def test_counters_follow_create_status_change_and_delete(self):
+        first = self.booking(8)
+        second = self.booking(10, price=150000, status='confirmed')
+        stats = self.stats()
+        self.assertEqual((stats.pending_count, stats.confirmed_count), (1, 1))
+        self.assertEqual(stats.total_spent, Decimal('250000'))
+        self.assertEqual(stats.last_booking_at, second.created_at)
+
+        first = Booking.objects.get(pk=first.pk)
+        first.status = 'cancelled'
+        first.save()
+        stats = self.stats()
+        self.assertEqual((stats.pending_count, stats.cancelled_count), (0, 1))
+        self.assertEqual(stats.total_spent, Decimal('150000'))
+
+        second.delete()
+        stats = self.stats()
+        self.assertEqual((stats.total_count, stats.total_spent), (1, Decimal('0')))
+
+    def test_price_change_adjusts_spend(self):
+        booking = self.booking(8)
+        booking.total_price = Decimal('90000')
+        booking.save(update_fields=['total_price'])
+        self.assertEqual(self.stats().total_spent, Decimal('90000'))
+        self.assertEqual(self.stats().pending_count, 1)
+
+    def test_rebuild_matches_incremental(self):
+        self.booking(8)
+        self.booking(10, status='completed')
+        incremental = self.stats()
+        UserBookingStats.objects.all().delete()
+        call_command('rebuild_booking_stats', stdout=StringIO())
+        rebuilt = self.stats()
+        for field in STATS_FIELDS:
+            self.assertEqual(getattr(rebuilt, field), getattr(incremental, field), field)
+
+    def test_profile_and_custom_user_read_one_row(self):
+        self.booking(8)
+        profile = CustomUser.objects.create(user=self.user)
+        self.assertEqual(CustomUser.objects.get(pk=profile.pk).get_booking_count(), 1)
+
+        self.client.login(username='statistik', password='testpass123')
+        self.client.get(reverse('authenticate:profile'))  # hangatkan cache session
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('authenticate:profile'))
+        self.assertContains(response, 'Ringkasan Booking')
+        self.assertFalse([q for q in queries if 'venue_booking' in q['sql']])
+
+    def test_attach_booking_stats_uses_one_query(self):
+        self.booking(8)
+        other = User.objects.create_user(username='tanpa_booking', password='x')
+        users = list(User.objects.filter(pk__in=[self.user.pk, other.pk]))
+        with self.assertNumQueries(1):
+            attach_booking_stats(users)
+            totals = {user.username: get_booking_stats(user).total_count for user in users}
+        self.assertEqual(totals, {'statistik': 1, 'tanpa_booking': 0})
+
+
+class BookingLifecycleTest(TestCase):
+    def setUp(self):
+        engine.invalidate_cache()
+        self.user = User.objects.create_user(username='siklus', password='testpass123')
+        self.venue = Venue.objects.create(name='Lapangan L', category='futsal', price=100000)
+        self.tomorrow = timezone.localdate() + timedelta(days=1)
+
+    def booking(self, start, status='pending', day=None):
+        return Booking.objects.create(
+            user=self.user, venue=self.venue, booking_date=day or self.tomorrow,
+            start_time=time(start), end_time=time(start + 1), total_price=100000, status=status,
+        )
+
+    def test_valid_and_invalid_transitions(self):
+        booking = self.booking(8)
+        booking.transition_to('confirmed')
+        self.assertEqual(Booking.objects.get(pk=booking.pk).status, 'confirmed')
+        with self.assertRaises(InvalidTransition):
+            booking.transition_to('expired')
+
+        stale = Booking.objects.get(pk=booking.pk)
+        booking.transition_to('cancelled')
+        with self.assertRaises(InvalidTransition):
+            stale.transition_to('completed')
+        self.assertEqual(UserBookingStats.objects.get(user=self.user).cancelled_count, 1)
+
+    def test_old_pending_keeps_blocking_without_ttl(self):
+        booking = self.booking(8)
+        Booking.objects.filter(pk=booking.pk).update(created_at=timezone.now() - timedelta(minutes=45))
+        self.assertTrue(Booking.objects.filter(blocking_q(), venue=self.venue).exists())
+
+        call_command('sweep_bookings', stdout=StringIO())
+        self.assertEqual(Booking.objects.get(pk=booking.pk).status, 'pending')
+
+        self.client.login(username='siklus', password='testpass123')
+        slots_left = self.client.get(reverse('venue:get_venue_availability', args=[self.venue.id]), {
+            'date': self.tomorrow.isoformat(),
+        }).json()
+        self.assertNotIn('08:00', slots_left['available_slots'])
+
+    def test_past_pending_not_expired_without_ttl(self):
+        booking = self.booking(8)
+        fresh = self.booking(10)
+        Booking.objects.filter(pk=booking.pk).update(
+            booking_date=timezone.localdate() - timedelta(days=1), created_at=timezone.now() - timedelta(days=2),
+        )
+
+        out = StringIO()
+        call_command('sweep_bookings', stdout=out)
+        self.assertIn('0 booking expired', out.getvalue())
+        self.assertEqual(Booking.objects.get(pk=booking.pk).status, 'pending')
+        self.assertEqual(Booking.objects.get(pk=fresh.pk).status, 'pending')
+        stats = UserBookingStats.objects.get(user=self.user)
+        self.assertEqual((stats.pending_count, stats.expired_count), (2, 0))
+
+    @override_settings(BOOKING_PENDING_TTL_MINUTES=30)
+    def test_stale_pending_stops_blocking_before_sweep(self):
+        booking = self.booking(8)
+        Booking.objects.filter(pk=booking.pk).update(created_at=timezone.now() - timedelta(hours=2))
+        blocking = Booking.objects.filter(blocking_q(), venue=self.venue)
+        self.assertFalse(blocking.exists())
+
+    @override_settings(BOOKING_PENDING_TTL_MINUTES=30)
+    def test_sweep_expires_and_completes_in_bulk(self):
+        promo = Promo.objects.create(
+            title='Promo', description='-', amount_discount=10, category='venue',
+            max_uses=1, start_date=timezone.localdate(), end_date=self.tomorrow,
+        )
+        stale = self.booking(8)
+        reserve_promo(validate_promo_code(promo.code, 'venue'), self.user, booking=stale, amount=100000)
+        Booking.objects.filter(pk=stale.pk).update(created_at=timezone.now() - timedelta(hours=2))
+        fresh = self.booking(10)
+        past = self.booking(12, status='confirmed')
+        yesterday = timezone.localdate() - timedelta(days=1)
+        Booking.objects.filter(pk=past.pk).update(booking_date=yesterday)
+
+        out = StringIO()
+        call_command('sweep_bookings', batch_size=1, stdout=out)
+        self.assertIn('1 booking expired, 1 booking completed', out.getvalue())
+
+        statuses = dict(Booking.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses, {stale.pk: 'expired', fresh.pk: 'pending', past.pk: 'completed'})
+        promo.refresh_from_db()
+        self.assertEqual(promo.max_uses, 1)
+
+        stats = UserBookingStats.objects.get(user=self.user)
+        self.assertEqual(
+            (stats.pending_count, stats.expired_count, stats.completed_count), (1, 1, 1),
+        )
+        self.assertEqual(stats.total_spent, Decimal('200000'))
+
+    def test_cancel_view_uses_state_machine(self):
+        booking = self.booking(8, status='confirmed')
+        booking.transition_to('completed')
+        self.client.login(username='siklus', password='testpass123')
+        response = self.client.post(reverse('venue:cancel_booking', args=[booking.id]))
+        self.assertEqual(response.status_code, 400)
+
+
+class MyBookingsPageTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='langganan', password='testpass123')
+        self.client.login(username='langganan', password='testpass123')
+        self.venue = Venue.objects.create(
+            name='Lapangan H', category='futsal', price=100000, image_url='http://example.com/h.jpg',
+        )
+        self.tomorrow = timezone.localdate() + timedelta(days=1)
+
+    def booking(self, start, status='pending'):
+        return Booking.objects.create(
+            user=self.user, venue=self.venue, booking_date=self.tomorrow,
+            start_time=time(start), end_time=time(start + 1), total_price=100000, status=status,
+        )
+
+    def test_venue_caches_image_url_on_save(self):
+        self.assertEqual(self.venue.cached_image_url, self.venue.get_image_url())
+        self.venue.image_url = 'http://example.com/lain.jpg'
+        self.venue.save()
+        self.assertEqual(Venue.objects.get(pk=self.venue.pk).cached_image_url, self.venue.get_image_url())
+
+    def test_rebuild_image_urls_command(self):
+        Venue.objects.filter(pk=self.venue.pk).update(cached_image_url='')
+        out = StringIO()
+        call_command('rebuild_venue_image_urls', stdout=out)
+        self.assertIn('1 URL', out.getvalue())
+        self.assertEqual(Venue.objects.get(pk=self.venue.pk).cached_image_url, self.venue.get_image_url())
+
+    def test_tabs_and_keyset_pages(self):
+        for hour in range(6, 21):
+            self.booking(hour)
+        cancelled = self.booking(21, status='cancelled')
+
+        url = reverse('venue:my_bookings')
+        with CaptureQueriesContext(connection) as queries:
+            first = self.client.get(url)
+        self.assertEqual(len(first.context['bookings']), 15)
+        self.assertIsNone(first.context['next_cursor'])
+        self.assertContains(first, self.venue.cached_image_url)
+        self.assertEqual(len([q for q in queries if 'venue_booking' in q['sql']]), 1)
+
+        past = self.client.get(url, {'tab': 'past'})
+        self.assertEqual([b.pk for b in past.context['bookings']], [cancelled.pk])
+
+    def test_pagination_walks_all_bookings(self):
+        for hour in range(6, 21):
+            self.booking(hour)
+        page = get_booking_page(self.user, 'upcoming', page_size=10)
+        rest = get_booking_page(self.user, 'upcoming', cursor=page.next_cursor, page_size=10)
+        self.assertEqual(len(page) + len(rest), 15)
+        self.assertIsNone(rest.next_cursor)
+        self.assertFalse({b.pk for b in page} & {b.pk for b in rest})
+
+        self.assertEqual(self.client.get(reverse('venue:my_bookings'), {'cursor': 'rusak'}).status_code, 200)
+
+
+class PricingEngineTest(TestCase):
+    def setUp(self):
+        pricing.invalidate()
+        pricing.invalidate_holidays()
+        self.user = User.objects.create_user(username='harga', password='testpass123')
+        self.client.login(username='harga', password='testpass123')
+        self.venue = Venue.objects.create(name='Lapangan P', category='futsal', price=100000)
+        VenueRate.objects.create(
+            venue=self.venue, day_type='weekday', start_time=time(17), end_time=time(0), price_per_hour=160000,
+        )
+        VenueRate.objects.create(
+            venue=self.venue, day_type='weekend', start_time=time(8), end_time=time(22), price_per_hour=150000,
+        )
+        today = timezone.localdate()
+        self.monday = today + timedelta(days=7 - today.weekday())
+        self.saturday = self.monday + timedelta(days=5)
+
+    def test_quote_spans_peak_boundary_with_minute_resolution(self):
+        q = pricing.quote(self.venue, self.monday, time(16), time(17, 30))
+        self.assertEqual(q.subtotal, Decimal('180000.00'))  # 1 jam normal + 30 menit jam sibuk
+        self.assertEqual(q.day_type, 'weekday')
+        self.assertEqual(pricing.quote(self.venue, self.monday, time(22), time(0)).subtotal, Decimal('320000.00'))
+
+    def test_weekend_and_holiday_rates(self):
+        self.assertEqual(pricing.quote(self.venue, self.saturday, time(9), time(10)).subtotal, Decimal('150000.00'))
+        Holiday.objects.create(date=self.monday, name='Libur')
+        q = pricing.quote(self.venue, self.monday, time(9), time(10))
+        self.assertEqual((q.day_type, q.subtotal), ('holiday', Decimal('150000.00')))
+
+    def test_rate_change_invalidates_table(self):
+        pricing.quote(self.venue, self.monday, time(18), time(19))
+        VenueRate.objects.filter(venue=self.venue, day_type='weekday').get().delete()
+        self.assertEqual(pricing.quote(self.venue, self.monday, time(18), time(19)).subtotal, Decimal('100000.00'))
+
+    def test_quote_range_compiles_many_venues_with_one_rate_query(self):
+        venues = [self.venue] + [
+            Venue.objects.create(name=f'Lapangan {i}', category='futsal', price=50000) for i in range(5)
+        ]
+        pricing.invalidate()
+        pricing.holiday_dates()
+        with self.assertNumQueries(1):
+            quotes = pricing.quote_range(venues, self.monday, time(18), time(20))
+        self.assertEqual(len(quotes[self.venue.pk]), 7)
+        self.assertEqual(quotes[venues[1].pk][0].subtotal, Decimal('100000.00'))
+
+    def test_quote_api_and_booking_agree(self):
+        response = self.client.get(reverse('venue:quote_price', args=[self.venue.id]), {
+            'date': self.monday.isoformat(), 'start_time': '16:00', 'end_time': '17:30',
+        })
+        self.assertEqual(response.json()['quote']['total'], 180000.0)
+
+        self.client.post(reverse('venue:book_venue', args=[self.venue.id]), {
+            'booking_date': self.monday.isoformat(), 'start_time': '16:00', 'end_time': '17:30',
+        })
+        booking = Booking.objects.get(user=self.user)
+        self.assertEqual(booking.total_price, Decimal('180000.00'))
+
+    def test_edit_keeps_promo_discount(self):
+        engine.invalidate_cache()
+        promo = Promo.objects.create(
+            title='Promo', description='-', amount_discount=10, category='venue',
+            max_uses=5, start_date=timezone.localdate(), end_date=self.saturday,
+        )
+        self.client.post(reverse('venue:book_venue', args=[self.venue.id]), {
+            'booking_date': self.monday.isoformat(), 'start_time': '08:00', 'end_time': '09:00',
+            'promo_code': promo.code,
+        })
+        booking = Booking.objects.get(user=self.user)
+        self.assertEqual(booking.total_price, Decimal('90000.00'))
+
+        response = self.client.post(reverse('venue:edit_booking', args=[booking.id]), {
+            'booking_date': self.monday.isoformat(), 'start_time': '17:00', 'end_time': '19:00',
+        })
+        self.assertEqual(response.json()['total_price'], 288000.0)
+        booking.refresh_from_db()
+        self.assertEqual(booking.total_price, Decimal('288000.00'))
+        self.assertEqual(booking.promo_redemptions.get().discount_value, Decimal('32000.00'))
+
+
+class BookingSeriesTest(TestCase):
+    def setUp(self):
+        pricing.invalidate()
+        pricing.invalidate_holidays()
+        self.user = User.objects.create_user(username='liga', password='testpass123')
+        self.client.login(username='liga', password='testpass123')
+        self.venue = Venue.objects.create(name='Lapangan S', category='futsal', price=100000)
+        today = timezone.localdate()
+        self.monday = today + timedelta(days=7 - today.weekday())
+        self.url = reverse('venue:book_series', args=[self.venue.id])
+
+    def post(self, occurrences, **extra):
+        return self.client.post(self.url, {
+            'booking_date': self.monday.isoformat(), 'start_time': '19:00', 'end_time': '21:00',
+            'occurrences': occurrences, **extra,
+        })
+
+    def test_year_of_weekly_bookings_checks_conflicts_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post(52)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['created'], 52)
+
+        overlap_checks = [q for q in queries if '"venue_booking"."start_time" <' in q['sql']]
+        self.assertEqual(len(overlap_checks), 1)
+        inserts = [q for q in queries if q['sql'].startswith('INSERT INTO "venue_booking"')]
+        self.assertEqual(len(inserts), 1)
+
+        bookings = Booking.objects.filter(series__isnull=False).order_by('booking_date')
+        self.assertEqual(bookings.count(), 52)
+        self.assertEqual(bookings.last().booking_date, self.monday + timedelta(weeks=51))
+        self.assertEqual(get_booking_stats(self.user).pending_count, 52)
+
+    def test_conflicts_are_reported_per_occurrence(self):
+        Booking.objects.create(
+            user=self.user, venue=self.venue, booking_date=self.monday + timedelta(weeks=2),
+            start_time=time(20), end_time=time(22), total_price=200000, status='confirmed',
+        )
+        response = self.post(4)
+        self.assertEqual(response.status_code, 409)
+        statuses = [item['status'] for item in response.json()['occurrences']]
+        self.assertEqual(statuses, ['', '', 'conflict', ''])
+        self.assertEqual(response.json()['occurrences'][2]['conflicts'], [{'start_time': '20:00', 'end_time': '22:00'}])
+        self.assertFalse(BookingSeries.objects.exists())
+
+        response = self.post(4, skip_conflicts='1')
+        self.assertEqual((response.json()['created'], response.json()['skipped']), (3, 1))
+        self.assertEqual(response.json()['total_price'], 600000.0)
+
+    def test_invalid_series_is_rejected(self):
+        self.assertEqual(self.post(53).status_code, 400)
+        self.assertEqual(self.post('x').status_code, 400)
+
+    def test_cancel_series_cancels_upcoming_bookings(self):
+        series_id = self.post(3).json()['series_id']
+        Booking.objects.filter(series_id=series_id).order_by('booking_date').first().transition_to('cancelled')
+
+        response = self.client.post(reverse('venue:cancel_booking_series', args=[series_id]))
+        self.assertEqual(response.json()['cancelled'], 2)
+        self.assertEqual(set(Booking.objects.values_list('status', flat=True)), {'cancelled'})
+        self.assertEqual(get_booking_stats(self.user).cancelled_count, 3)
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class WaitlistTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='pemesan', password='testpass123')
+        self.venue = Venue.objects.create(name='Lapangan W', category='futsal', price=100000)
+        self.tomorrow = timezone.localdate() + timedelta(days=1)
+        self.booking = Booking.objects.create(
+            user=self.owner, venue=self.venue, booking_date=self.tomorrow,
+            start_time=time(18), end_time=time(20), total_price=200000,
+        )
+
+    def join(self, username, slot):
+        User.objects.create_user(username=username, password='testpass123', email=f'{username}@example.com')
+        self.client.login(username=username, password='testpass123')
+        return self.client.post(reverse('venue:join_waitlist', args=[self.venue.id]), {
+            'booking_date': self.tomorrow.isoformat(), 'slot_time': slot,
+        })
+
+    def test_only_full_slots_can_be_waitlisted(self):
+        self.assertEqual(self.join('awal', '19:00').status_code, 200)
+        self.assertEqual(self.join('kosong', '20:00').status_code, 400)
+        availability = self.client.get(reverse('venue:get_venue_availability', args=[self.venue.id]), {
+            'date': self.tomorrow.isoformat(),
+        })
+        self.assertEqual(availability.json()['waitlist_slots'], [])
+
+    def test_cancel_promotes_first_waiter_per_slot_in_background(self):
+        self.join('pertama', '19:00')
+        self.join('kedua', '19:00')
+        self.join('lain', '18:00')
+
+        self.client.login(username='pemesan', password='testpass123')
+        with self.captureOnCommitCallbacks() as callbacks, CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('venue:cancel_booking', args=[self.booking.id]))
+        self.assertEqual(response.status_code, 200)
+        waitlist_queries = [q for q in queries if 'venue_waitlistentry' in q['sql']]
+        self.assertEqual(len(waitlist_queries), 1)
+        self.assertFalse(mail.outbox)
+
+        for callback in callbacks:
+            callback()
+        statuses = dict(WaitlistEntry.objects.values_list('user__username', 'status'))
+        self.assertEqual(statuses, {'pertama': 'notified', 'kedua': 'waiting', 'lain': 'notified'})
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), ['lain@example.com', 'pertama@example.com'])
+
+    @override_settings(BOOKING_PENDING_TTL_MINUTES=30)
+    def test_sweep_expiry_releases_slot(self):
+        self.join('sabar', '18:00')
+        Booking.objects.filter(pk=self.booking.pk).update(created_at=timezone.now() - timedelta(hours=2))
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('sweep_bookings', stdout=StringIO())
+        self.assertEqual(WaitlistEntry.objects.get().status, 'notified')
+        self.assertEqual(len(mail.outbox), 1)
+
+
+class SlotTemplateTest(TestCase):
+    def setUp(self):
+        slots.invalidate()
+        self.user = User.objects.create_user(username='jadwal', password='testpass123')
+        self.client.login(username='jadwal', password='testpass123')
+        self.venue = Venue.objects.create(
+            name='Padel P', category='padel', price=100000, slot_minutes=30, min_booking_minutes=30,
+        )
+        today = timezone.localdate()
+        self.monday = today + timedelta(days=7 - today.weekday())
+
+    def availability(self, day):
+        return self.client.get(reverse('venue:get_venue_availability', args=[self.venue.id]), {
+            'date': day.isoformat(),
+        }).json()
+
+    def test_default_hours_with_half_hour_slots_masked_by_bookings(self):
+        Booking.objects.create(
+            user=self.user, venue=self.venue, booking_date=self.monday,
+            start_time=time(8), end_time=time(9, 30), total_price=150000,
+        )
+        data = self.availability(self.monday)
+        self.assertEqual((data['all_slots'][0], data['all_slots'][-1], data['slot_minutes']), ('07:00', '22:00', 30))
+        self.assertEqual(data['available_slots'][:3], ['07:00', '07:30', '09:30'])
+        self.assertEqual(len(data['all_slots']), 31)
+
+    def test_template_is_cached_and_invalidated_on_change(self):
+        slots.day_template(self.venue, self.monday)
+        with self.assertNumQueries(0):
+            slots.day_template(self.venue, self.monday)
+
+        VenueOperatingHours.objects.create(venue=self.venue, weekday=0, is_closed=True)
+        VenueOperatingHours.objects.create(venue=self.venue, weekday=1, open_time=time(0), close_time=time(0))
+        self.assertTrue(self.availability(self.monday)['closed'])
+        tuesday = self.availability(self.monday + timedelta(days=1))
+        self.assertEqual((tuesday['all_slots'][0], tuesday['all_slots'][-1]), ('00:00', '23:30'))
+
+    def test_booking_outside_hours_or_limits_is_rejected(self):
+        def book(start, end):
+            return self.client.post(reverse('venue:book_venue', args=[self.venue.id]), {
+                'booking_date': self.monday.isoformat(), 'start_time': start, 'end_time': end,
+            })
+
+        self.assertEqual(book('06:00', '08:00').status_code, 400)
+        self.assertEqual(book('21:00', '23:00').status_code, 400)
+        self.assertEqual(book('07:00', '20:00').json()['message'], 'Durasi booking maksimal 12 jam')
+        self.assertEqual(book('07:00', '07:30').status_code, 200)
+
+        VenueOperatingHours.objects.create(venue=self.venue, weekday=0, is_closed=True)
+        self.assertEqual(book('10:00', '11:00').json()['message'], 'Venue tutup pada tanggal tersebut')
+
+
+class VenueDailyStatsTest(TestCase):
+    def setUp(self):
+        engine.invalidate_cache()
+        pricing.invalidate()
+        slots.invalidate()
+        self.owner = User.objects.create_user(username='pemilik', password='testpass123')
+        self.player = User.objects.create_user(username='pemain', password='testpass123')
+        self.venue = Venue.objects.create(name='Lapangan R', category='futsal', price=100000, user=self.owner)
+        self.tomorrow = timezone.localdate() + timedelta(days=1)
+        self.client.login(username='pemain', password='testpass123')
+
+    def book(self, start, end, promo_code=''):
+        return self.client.post(reverse('venue:book_venue', args=[self.venue.id]), {
+            'booking_date': self.tomorrow.isoformat(), 'start_time': start, 'end_time': end,
+            'promo_code': promo_code,
+        })
+
+    def rollup(self, day=None):
+        return VenueDailyStats.objects.get(venue=self.venue, date=day or self.tomorrow)
+
+    def test_rollup_follows_booking_changes(self):
+        promo = Promo.objects.create(
+            title='Promo', description='-', amount_discount=10, category='venue',
+            max_uses=5, start_date=timezone.localdate(), end_date=self.tomorrow,
+        )
+        self.book('08:00', '10:00', promo.code)
+        self.book('10:00', '11:30')
+        stats = self.rollup()
+        self.assertEqual((stats.booking_count, stats.booked_minutes, stats.open_minutes), (2, 210, 15 * 60))
+        self.assertEqual((stats.revenue, stats.promo_discount), (Decimal('330000.00'), Decimal('20000.00')))
+        self.assertEqual(stats.occupancy_percent, 23.3)
+
+        booking = Booking.objects.get(start_time=time(10))
+        day_after = self.tomorrow + timedelta(days=1)
+        self.client.post(reverse('venue:edit_booking', args=[booking.id]), {
+            'booking_date': day_after.isoformat(), 'start_time': '10:00', 'end_time': '11:00',
+        })
+        self.assertEqual(self.rollup().booking_count, 1)
+        self.assertEqual(self.rollup(day_after).booked_minutes, 60)
+
+        Booking.objects.get(start_time=time(8)).transition_to('cancelled')
+        stats = self.rollup()
+        self.assertEqual((stats.booking_count, stats.cancelled_count, stats.promo_discount), (0, 1, Decimal('0')))
+
+    def test_backfill_matches_incremental_rollups(self):
+        self.book('08:00', '10:00')
+        self.book('12:00', '13:00')
+        Booking.objects.get(start_time=time(12)).transition_to('cancelled')
+        expected = list(VenueDailyStats.objects.values('venue_id', 'date', 'booked_minutes', 'revenue', 'cancelled_count'))
+
+        VenueDailyStats.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_venue_daily_stats', batch_size=1, stdout=out)
+        self.assertIn('1 rollup', out.getvalue())
+        self.assertEqual(
+            list(VenueDailyStats.objects.values('venue_id', 'date', 'booked_minutes', 'revenue', 'cancelled_count')),
+            expected,
+        )
+
+    def test_owner_api_returns_dense_time_series(self):
+        self.book('08:00', '11:00')
+        url = reverse('venue:venue_analytics', args=[self.venue.id])
+        params = {'start': timezone.localdate().isoformat(), 'end': (self.tomorrow + timedelta(days=5)).isoformat()}
+        self.assertEqual(self.client.get(url, params).status_code, 404)
+
+        self.client.login(username='pemilik', password='testpass123')
+        with self.assertNumQueries(3):  # user, venue, rollup
+            data = self.client.get(url, params).json()
+        self.assertEqual(len(data['dates']), 7)
+        self.assertEqual(data['series']['booked_hours'][:3], [0.0, 3.0, 0.0])
+        self.assertEqual(data['series']['occupancy_percent'][1], 20.0)
+        self.assertEqual(data['totals']['revenue'], 300000.0)
+
+        summary = self.client.get(reverse('venue:owner_analytics'), params).json()
+        self.assertEqual(summary['venues'], [{'id': str(self.venue.id), 'name': 'Lapangan R'}])
+        self.assertEqual(self.client.get(url, {'start': '2026-01-10', 'end': '2026-01-01'}).status_code, 400)
+
+
+class VenueAvailabilityTest(TestCase):
+    def setUp(self):
+        slots.invalidate()
+        self.user = User.objects.create_user(username='pencari', password='testpass123')
+        self.venue = Venue.objects.create(name='Lapangan S', category='futsal', price=100000)
+        self.tomorrow = timezone.localdate() + timedelta(days=1)
+
+    def at(self, day, hour, minute=0):
+        return timezone.make_aware(datetime.combine(day, time(hour, minute)))
+
+    def book(self, day, start, end, status='confirmed'):
+        return Booking.objects.create(
+            user=self.user, venue=self.venue, booking_date=day,
+            start_time=start, end_time=end, total_price=100000, status=status,
+        )
+
+    def test_refresh_skips_started_booked_and_closed_slots(self):
+        self.book(self.tomorrow, time(10), time(12))
+        self.book(self.tomorrow, time(13), time(14), status='cancelled')
+        VenueOperatingHours.objects.create(
+            venue=self.venue, weekday=(self.tomorrow + timedelta(days=1)).weekday(), is_closed=True,
+        )
+
+        self.assertEqual(refresh_availability([self.venue.pk], now=self.at(self.tomorrow, 9, 30)), 1)
+        self.venue.refresh_from_db()
+        # 07:00-09:00 sudah dimulai, 10:00-12:00 terisi: kosong 12:00-22:00.
+        self.assertEqual(self.venue.next_free_at, self.at(self.tomorrow, 12))
+        self.assertEqual(self.venue.free_minutes_today, 10 * 60)
+        self.assertEqual(self.venue.free_minutes_week, 10 * 60 + 5 * 15 * 60)
+
+        refresh_availability([self.venue.pk], now=self.at(self.tomorrow, 21, 5))
+        self.venue.refresh_from_db()
+        self.assertEqual(self.venue.free_minutes_today, 0)
+        self.assertEqual(self.venue.next_free_at, self.at(self.tomorrow + timedelta(days=2), 7))
+
+    @override_settings(BACKGROUND_TASKS_EAGER=True)
+    def test_booking_changes_refresh_venue_after_commit(self):
+        call_command('refresh_venue_availability', stdout=StringIO())
+        self.venue.refresh_from_db()
+        ahead = self.venue.free_minutes_week - self.venue.free_minutes_today
+
+        with self.captureOnCommitCallbacks(execute=True):
+            booking = self.book(self.tomorrow, time(8), time(10))
+        self.venue.refresh_from_db()
+        self.assertEqual(self.venue.free_minutes_week - self.venue.free_minutes_today, ahead - 120)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.transition_to('cancelled')
+        self.venue.refresh_from_db()
+        self.assertEqual(self.venue.free_minutes_week - self.venue.free_minutes_today, ahead)
+
+        # Booking di luar horizon tidak memicu hitung ulang.
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.book(self.tomorrow + timedelta(days=30), time(8), time(10))
+        self.assertEqual(callbacks, [])
+
+    def test_homepage_filters_and_sorts_by_stored_availability(self):
+        now = timezone.now()
+        later = Venue.objects.create(name='Lapangan T', category='futsal', price=100000)
+        full = Venue.objects.create(name='Lapangan U', category='futsal', price=100000)
+        Venue.objects.filter(pk=self.venue.pk).update(
+            next_free_at=now + timedelta(minutes=30), free_minutes_today=60, free_minutes_week=600,
+        )
+        Venue.objects.filter(pk=later.pk).update(next_free_at=now + timedelta(hours=3))
+        Venue.objects.filter(pk=full.pk).update(next_free_at=None)
+
+        self.client.login(username='pencari', password='testpass123')
+        url = reverse('venue:home_section')
+        xhr = {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'}
+        venues = self.client.get(url, {'availability': 'now'}, **xhr).json()['venues']
+        self.assertEqual([venue['name'] for venue in venues], ['Lapangan S'])
+        self.assertEqual(venues[0]['free_hours_week'], 10.0)
+
+        venues = self.client.get(url, {'sort': 'available'}, **xhr).json()['venues']
+        self.assertEqual([venue['name'] for venue in venues], ['Lapangan S', 'Lapangan T', 'Lapangan U'])
+        self.assertIsNone(venues[2]['next_free_at'])
+
+    def test_homepage_recomputes_stale_availability(self):
+        now = timezone.now()
+        fresh = Venue.objects.create(name='Lapangan T', category='futsal', price=100000)
+        Venue.objects.filter(pk=fresh.pk).update(
+            next_free_at=now + timedelta(hours=3), availability_updated_at=now,
+        )
+        # Slot kosong tersimpan sudah lewat dua jam: tidak boleh tetap di urutan pertama.
+        Venue.objects.filter(pk=self.venue.pk).update(
+            next_free_at=now - timedelta(hours=2), free_minutes_today=60,
+            availability_updated_at=now - timedelta(hours=2),
+        )
+
+        self.client.login(username='pencari', password='testpass123')
+        venues = self.client.get(
+            reverse('venue:home_section'), {'sort': 'available'}, HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+        ).json()['venues']
+
+        self.venue.refresh_from_db()
+        self.assertGreaterEqual(self.venue.availability_updated_at, now)
+        self.assertTrue(self.venue.next_free_at is None or self.venue.next_free_at >= now)
+        fresh.refresh_from_db()
+        self.assertEqual(fresh.next_free_at, now + timedelta(hours=3))
+        stored = [venue['next_free_at'] for venue in venues]
+        self.assertEqual(stored, sorted(stored, key=lambda value: (value is None, value or '')))
@@ -7,11 +7,19 @@ urlpatterns = [
     path('', views.landing_page, name='landing_page'),
     path('home/', views.home_section, name='home_section'),
     path('book/<uuid:venue_id>/', views.book_venue, name='book_venue'),
+    path('book-series/<uuid:venue_id>/', views.book_series, name='book_series'),
+    path('cancel-series/<uuid:series_id>/', views.cancel_booking_series, name='cancel_booking_series'),
     path('my-bookings/', views.my_bookings, name='my_bookings'),
     path('cancel-booking/<uuid:booking_id>/', views.cancel_booking, name='cancel_booking'),
     path('edit-booking/<uuid:booking_id>/', views.edit_booking, name='edit_booking'),
     path('booking-details/<uuid:booking_id>/', views.get_booking_details, name='get_booking_details'),
     path('availability/<uuid:venue_id>/', views.get_venue_availability, name='get_venue_availability'),
+    path('waitlist/<uuid:venue_id>/', views.join_waitlist, name='join_waitlist'),
+    path('waitlist/leave/<int:entry_id>/', views.leave_waitlist, name='leave_waitlist'),
+    path('analytics/', views.owner_analytics, name='owner_analytics'),
+    path('analytics/<uuid:venue_id>/', views.owner_analytics, name='venue_analytics'),
+    path('quote/<uuid:venue_id>/', views.quote_price, name='quote_price'),
     path('json/', views.get_venues_json, name='venues_json'),
     path('json/<uuid:id>/', views.get_venue_by_id, name='venue_json'),
+    path('image/<uuid:venue_id>/', views.venue_image, name='venue_image'),
 ]
\ No newline at end of file
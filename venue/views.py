@@ -1,17 +1,39 @@
+import logging
 import random
-from django.shortcuts import render, redirect, get_object_or_404
+import uuid
+from datetime import date, datetime, timedelta
+
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse, HttpResponseBadRequest, HttpResponse
-from django.core import serializers
-from django.views.decorators.csrf import csrf_exempt
+from django.db import IntegrityError, transaction
 from django.db.models import Q
-import json
-from datetime import datetime, date, time
-from .models import Venue, Booking
-from promo.models import Promo
+from django.http import FileResponse, Http404, HttpResponseRedirect, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.templatetags.static import static
 from django.utils import timezone
-from datetime import datetime, date
-from django.db import IntegrityError, transaction
+from django.utils.cache import patch_cache_control
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
+
+from main.pagination import InvalidCursor
+from promo.engine import PromoUnavailable, reserve_promo, validate_promo_code
+from promo.models import PromoRedemption
+
+from .analytics import MAX_SERIES_DAYS, daily_series
+from .availability import (
+    availability_dict, available_now_q, available_today_q, order_by_availability, refresh_stale_availability,
+)
+from .history import get_booking_page, normalize_tab
+from .lifecycle import InvalidTransition, blocking_q, cancel_series
+from .models import Booking, BookingSeries, RemoteImage, Venue, WaitlistEntry
+from .pricing import quote
+from .remote_images import schedule_fetch, track
+from .series import create_series
+from .slots import day_template, validate_booking_window
+from .waitlist import join_waitlist as add_to_waitlist, leave_waitlist as remove_from_waitlist
+
+logger = logging.getLogger(__name__)
 
 # ==============================================================
 # AVAILABILITY CHECK API
@@ -31,49 +53,116 @@ def get_venue_availability(request, venue_id):
     except ValueError:
         return JsonResponse({'error': 'Invalid date format'}, status=400)
     
-    # Get all bookings for this venue on the selected date
+    # Booking yang menahan slot pada tanggal ini
     bookings = Booking.objects.filter(
+        blocking_q(),
         venue=venue,
         booking_date=booking_date,
-        status__in=['pending', 'confirmed']
-    ).order_by('start_time')
-    
-    # Generate booked time slots
-    booked_slots = []
-    for booking in bookings:
-        booked_slots.append({
-            'start_time': booking.start_time.strftime('%H:%M'),
-            'end_time': booking.end_time.strftime('%H:%M')
-        })
-    
-    # Generate all possible time slots (7:00 - 22:00)
-    all_slots = []
-    for hour in range(7, 23):  # 7:00 to 22:00
-        all_slots.append(f"{hour:02d}:00")
-    
-    # Calculate available slots
-    available_slots = all_slots.copy()
-    
-    # Remove slots that are booked
-    for booked in booked_slots:
-        start_hour = int(booked['start_time'].split(':')[0])
-        end_hour = int(booked['end_time'].split(':')[0])
-        
-        # Remove all hours that are within the booked range
-        for hour in range(start_hour, end_hour):
-            slot_to_remove = f"{hour:02d}:00"
-            if slot_to_remove in available_slots:
-                available_slots.remove(slot_to_remove)
-    
+    )
+    # Modal edit: booking milik user yang sedang diedit tidak dihitung bentrok
+    try:
+        exclude_id = uuid.UUID(request.GET.get('exclude_booking', ''))
+    except ValueError:
+        pass
+    else:
+        bookings = bookings.exclude(pk=exclude_id, user=request.user)
+    intervals = list(bookings.order_by('start_time').values_list('start_time', 'end_time'))
+
+    booked_slots = [
+        {'start_time': start.strftime('%H:%M'), 'end_time': end.strftime('%H:%M')}
+        for start, end in intervals
+    ]
+
+    # Template slot hari ini (jam buka + ukuran slot venue, di-cache) ditutup
+    # dengan slot yang sudah terisi.
+    template = day_template(venue, booking_date)
+    all_slots = list(template.labels)
+    available_slots = template.free_labels(intervals)
+
+    # Slot penuh yang sedang ditunggu user ini (waitlist)
+    waitlist_slots = [
+        slot.strftime('%H:%M') for slot in WaitlistEntry.objects.filter(
+            venue=venue, booking_date=booking_date, user=request.user,
+            status=WaitlistEntry.STATUS_WAITING,
+        ).values_list('slot_time', flat=True)
+    ]
+
     return JsonResponse({
         'venue_id': str(venue.id),
         'venue_name': venue.name,
         'booking_date': booking_date_str,
         'booked_slots': booked_slots,
         'available_slots': available_slots,
-        'all_slots': all_slots
+        'all_slots': all_slots,
+        'waitlist_slots': waitlist_slots,
+        'closed': template.closed,
+        'slot_minutes': template.slot_minutes,
+        'min_booking_minutes': venue.min_booking_minutes,
+        'max_booking_minutes': venue.max_booking_minutes,
+    })
+
+
+@login_required
+def join_waitlist(request, venue_id):
+    """Masuk antrian untuk satu slot satu jam yang sudah penuh."""
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'message': 'Metode request tidak valid.'}, status=405)
+
+    venue = get_object_or_404(Venue, id=venue_id)
+    try:
+        booking_date = datetime.strptime(request.POST.get('booking_date', ''), '%Y-%m-%d').date()
+        slot_time = datetime.strptime(request.POST.get('slot_time', ''), '%H:%M').time()
+    except ValueError:
+        return JsonResponse({'success': False, 'message': 'Format tanggal atau waktu tidak valid'}, status=400)
+
+    try:
+        entry, created = add_to_waitlist(request.user, venue, booking_date, slot_time)
+    except ValidationError as e:
+        return JsonResponse({'success': False, 'message': e.messages[0]}, status=400)
+
+    return JsonResponse({
+        'success': True,
+        'message': 'Anda masuk waitlist, kami akan memberi tahu jika slot tersedia.'
+                   if created else 'Anda sudah ada di waitlist slot ini.',
+        'entry_id': entry.pk,
     })
 
+
+@login_required
+def leave_waitlist(request, entry_id):
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'message': 'Metode request tidak valid.'}, status=405)
+
+    entry = get_object_or_404(WaitlistEntry, pk=entry_id, user=request.user)
+    if not remove_from_waitlist(entry):
+        return JsonResponse({'success': False, 'message': 'Entry waitlist sudah tidak aktif'}, status=409)
+    return JsonResponse({'success': True, 'message': 'Anda keluar dari waitlist'})
+
+# ==============================================================
+# QUOTE API
+# ==============================================================
+
+@require_GET
+def quote_price(request, venue_id):
+    """Harga booking (dengan promo opsional) dari mesin harga yang sama dengan book_venue"""
+    venue = get_object_or_404(Venue, id=venue_id)
+    try:
+        booking_date = datetime.strptime(request.GET.get('date', ''), '%Y-%m-%d').date()
+        start_time = datetime.strptime(request.GET.get('start_time', ''), '%H:%M').time()
+        end_time = datetime.strptime(request.GET.get('end_time', ''), '%H:%M').time()
+        price_quote = quote(venue, booking_date, start_time, end_time)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+
+    data = {'success': True}
+    promo_code = request.GET.get('promo_code', '').strip()
+    if promo_code:
+        promo_result = validate_promo_code(promo_code, 'venue', user=request.user)
+        price_quote = price_quote.with_promo(promo_result)
+        data['promo'] = promo_result.to_dict()
+    data['quote'] = price_quote.to_dict()
+    return JsonResponse(data)
+
 # ==============================================================
 # LANDING PAGE VIEW
 # ==============================================================
@@ -128,6 +217,14 @@ def apply_filters(queryset, request):
         except ValueError:
             pass
 
+    return apply_availability_filter(queryset, request.GET.get('availability'))
+
+def apply_availability_filter(queryset, availability):
+    """Filter 'now' / 'today' dari kolom ketersediaan dinamis (venue/availability.py)"""
+    if availability == 'now':
+        return queryset.filter(available_now_q())
+    if availability == 'today':
+        return queryset.filter(available_today_q())
     return queryset
 
 def apply_sorting(queryset, sort_by):
@@ -140,6 +237,8 @@ def apply_sorting(queryset, sort_by):
     }
     if sort_by in sort_options:
         return queryset.order_by(sort_options[sort_by])
+    if sort_by == 'available':
+        return order_by_availability(queryset)
     return queryset
 
 # ==============================================================
@@ -150,8 +249,11 @@ def apply_sorting(queryset, sort_by):
 def home_section(request):
     """Main view for homepage after login"""
     venues = Venue.objects.filter(is_available=True)
+    refresh_stale_availability(venues)
     venues = apply_filters(venues, request)
     sort_by = request.GET.get('sort')
+    if not sort_by and request.GET.get('availability'):
+        sort_by = 'available'
     venues = apply_sorting(venues, sort_by)
 
     if request.headers.get('x-requested-with') == 'XMLHttpRequest':
@@ -166,7 +268,8 @@ def home_section(request):
             'thumbnail': venue.thumbnail.url if venue.thumbnail else None,
             'image_url': venue.image_url,  # ADD THIS LINE
             'get_image_url': venue.get_image_url(),  # ADD THIS LINE - use the model method
-            'is_available': venue.is_available
+            'is_available': venue.is_available,
+            **availability_dict(venue),
         } for venue in venues]
         return JsonResponse({'venues': data})
 
@@ -222,11 +325,16 @@ def book_venue(request, venue_id):
                 'success': False,
                 'message': 'Waktu selesai harus setelah waktu mulai'
             }, status=400)
+
+        try:
+            validate_booking_window(venue, booking_date, start_time, end_time)
+        except ValidationError as e:
+            return JsonResponse({'success': False, 'message': e.messages[0]}, status=400)
         
         conflicting_bookings = Booking.objects.filter(
+            blocking_q(),
             venue=venue,
             booking_date=booking_date,
-            status__in=['pending', 'confirmed'],
             start_time__lt=end_time,
             end_time__gt=start_time
         ).exists()
@@ -234,45 +342,17 @@ def book_venue(request, venue_id):
         if conflicting_bookings:
             return JsonResponse({'success': False, 'message': 'Maaf, slot waktu yang Anda pilih sudah dibooking.'}, status=400)
 
-        start_hour = int(start_time_str.split(':')[0])
-        end_hour = int(end_time_str.split(':')[0])
-        duration = end_hour - start_hour
-        
-        if duration <= 0:
-            return JsonResponse({'success': False, 'message': 'Durasi booking tidak valid.'}, status=400)
-            
-        original_price = venue.price * duration
+        price_quote = quote(venue, booking_date, start_time, end_time)
+        original_price = price_quote.subtotal
         final_price = original_price
 
+        promo_result = None
+        if promo_code_str:
+            promo_result = validate_promo_code(promo_code_str, 'venue', user=request.user)
+
         try:
             with transaction.atomic():
-                promo_to_update = None
-                
-                if promo_code_str:
-                    try:
-                        promo = Promo.objects.select_for_update().get(code__iexact=promo_code_str)
-                        now = timezone.now().date()
-                        
-                        is_valid = True
-                        if not promo.is_active or promo.end_date < now:
-                            is_valid = False
-                        
-                        if not promo.code.upper().startswith("VENUE"):
-                            is_valid = False
-                        
-                        if promo.max_uses <= 0:
-                            is_valid = False
-                        
-                        if is_valid:
-                            discount_percent = promo.amount_discount
-                            discount_amount = original_price * (discount_percent / 100)
-                            final_price = original_price - discount_amount
-                            promo_to_update = promo
-
-                    except Promo.DoesNotExist:
-                        pass
-
-                Booking.objects.create(
+                booking = Booking.objects.create(
                     user=request.user,
                     venue=venue,
                     booking_date=booking_date,
@@ -281,11 +361,18 @@ def book_venue(request, venue_id):
                     total_price=final_price,
                     status='pending'
                 )
-                
-                if promo_to_update:
-                    promo_to_update.max_uses -= 1
-                    promo_to_update.save()
-                
+
+                # Kuota promo dipesan untuk booking ini; jika habis di tengah
+                # jalan booking tetap dibuat dengan harga normal.
+                if promo_result and promo_result.valid:
+                    try:
+                        reserve_promo(promo_result, request.user, booking=booking, amount=original_price)
+                    except PromoUnavailable:
+                        pass
+                    else:
+                        booking.total_price = promo_result.apply(original_price)
+                        booking.save(update_fields=['total_price'])
+
                 return JsonResponse({'success': True, 'message': 'Booking berhasil!'})
 
         except IntegrityError as e:
@@ -295,16 +382,121 @@ def book_venue(request, venue_id):
         
     return JsonResponse({'success': False, 'message': 'Metode request tidak valid.'}, status=405)
     
+@login_required(login_url='/authenticate/login/')
+def book_series(request, venue_id):
+    """
+    Booking rutin mingguan. Semua jadwal dicek sekaligus; jika ada yang
+    bentrok, response 409 berisi status per jadwal kecuali ``skip_conflicts``
+    diisi, yang membuat booking hanya untuk jadwal yang kosong.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'message': 'Metode request tidak valid.'}, status=405)
+
+    venue = get_object_or_404(Venue, id=venue_id)
+    try:
+        booking_date = datetime.strptime(request.POST.get('booking_date', ''), '%Y-%m-%d').date()
+        start_time = datetime.strptime(request.POST.get('start_time', ''), '%H:%M').time()
+        end_time = datetime.strptime(request.POST.get('end_time', ''), '%H:%M').time()
+        occurrences = int(request.POST.get('occurrences', ''))
+        interval_weeks = int(request.POST.get('interval_weeks') or 1)
+    except ValueError:
+        return JsonResponse({'success': False, 'message': 'Format tanggal, waktu, atau jumlah tidak valid'}, status=400)
+    skip_conflicts = request.POST.get('skip_conflicts', '').lower() in ('1', 'true', 'on')
+
+    try:
+        result = create_series(
+            request.user, venue, booking_date, start_time, end_time, occurrences,
+            interval_weeks=interval_weeks, skip_conflicts=skip_conflicts,
+        )
+    except ValidationError as e:
+        return JsonResponse({'success': False, 'message': e.messages[0]}, status=400)
+
+    occurrence_data = [item.to_dict() for item in result.occurrences]
+    if result.series is None:
+        return JsonResponse({
+            'success': False,
+            'message': f'{len(result.conflicts)} dari {occurrences} jadwal bentrok dengan booking lain.',
+            'occurrences': occurrence_data,
+        }, status=409)
+
+    return JsonResponse({
+        'success': True,
+        'message': f'{len(result.created)} booking rutin berhasil dibuat!',
+        'series_id': str(result.series.id),
+        'created': len(result.created),
+        'skipped': len(result.conflicts),
+        'total_price': float(result.total_price),
+        'occurrences': occurrence_data,
+    })
+
+
+@login_required
+def cancel_booking_series(request, series_id):
+    """Batalkan semua booking series yang belum dimulai."""
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'message': 'Invalid request method'}, status=405)
+
+    series = get_object_or_404(BookingSeries, id=series_id, user=request.user)
+    cancelled = cancel_series(series)
+    return JsonResponse({
+        'success': True,
+        'message': f'{cancelled} booking rutin berhasil dibatalkan',
+        'cancelled': cancelled,
+    })
+
+
+@login_required
+@require_GET
+def owner_analytics(request, venue_id=None):
+    """
+    Deret waktu harian (jam terisi, okupansi, pendapatan, pembatalan, diskon
+    promo) untuk semua venue milik user, atau satu venue. Dibaca dari rollup
+    VenueDailyStats; parameter ``start`` / ``end`` (YYYY-MM-DD), default 30
+    hari terakhir.
+    """
+    venues = Venue.objects.only('pk', 'name', 'slot_minutes').order_by('name')
+    if not request.user.is_staff:
+        venues = venues.filter(user=request.user)
+    if venue_id is not None:
+        venues = venues.filter(pk=venue_id)
+    venues = list(venues)
+    if venue_id is not None and not venues:
+        return JsonResponse({'success': False, 'message': 'Venue tidak ditemukan.'}, status=404)
+
+    try:
+        end = datetime.strptime(request.GET['end'], '%Y-%m-%d').date() if request.GET.get('end') else timezone.localdate()
+        start = datetime.strptime(request.GET['start'], '%Y-%m-%d').date() if request.GET.get('start') else end - timedelta(days=29)
+    except ValueError:
+        return JsonResponse({'success': False, 'message': 'Format tanggal tidak valid'}, status=400)
+    if start > end or (end - start).days >= MAX_SERIES_DAYS:
+        return JsonResponse({
+            'success': False,
+            'message': f'Rentang tanggal harus 1 - {MAX_SERIES_DAYS} hari',
+        }, status=400)
+
+    return JsonResponse({
+        'success': True,
+        'venues': [{'id': str(venue.pk), 'name': venue.name} for venue in venues],
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        **daily_series(venues, start, end),
+    })
+
+
 @login_required
 def my_bookings(request):
-    """Menampilkan booking history user"""
-    bookings = Booking.objects.filter(user=request.user).select_related('venue').order_by('-created_at')
-    
-    # Add image URL to each booking for template
-    for booking in bookings:
-        booking.venue_image_url = booking.venue.get_image_url()
-    
-    return render(request, 'my_bookings.html', {'bookings': bookings})
+    """Menampilkan booking history user (tab upcoming / past, per halaman)"""
+    tab = normalize_tab(request.GET.get('tab'))
+    try:
+        page = get_booking_page(request.user, tab, cursor=request.GET.get('cursor'))
+    except InvalidCursor:
+        page = get_booking_page(request.user, tab)
+
+    return render(request, 'my_bookings.html', {
+        'bookings': page.items,
+        'next_cursor': page.next_cursor,
+        'active_tab': tab,
+    })
 
 # ==============================================================
 # CANCEL BOOKING - IMPROVED VERSION
@@ -323,7 +515,7 @@ def cancel_booking(request, booking_id):
     try:
         booking = get_object_or_404(Booking, id=booking_id, user=request.user)
         
-        if booking.status not in ['pending', 'confirmed']:
+        if not booking.can_transition_to('cancelled'):
             return JsonResponse({
                 'success': False,
                 'message': 'Tidak bisa membatalkan booking ini'
@@ -337,9 +529,11 @@ def cancel_booking(request, booking_id):
             'end_time': booking.end_time.strftime('%H:%M')
         }
         
-        # Update status booking
-        booking.status = 'cancelled'
-        booking.save()
+        # Update status booking (kuota promo ikut dikembalikan)
+        try:
+            booking.transition_to('cancelled')
+        except InvalidTransition as e:
+            return JsonResponse({'success': False, 'message': e.message}, status=409)
         
         return JsonResponse({
             'success': True,
@@ -350,7 +544,7 @@ def cancel_booking(request, booking_id):
         })
         
     except Exception as e:
-        print(f"ERROR in cancel_booking: {str(e)}")
+        logger.exception("Gagal membatalkan booking %s", booking_id)
         return JsonResponse({
             'success': False,
             'message': f'Terjadi kesalahan: {str(e)}'
@@ -362,7 +556,8 @@ def cancel_booking(request, booking_id):
 
 def get_venues_json(request):
     """Return all venues as JSON"""
-    venues = Venue.objects.filter(is_available=True)
+    venues = apply_availability_filter(Venue.objects.filter(is_available=True), request.GET.get('availability'))
+    venues = apply_sorting(venues, request.GET.get('sort'))
     data = []
     for venue in venues:
         data.append({
@@ -373,7 +568,8 @@ def get_venues_json(request):
             'price': venue.price,
             'rating': venue.rating,
             'image_url': venue.get_image_url(),  # Use the method to get image
-            'is_available': venue.is_available
+            'is_available': venue.is_available,
+            **availability_dict(venue),
         })
     return JsonResponse(data, safe=False)
 
@@ -388,7 +584,8 @@ def get_venue_by_id(request, id):
         'price': venue.price,
         'rating': venue.rating,
         'image_url': venue.get_image_url(),  # Use the method to get image
-        'is_available': venue.is_available
+        'is_available': venue.is_available,
+        **availability_dict(venue),
     }
     return JsonResponse(data)
 
@@ -410,7 +607,7 @@ def edit_booking(request, booking_id):
         booking = get_object_or_404(Booking, id=booking_id, user=request.user)
         
         # Hanya bisa edit booking yang masih pending/confirmed
-        if booking.status not in ['pending', 'confirmed']:
+        if booking.status not in Booking.BLOCKING_STATUSES:
             return JsonResponse({
                 'success': False,
                 'message': 'Tidak bisa mengedit booking yang sudah dibatalkan atau selesai'
@@ -463,29 +660,21 @@ def edit_booking(request, booking_id):
                 'message': 'Waktu selesai harus setelah waktu mulai'
             }, status=400)
         
-        # Validasi durasi minimal 1 jam
+        # Validasi jam operasional dan durasi minimal / maksimal venue
         start_dt = datetime.combine(date.today(), start_time)
         end_dt = datetime.combine(date.today(), end_time)
         duration_hours = (end_dt - start_dt).seconds / 3600
-        
-        if duration_hours < 1:
-            return JsonResponse({
-                'success': False,
-                'message': 'Durasi booking minimal 1 jam'
-            }, status=400)
-        
-        # Validasi durasi maksimal 12 jam
-        if duration_hours > 12:
-            return JsonResponse({
-                'success': False,
-                'message': 'Durasi booking maksimal 12 jam'
-            }, status=400)
+
+        try:
+            validate_booking_window(booking.venue, booking_date, start_time, end_time)
+        except ValidationError as e:
+            return JsonResponse({'success': False, 'message': e.messages[0]}, status=400)
         
         # CEK KONFLIK DENGAN USER LAIN - PERBAIKAN UTAMA
         conflicting_bookings = Booking.objects.filter(
+            blocking_q(),
             venue=booking.venue,
             booking_date=booking_date,
-            status__in=['pending', 'confirmed'],
             start_time__lt=end_time,
             end_time__gt=start_time
         ).exclude(id=booking.id)  # Exclude current booking
@@ -502,8 +691,15 @@ def edit_booking(request, booking_id):
                 'message': f'Venue sudah dibooking oleh user lain pada jam {conflict_time}. Silakan pilih waktu lain.'
             }, status=400)
         
-        # Hitung total harga baru
-        total_price = int(booking.venue.price * duration_hours)
+        # Hitung total harga baru; diskon promo yang dipakai booking ini tetap berlaku
+        price_quote = quote(booking.venue, booking_date, start_time, end_time)
+        redemption = (
+            booking.promo_redemptions.filter(status__in=PromoRedemption.ACTIVE_STATUSES)
+            .select_related('promo').first()
+        )
+        if redemption:
+            price_quote = price_quote.with_discount_percent(redemption.amount_discount, redemption.promo.code)
+        total_price = price_quote.total
         
         # Simpan info booking lama untuk response
         old_booking_info = {
@@ -518,7 +714,11 @@ def edit_booking(request, booking_id):
         booking.start_time = start_time
         booking.end_time = end_time
         booking.total_price = total_price
-        booking.save()
+        with transaction.atomic():
+            booking.save()
+            if redemption:
+                redemption.discount_value = price_quote.discount
+                redemption.save(update_fields=['discount_value', 'updated_at'])
         
         return JsonResponse({
             'success': True,
@@ -528,13 +728,13 @@ def edit_booking(request, booking_id):
             'booking_date': booking_date_str,
             'start_time': start_time_str,
             'end_time': end_time_str,
-            'total_price': total_price,
+            'total_price': float(total_price),
             'duration_hours': duration_hours,
             'old_booking_info': old_booking_info
         })
         
     except Exception as e:
-        print(f"ERROR in edit_booking: {str(e)}")
+        logger.exception("Gagal mengubah booking %s", booking_id)
         return JsonResponse({
             'success': False,
             'message': f'Terjadi kesalahan sistem: {str(e)}'
@@ -584,4 +784,42 @@ def venue_detail(request, venue_id):
         'venue': venue,
         'image_url': venue.get_image_url(),  # Use the method
     }
-    return render(request, 'venue_detail.html', context)
\ No newline at end of file
+    return render(request, 'venue_detail.html', context)
+
+
+# ==============================================================
+# REMOTE IMAGE PROXY
+# ==============================================================
+
+PROXY_MAX_AGE = 30 * 24 * 60 * 60
+
+
+@require_GET
+def venue_image(request, venue_id):
+    """Gambar venue dari image_url, dilayani dari salinan lokal (venue/remote_images.py)."""
+    image_url = Venue.objects.filter(pk=venue_id).values_list('image_url', flat=True).first()
+    if not image_url:
+        raise Http404("Venue tidak punya gambar.")
+
+    remote = track(image_url)
+    if remote.status == RemoteImage.STATUS_OK and remote.local_path:
+        if remote.next_check_at <= timezone.now():
+            schedule_fetch(remote)
+        try:
+            response = FileResponse(default_storage.open(remote.local_path, 'rb'), content_type='image/jpeg')
+        except FileNotFoundError:
+            RemoteImage.objects.filter(pk=remote.pk).update(status=RemoteImage.STATUS_PENDING, next_check_at=timezone.now())
+        else:
+            patch_cache_control(response, public=True, max_age=PROXY_MAX_AGE, immutable=True)
+            return response
+
+    if remote.status == RemoteImage.STATUS_DEAD:
+        response = HttpResponseRedirect(static('images/placeholder.png'))
+        patch_cache_control(response, public=True, max_age=24 * 60 * 60)
+        return response
+
+    # Belum ada salinan lokal: ambil di background, sementara pakai URL asli.
+    schedule_fetch(remote)
+    response = HttpResponseRedirect(remote.url)
+    patch_cache_control(response, public=True, max_age=60)
+    return response
@@ -0,0 +1,149 @@
+"""
+Waitlist slot venue yang sudah penuh.
+
+User mengantri per ``(venue, tanggal, slot)``; slot mengikuti template slot
+venue (venue/slots.py). Saat booking batal atau kedaluwarsa
+(venue/lifecycle.py), ``slots_released`` mencari user pertama yang menunggu
+di setiap slot yang dilepas dengan satu query yang memakai index
+``venue, booking_date, status, slot_time, created_at``.
+Promosi (``waiting`` -> ``notified``) dan pengiriman notifikasi dijalankan
+di antrian latar belakang setelah transaksi commit, sehingga pembatalan
+tetap cepat.
+
+Promosi tidak menahan slot: user yang diberi tahu tetap harus booking
+sendiri, siapa cepat dia dapat.
+"""
+import logging
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.mail import send_mail
+from django.db.models import Q
+from django.utils import timezone
+
+from main.tasks import run_after_commit
+
+from .models import Booking, WaitlistEntry
+from .slots import day_template
+
+logger = logging.getLogger(__name__)
+
+# Jumlah slot yang dilepas per query; menjaga kedalaman ekspresi OR tetap kecil.
+RELEASE_CHUNK_SIZE = 200
+
+
+def _release_q(releases):
+    condition = Q()
+    for venue_id, booking_date, start_time, end_time in releases:
+        slot = Q(venue_id=venue_id, booking_date=booking_date, slot_end_time__gt=start_time)
+        if end_time != time(0):
+            slot &= Q(slot_time__lt=end_time)
+        condition |= slot
+    return condition
+
+
+def next_waiters(releases):
+    """
+    Id entry terdepan untuk setiap slot yang overlap dengan ``releases``
+    (iterable ``(venue_id, tanggal, jam mulai, jam selesai)``), satu query
+    per ``RELEASE_CHUNK_SIZE`` slot.
+    """
+    today = timezone.localdate()
+    releases = [release for release in releases if release[1] >= today]
+    entry_ids, seen = [], set()
+    for offset in range(0, len(releases), RELEASE_CHUNK_SIZE):
+        rows = WaitlistEntry.objects.filter(
+            _release_q(releases[offset:offset + RELEASE_CHUNK_SIZE]),
+            status=WaitlistEntry.STATUS_WAITING,
+        ).order_by('venue_id', 'booking_date', 'slot_time', 'created_at').values_list(
+            'pk', 'venue_id', 'booking_date', 'slot_time',
+        )
+        for pk, *slot in rows:
+            if tuple(slot) not in seen:
+                seen.add(tuple(slot))
+                entry_ids.append(pk)
+    return entry_ids
+
+
+def slots_released(releases):
+    """Hook pembatalan / expiry: jadwalkan promosi waiter berikutnya setelah commit."""
+    entry_ids = next_waiters(releases)
+    if entry_ids:
+        run_after_commit(promote_waiters, entry_ids)
+    return entry_ids
+
+
+def promote_waiters(entry_ids):
+    """
+    Ubah entry yang masih ``waiting`` menjadi ``notified`` lalu kirim
+    notifikasi. UPDATE bersyarat memastikan setiap user hanya diberi tahu
+    sekali. Mengembalikan jumlah entry yang dipromosikan.
+    """
+    promoted = 0
+    entries = WaitlistEntry.objects.filter(
+        pk__in=entry_ids, status=WaitlistEntry.STATUS_WAITING,
+    ).select_related('user', 'venue')
+    for entry in entries:
+        changed = WaitlistEntry.objects.filter(pk=entry.pk, status=WaitlistEntry.STATUS_WAITING).update(
+            status=WaitlistEntry.STATUS_NOTIFIED, notified_at=timezone.now(),
+        )
+        if not changed:
+            continue
+        promoted += 1
+        try:
+            notify_waiter(entry)
+        except Exception:
+            logger.exception("Gagal mengirim notifikasi waitlist %s", entry.pk)
+    return promoted
+
+
+def notify_waiter(entry):
+    if not entry.user.email:
+        logger.info("User %s tidak punya email; notifikasi waitlist %s dilewati", entry.user_id, entry.pk)
+        return
+    slot = entry.slot_time.strftime('%H:%M')
+    send_mail(
+        subject=f"Slot {entry.venue.name} tersedia",
+        message=(
+            f"Halo {entry.user.username},\n\n"
+            f"Slot {slot} di {entry.venue.name} pada {entry.booking_date:%d-%m-%Y} yang Anda tunggu "
+            "sekarang tersedia. Segera booking sebelum diambil orang lain."
+        ),
+        from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', None),
+        recipient_list=[entry.user.email],
+    )
+
+
+def join_waitlist(user, venue, booking_date, slot_time):
+    """
+    Daftarkan ``user`` ke waitlist satu slot. Raise ``ValidationError`` jika
+    tanggal sudah lewat, jam bukan awal slot venue, atau slot masih kosong.
+    Mengembalikan ``(entry, created)``.
+    """
+    from .lifecycle import blocking_q
+
+    if booking_date < timezone.localdate():
+        raise ValidationError("Tidak bisa mengantri untuk tanggal yang sudah lewat")
+    template = day_template(venue, booking_date)
+    if slot_time.strftime('%H:%M') not in template.labels[:-1]:
+        raise ValidationError("Jam tersebut bukan slot venue ini")
+
+    slot_end = (datetime.combine(booking_date, slot_time) + timedelta(minutes=template.slot_minutes)).time()
+    taken = Booking.objects.filter(
+        blocking_q(), venue=venue, booking_date=booking_date,
+        start_time__lt=slot_end, end_time__gt=slot_time,
+    ).exists()
+    if not taken:
+        raise ValidationError("Slot masih tersedia, silakan booking langsung")
+
+    return WaitlistEntry.objects.get_or_create(
+        user=user, venue=venue, booking_date=booking_date, slot_time=slot_time,
+        status=WaitlistEntry.STATUS_WAITING, defaults={'slot_end_time': slot_end},
+    )
+
+
+def leave_waitlist(entry):
+    return bool(WaitlistEntry.objects.filter(pk=entry.pk, status=WaitlistEntry.STATUS_WAITING).update(
+        status=WaitlistEntry.STATUS_CANCELLED,
+    ))
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 from pathlib import Path
+import importlib.util
 import os
 from dotenv import load_dotenv
 VERSUS_AUTH_REQUIRED = False
@@ -57,6 +58,10 @@ INSTALLED_APPS = [
     'authenticate',
 ]
 
+if PRODUCTION:
+    # Dibutuhkan untuk lookup trigram pada pencarian produk (ven_shop/search.py)
+    INSTALLED_APPS.append('django.contrib.postgres')
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     #'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -70,6 +75,41 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'venyuk.urls'
 
+# Cache lokal per proses; dipakai snapshot promo, feed blog, dll.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'venyuk',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    # State throttle login harus dibagi semua worker. Production memakai
+    # tabel cache di database (buat sekali: `manage.py createcachetable`).
+    'login_throttle': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'login_throttle_cache',
+    } if PRODUCTION else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'login-throttle',
+    },
+    # Cache session juga harus dibagi: logout / flush di satu worker tidak
+    # boleh masih terbaca dari cache worker lain.
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'session_cache',
+    } if PRODUCTION else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'sessions',
+    },
+}
+
+# Session dibaca dari cache ``sessions`` dan hanya jatuh ke database saat cache miss.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'sessions'
+
+AUTHENTICATION_BACKENDS = [
+    'authenticate.backends.ProfileModelBackend',
+]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -120,6 +160,20 @@ else:
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
+# Kebijakan hashing password (lihat authenticate/hashers.py): development /
+# production; profil test dipakai venyuk/test_settings.py. Daftar hasher harus
+# sama dengan authenticate.hashers.password_hashers(profil).
+PASSWORD_HASH_PROFILE = os.getenv('PASSWORD_HASH_PROFILE') or ('production' if PRODUCTION else 'development')
+PASSWORD_HASH_COST = {}  # mis. {'pbkdf2_iterations': 600_000} untuk menimpa biaya profil
+
+PASSWORD_HASHERS = [
+    path for path, module in [
+        ('authenticate.hashers.PolicyArgon2PasswordHasher', 'argon2'),
+        ('authenticate.hashers.PolicyBCryptSHA256PasswordHasher', 'bcrypt'),
+    ]
+    if PASSWORD_HASH_PROFILE == 'production' and importlib.util.find_spec(module)
+] + ['authenticate.hashers.PolicyPBKDF2PasswordHasher']
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -170,3 +224,26 @@ FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Blog view counter (lihat blog/counters.py)
+BLOG_VIEW_FLUSH_SECONDS = 10       # interval flush view tertunda ke database
+BLOG_VIEW_DEDUP_SECONDS = 30 * 60  # satu pengunjung dihitung sekali per jendela ini
+
+# Pekerjaan latar belakang di dalam proses (lihat main/tasks.py)
+BACKGROUND_TASK_WORKERS = 2
+BACKGROUND_TASKS_EAGER = False
+
+# Rate limit + lockout percobaan login (lihat authenticate/throttle.py)
+LOGIN_THROTTLE_ENABLED = True
+# Bucket disimpan di cache bersama supaya batas berlaku lintas worker.
+LOGIN_THROTTLE_CACHE = 'login_throttle'
+# Jumlah reverse proxy tepercaya di depan aplikasi (production: proxy PWS).
+# IP klien diambil dari X-Forwarded-For; 0 = pakai REMOTE_ADDR.
+LOGIN_THROTTLE_TRUSTED_PROXY_COUNT = int(os.getenv('TRUSTED_PROXY_COUNT', '1' if PRODUCTION else '0'))
+LOGIN_THROTTLE_CLIENT_IP_HEADER = 'HTTP_X_FORWARDED_FOR'
+
+# Booking pending yang belum dikonfirmasi dalam waktu ini (menit) dianggap
+# kedaluwarsa (lihat venue/lifecycle.py, jalankan `manage.py sweep_bookings`
+# berkala). None = nonaktif: belum ada alur konfirmasi / pembayaran untuk
+# pelanggan, jadi pending tetap menahan slot sampai jam mulainya lewat.
+BOOKING_PENDING_TTL_MINUTES = None
@@ -0,0 +1,18 @@
+"""
+Settings untuk test suite::
+
+    python manage.py test --settings=venyuk.test_settings
+
+Memakai profil hashing ``test`` (MD5) supaya membuat user di test cepat, dan
+mematikan timer flush view blog supaya tidak ada thread yang menulis ke
+database test di luar test yang sedang berjalan.
+"""
+from .settings import *  # noqa: F401,F403
+
+PASSWORD_HASH_PROFILE = 'test'
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+    'authenticate.hashers.PolicyPBKDF2PasswordHasher',
+]
+
+BLOG_VIEW_FLUSH_TIMER = False
@@ -25,6 +25,9 @@ urlpatterns = [
     path('', include('venue.urls')),
     path('authenticate/', include('authenticate.urls')),
     path('blog/', include('blog.urls')),
+    path('ven_shop/', include('ven_shop.urls')),
+    path('match_up/', include('match_up.urls')),
+    path('versus/', include('versus.urls')),
 ] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
 
 if settings.DEBUG: